@@ -14,36 +14,46 @@ admin_service = AdminService()
 
 @router.get("/")
 async def admin_dashboard(request: Request, msg: str = ""):
-    stats = admin_service.get_storage_stats()
-    stories = admin_service.list_all_stories()
-    orphans = admin_service.get_orphaned_files()
-    in_progress = admin_service.list_in_progress()
+    stats = await admin_service.aio.get_storage_stats()
+    stories = await admin_service.aio.list_all_stories()
+    orphans = await admin_service.aio.get_orphaned_files()
+    in_progress = await admin_service.aio.list_in_progress()
+    session_stats = await admin_service.aio.get_session_stats()
+    speculation_stats = admin_service.get_speculation_stats()
+    prompt_cache_stats = admin_service.get_prompt_cache_stats()
+    provider_health = admin_service.get_provider_health()
+    job_stats = await admin_service.aio.get_job_stats()
 
     return templates.TemplateResponse(request, "admin.html", {
         "stats": stats,
         "stories": stories,
         "orphans": orphans,
         "in_progress": in_progress,
+        "session_stats": session_stats,
+        "speculation_stats": speculation_stats,
+        "prompt_cache_stats": prompt_cache_stats,
+        "provider_health": provider_health,
+        "job_stats": job_stats,
         "msg": msg,
     })
 
 
 @router.post("/delete-story/{story_id}")
 async def delete_story(story_id: str):
-    result = admin_service.delete_story(story_id)
+    result = await admin_service.aio.delete_story(story_id)
     msg = f"Story deleted. Removed {result['images_deleted']} image(s) and {result['videos_deleted']} video(s)."
     return RedirectResponse(url=f"/admin?msg={msg}", status_code=303)
 
 
 @router.post("/cleanup-orphans")
 async def cleanup_orphans():
-    result = admin_service.cleanup_orphans()
+    result = await admin_service.aio.cleanup_orphans()
     msg = f"Cleaned up {result['deleted']} orphaned file(s), freed {result['freed_display']}."
     return RedirectResponse(url=f"/admin?msg={msg}", status_code=303)
 
 
 @router.post("/delete-progress/{tier_name}")
 async def delete_progress(tier_name: str):
-    result = admin_service.delete_in_progress(tier_name)
+    result = await admin_service.aio.delete_in_progress(tier_name)
     msg = f"In-progress save for '{tier_name}' deleted. Removed {result['images_deleted']} image(s) and {result['videos_deleted']} video(s)."
     return RedirectResponse(url=f"/admin?msg={msg}", status_code=303)
@@ -15,9 +15,81 @@ class Settings:
         self.bible_api_key: str = os.getenv("BIBLE_API_KEY", "")
         self.host: str = os.getenv("HOST", "0.0.0.0")
         self.port: int = int(os.getenv("PORT", "8000"))
+        # Story transcripts longer than this are sent as a rolling summary
+        # plus the most recent scenes instead of in full
         self.context_char_threshold: int = int(
             os.getenv("CONTEXT_CHAR_THRESHOLD", "50000")
         )
+        # Scenes sent verbatim after the rolling story summary, which is folded
+        # forward this many scenes at a time (0 disables the summary)
+        self.context_recent_scenes: int = int(os.getenv("CONTEXT_RECENT_SCENES", "6"))
+        # Fail over to other configured providers, in this order, when a story's fails
+        self.provider_failover: bool = os.getenv("PROVIDER_FAILOVER", "true").lower() in ("1", "true", "yes")
+        self.provider_fallbacks: list[str] = [
+            key.strip() for key in os.getenv("PROVIDER_FALLBACKS", "claude,gpt,gemini,grok").split(",")
+            if key.strip()
+        ]
+        # Consecutive failures that open a provider's circuit breaker, and how long it stays open
+        self.provider_breaker_failures: int = int(os.getenv("PROVIDER_BREAKER_FAILURES", "5"))
+        self.provider_breaker_cooldown: float = float(os.getenv("PROVIDER_BREAKER_COOLDOWN", "60"))
+        # Duplicate scene calls slower than the provider's p95 to a fallback provider
+        self.provider_hedging: bool = os.getenv("PROVIDER_HEDGING", "false").lower() in ("1", "true", "yes")
+        self.provider_hedge_min_delay: float = float(os.getenv("PROVIDER_HEDGE_MIN_DELAY", "3"))
+        # "memory" (single worker) or "sqlite" (shared across workers, survives restarts)
+        self.session_backend: str = os.getenv("SESSION_BACKEND", "memory").lower()
+        self.session_db_path: str = os.getenv("SESSION_DB_PATH", "data/sessions.db")
+        # Idle sessions are evicted after this many seconds (0 disables)
+        self.session_ttl_seconds: int = int(os.getenv("SESSION_TTL_SECONDS", "43200"))
+        # Least-recently-used sessions are evicted beyond these bounds (0 disables)
+        self.session_max_count: int = int(os.getenv("SESSION_MAX_COUNT", "200"))
+        self.session_max_bytes: int = int(
+            os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024))
+        )
+        # Pooled outbound HTTP connections (per upstream host)
+        self.http_max_connections_per_host: int = int(
+            os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20")
+        )
+        self.http_keepalive_seconds: float = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+        # Concurrent TTS requests per narration (chunks are still streamed in order)
+        self.tts_max_concurrency: int = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+        # Speculatively narrate each new scene into the TTS cache after a choice
+        self.tts_prewarm: bool = os.getenv("TTS_PREWARM", "false").lower() in ("1", "true", "yes")
+        self.tts_prewarm_concurrency: int = int(os.getenv("TTS_PREWARM_CONCURRENCY", "2"))
+        # Speculatively generate the next scene for each choice while the reader decides
+        self.speculative_generation: bool = os.getenv(
+            "SPECULATIVE_GENERATION", "false"
+        ).lower() in ("1", "true", "yes")
+        self.speculation_max_concurrency: int = int(os.getenv("SPECULATION_MAX_CONCURRENCY", "6"))
+        self.speculation_max_per_tier: int = int(os.getenv("SPECULATION_MAX_PER_TIER", "3"))
+        # Estimated LLM tokens speculation may spend per rolling hour
+        self.speculation_token_budget: int = int(
+            os.getenv("SPECULATION_TOKEN_BUDGET", "500000")
+        )
+        # Disk budget for cached narration audio; least-recently-played is evicted (0 disables the bound)
+        self.tts_cache_max_bytes: int = int(
+            os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+        )
+        # Concurrent background media jobs per provider (image, video, cover art)
+        self.job_concurrency_openai: int = int(os.getenv("JOB_CONCURRENCY_OPENAI", "4"))
+        self.job_concurrency_xai: int = int(os.getenv("JOB_CONCURRENCY_XAI", "2"))
+        self.job_concurrency_google: int = int(os.getenv("JOB_CONCURRENCY_GOOGLE", "4"))
+        # Give up on an xAI video that has not finished rendering after this long
+        self.video_timeout_seconds: int = int(os.getenv("VIDEO_TIMEOUT_SECONDS", "300"))
+        # Worker threads that build resized WebP/AVIF copies of generated images
+        self.image_derivative_workers: int = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", "2"))
+        # Also build AVIF derivatives (smaller than WebP, slower to encode)
+        self.image_avif: bool = os.getenv("IMAGE_AVIF", "false").lower() in ("1", "true", "yes")
+        # Images embedded in HTML exports: "jpeg" or "webp", and encoder quality (20-95)
+        self.export_image_format: str = os.getenv("EXPORT_IMAGE_FORMAT", "jpeg")
+        self.export_image_quality: int = int(os.getenv("EXPORT_IMAGE_QUALITY", "75"))
+        # Worker processes that build HTML/PDF exports off the event loop
+        self.export_workers: int = int(os.getenv("EXPORT_WORKERS", "2"))
+        # Format for story, progress and roster files under data/: "json" or "msgpack"
+        self.storage_codec: str = os.getenv("STORAGE_CODEC", "json").lower()
+        # Threads that run story/profile/upload file I/O for async routes
+        self.io_workers: int = int(os.getenv("IO_WORKERS", "8"))
+        # Log the blocking call when the event loop stalls this long (0 disables)
+        self.loop_lag_threshold_ms: int = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
 
     def validate(self):
         """Validate API key configuration."""
@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -14,10 +15,34 @@ from fastapi.templating import Jinja2Templates
 from app.config import settings
 from app.tiers import TIERS, get_public_tiers
 from app.models_registry import get_model_display_name, get_image_model_display_name
+from app.services.clients import close_clients
+from app.services.derivatives import responsive_image
+from app.services.export import shutdown_export_pool
+from app.services.io_pool import shutdown_io_pool
+from app.services.jobs import job_queue
+from app.services.loop_monitor import loop_monitor
+from app.services.video_poller import video_poller
+from app.session import SessionConflict
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-app = FastAPI(title="Choose Your Own Adventure")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume media jobs left unfinished by a previous run
+    await job_queue.start()
+    await loop_monitor.start()
+    yield
+    await loop_monitor.stop()
+    await job_queue.stop()
+    await video_poller.stop()
+    shutdown_export_pool()
+    shutdown_io_pool()
+    # Release pooled provider connections on shutdown
+    await close_clients()
+
+
+app = FastAPI(title="Choose Your Own Adventure", lifespan=lifespan)
 
 # Ensure runtime directories exist
 os.makedirs(BASE_DIR / "static" / "images", exist_ok=True)
@@ -33,6 +58,7 @@ app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="stat
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 templates.env.globals["get_model_display_name"] = get_model_display_name
 templates.env.globals["get_image_model_display_name"] = get_image_model_display_name
+templates.env.globals["responsive_image"] = responsive_image
 templates.env.filters["regex_split"] = lambda value, pattern: re.split(pattern, value) if value else []
 
 # Validate settings on startup
@@ -66,6 +92,25 @@ async def landing(request: Request):
     )
 
 
+@app.exception_handler(SessionConflict)
+async def session_conflict(request: Request, exc: SessionConflict):
+    """Another request changed the story while this one was saving it."""
+    prefix = request.url.path.strip("/").split("/")[0]
+    tier = next((t for t in TIERS.values() if t.prefix == prefix), None)
+    url_prefix = f"/{tier.prefix}" if tier else ""
+    return templates.TemplateResponse(
+        request,
+        "error.html",
+        {
+            "tier": tier,
+            "url_prefix": url_prefix,
+            "error_message": "Your story was changed somewhere else at the same time. Please try again.",
+            "retry_url": request.headers.get("referer") or f"{url_prefix}/",
+        },
+        status_code=409,
+    )
+
+
 # Import and mount tier routers after app is created to avoid circular imports
 from app.routes import create_tier_router  # noqa: E402
 
@@ -74,6 +74,10 @@ class Image(BaseModel):
     video_url: Optional[str] = None
     video_status: str = "none"
     video_error: Optional[str] = None
+    # xAI request id of the in-flight video, so a resumed job can keep waiting on it
+    video_request_id: Optional[str] = None
+    # When that request was submitted (epoch seconds), so a resumed job keeps its age
+    video_submitted_at: Optional[float] = None
 
 
 class Choice(BaseModel):
@@ -238,6 +242,16 @@ class StorySession(BaseModel):
         self.story.current_scene_id = scene_id
         return self.scenes.get(scene_id)
 
+    def path_to(self, scene_id: str) -> list[Scene]:
+        """Return the scenes from the root down to scene_id, following parent links."""
+        path = []
+        scene = self.scenes.get(scene_id)
+        while scene:
+            path.append(scene)
+            scene = self.scenes.get(scene.parent_scene_id) if scene.parent_scene_id else None
+        path.reverse()
+        return path
+
     def get_full_context(self) -> list[Scene]:
         return [
             self.scenes[sid]
@@ -301,9 +315,45 @@ class SavedStory(BaseModel):
     completed_at: datetime = Field(default_factory=datetime.now)
     cover_art_url: Optional[str] = None
     cover_art_status: str = "none"
+    # Listing fields derived from scenes; serialized ahead of them so a
+    # summary can be read without parsing the story body
+    scene_count: int = 0
+    chapter_count: int = 0
+    first_image_url: Optional[str] = None
     scenes: dict[str, SavedScene] = Field(default_factory=dict)
     path_history: list[str] = Field(default_factory=list)
 
+    def refresh_summary(self) -> None:
+        """Recompute the derived listing fields from scenes and path_history."""
+        self.scene_count = len(self.scenes)
+        self.chapter_count = sum(1 for s in self.scenes.values() if s.chapter_number)
+        first_scene = self.scenes.get(self.path_history[0]) if self.path_history else None
+        self.first_image_url = first_scene.image_url if first_scene else None
+
+
+class SavedStorySummary(BaseModel):
+    """Header fields of a SavedStory, for listings that never need the scenes."""
+
+    story_id: str
+    title: str
+    prompt: str
+    tier: str
+    length: str
+    model: str = "claude"
+    image_model: str = "dalle"
+    video_mode: bool = False
+    bedtime_mode: bool = False
+    art_style: str = ""
+    parent_story_id: Optional[str] = None
+    sequel_story_ids: list[str] = Field(default_factory=list)
+    created_at: datetime
+    completed_at: datetime = Field(default_factory=datetime.now)
+    cover_art_url: Optional[str] = None
+    cover_art_status: str = "none"
+    scene_count: int = 0
+    chapter_count: int = 0
+    first_image_url: Optional[str] = None
+
 
 # --- Agent Mode (Chat Roleplay) Models ---
 
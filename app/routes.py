@@ -1,12 +1,16 @@
 import asyncio
+import functools
+import json
 import logging
 import random
 import time
+import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from fastapi import APIRouter, Request, Form, File, UploadFile
-from fastapi.responses import RedirectResponse, JSONResponse, Response
+from fastapi.responses import RedirectResponse, JSONResponse, Response, StreamingResponse, FileResponse
 
 from app.main import templates
 from app.models import (
@@ -19,11 +23,19 @@ from app.models import (
     StorySession,
     SCENES_PER_CHAPTER,
 )
-from app.session import create_session, get_session, update_session, delete_session
+from app.session import (
+    SessionConflict, carry_media, create_session, delete_session, get_session, modify_session,
+    update_session,
+)
 from app.services.story import StoryService
 from app.services.image import ImageService
 from app.services.gallery import GalleryService
-from app.services.export import export_html, export_pdf
+from app.services.io_pool import run_io, snapshot
+from app.services.prompt_context import PromptContext, file_versions, prompt_contexts
+from app.services.context_summary import context_summaries
+from app.services.export import (
+    export_coloring_pdf, prepare_export, run_in_export_pool, start_export,
+)
 from app.services.profile import ProfileService
 from app.services.upload import UploadService
 from app.services.character import CharacterService
@@ -41,11 +53,33 @@ from app.models_registry import (
 )
 from app.story_options import get_option_groups, build_story_flavor_prompt, is_picture_book_age, build_kink_prompt, build_intensity_prompt, KINK_TOGGLES
 from app.services.image import FAST_IMAGE_MODEL
-from app.services.tts import generate_speech
+from app.services.tts import get_cached_speech, prewarm_speech, stream_speech
 from app.services.bible import BibleService
+from app.services.speculation import speculation_service
+from app.services.media_events import media_completions, media_events, image_event, extra_image_event, video_event
+from app.services.jobs import (
+    job_queue, image_provider,
+    PRIORITY_SCENE_IMAGE, PRIORITY_EXTRA_IMAGE, PRIORITY_VIDEO, PRIORITY_COVER_ART,
+)
 
 logger = logging.getLogger(__name__)
 
+# session_id -> (scene_id, voice, task, started) for the in-flight narration pre-warm;
+# started is set once the pre-warm is past the shared concurrency cap
+_narration_prewarm_tasks: dict[str, tuple[str, str, asyncio.Task, asyncio.Event]] = {}
+
+# Streamed scene generations, referenced until they finish
+_scene_stream_tasks: set[asyncio.Task] = set()
+
+# Stories per gallery page
+GALLERY_PAGE_SIZE = 24
+
+# Media event streams re-read the session this often (catches other workers'
+# updates and doubles as a keepalive), and close after MEDIA_EVENTS_MAX_SECONDS
+# so the browser reconnects with a fresh snapshot
+MEDIA_EVENTS_RESYNC_SECONDS = 15
+MEDIA_EVENTS_MAX_SECONDS = 600
+
 # Fallback prompts when a tier has no templates defined
 _SURPRISE_FALLBACK_KIDS = [
     "A friendly dragon learns to bake cupcakes for the village party.",
@@ -76,6 +110,188 @@ character_service = CharacterService()
 family_service = FamilyService()
 bible_service = BibleService()
 
+# Images generating for a streamed scene that isn't in its session yet, by scene_id
+_detached_images: dict[str, Image] = {}
+
+# Tasks waiting on a scene image before queueing its video, referenced until they finish
+_video_chain_tasks: set[asyncio.Task] = set()
+
+# Recaps being written, by (session_id, id of the last scene they cover)
+_recap_tasks: dict[tuple[str | None, str], asyncio.Task] = {}
+
+# Longest a video chain waits for its image; queued image jobs can take a while to start
+VIDEO_CHAIN_MAX_WAIT = 600
+
+# Per progress file ("{tier}{suffix}"): lock serializing its saves, and the
+# number of the latest save requested
+_progress_save_locks: dict[str, asyncio.Lock] = {}
+_progress_save_requested: dict[str, int] = {}
+
+
+async def _write_progress(tier: str, story_session: StorySession, suffix: str = "") -> None:
+    """Save a snapshot of story_session as the tier's in-progress story.
+
+    Saves run on the I/O pool, where two of them could finish in either
+    order, so saves of one file are serialized. A save still waiting when
+    a newer one is requested is skipped: the newer snapshot supersedes it.
+    """
+    key = f"{tier}{suffix}"
+    data = snapshot(story_session)
+    seq = _progress_save_requested[key] = _progress_save_requested.get(key, 0) + 1
+    lock = _progress_save_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        if _progress_save_requested[key] != seq:
+            return
+        await gallery_service.aio.save_progress(tier, data, suffix=suffix)
+
+
+async def _load_job_target(
+    payload: dict,
+) -> tuple[StorySession | None, Callable[[], Awaitable[None]]]:
+    """Find the story session a media job updates, and how to persist it afterwards.
+
+    Prefers the live session the job was submitted from. A job resumed
+    after a restart falls back to the tier's in-progress save. Returns
+    (None, no-op) when neither still holds the story.
+    """
+    tier, suffix, story_id = payload["tier"], payload["suffix"], payload["story_id"]
+    session_id = payload.get("session_id")
+    story_session = get_session(session_id) if session_id else None
+    if story_session and story_session.story.story_id == story_id:
+        scene_id = payload.get("scene_id")
+
+        def apply(latest: StorySession) -> None:
+            # Another request or worker may have written the session since the
+            # job read it, so only the job's media results are carried over
+            if latest is story_session or latest.story.story_id != story_id:
+                return
+            carry_media(latest, story_session, [scene_id] if scene_id else None)
+            reference = story_session.story.generated_reference_path
+            if scene_id and reference.endswith(f"{scene_id}.png"):
+                latest.story.generated_reference_path = reference
+
+        async def persist():
+            try:
+                latest = modify_session(session_id, apply)
+            except SessionConflict:
+                logger.warning(f"Could not save media results to session {session_id}: kept conflicting")
+                latest = None
+            if latest is None or latest.story.story_id != story_id:
+                latest = story_session
+            # Keep the in-progress save's media statuses current too
+            progress = await gallery_service.aio.load_progress(tier, suffix=suffix)
+            if progress and progress.story.story_id == story_id:
+                await _write_progress(tier, latest, suffix=suffix)
+        return story_session, persist
+
+    progress = await gallery_service.aio.load_progress(tier, suffix=suffix)
+    if progress and progress.story.story_id == story_id:
+        async def persist_progress():
+            await _write_progress(tier, progress, suffix=suffix)
+        return progress, persist_progress
+
+    async def persist_nothing():
+        pass
+    return None, persist_nothing
+
+
+async def _run_scene_image_job(payload: dict, resumed: bool) -> None:
+    """Generate a scene's main image and make it the story's rolling reference."""
+    scene_id = payload["scene_id"]
+    story_session, persist = await _load_job_target(payload)
+    scene = story_session.scenes.get(scene_id) if story_session else None
+    image = scene.image if scene else _detached_images.get(scene_id)
+    if image is None:
+        logger.info(f"Skipping image job for scene {scene_id}: story no longer available")
+        media_completions.resolve("image", scene_id, ImageStatus.FAILED.value)
+        return
+    if resumed and image.status == ImageStatus.COMPLETE:
+        return
+
+    try:
+        await image_service.generate_image(
+            image, scene_id, payload["image_model"],
+            reference_images=payload.get("reference_images"),
+        )
+        if image.status == ImageStatus.COMPLETE and story_session:
+            from app.services.image import STATIC_IMAGES_DIR
+            gen_path = STATIC_IMAGES_DIR / f"{scene_id}.png"
+            if await run_io(gen_path.exists):
+                story_session.story.generated_reference_path = str(gen_path)
+    finally:
+        await persist()
+
+    if image.status == ImageStatus.FAILED:
+        raise RuntimeError(image.error or "image generation failed")
+    # The in-process wait that chains video after the image died with the
+    # previous run, so queue the video from here instead
+    if resumed and story_session and story_session.story.video_mode and image.video_status != "complete":
+        job_queue.submit("video", payload, PRIORITY_VIDEO, "xai")
+
+
+async def _run_extra_images_job(payload: dict, resumed: bool) -> None:
+    """Generate a scene's picture book images, or retry one of them."""
+    scene_id = payload["scene_id"]
+    story_session, persist = await _load_job_target(payload)
+    scene = story_session.scenes.get(scene_id) if story_session else None
+    if not scene or not scene.extra_images:
+        logger.info(f"Skipping extra images job for scene {scene_id}: story no longer available")
+        return
+
+    index = payload.get("index")
+    try:
+        if index is not None:
+            extra_img = scene.extra_images[index]
+            await image_service.generate_image(
+                extra_img, f"{scene_id}_extra_{index}", payload["image_model"],
+            )
+            media_events.publish_extra_image(scene_id, index, extra_img)
+        elif not (resumed and all(ei.status == ImageStatus.COMPLETE for ei in scene.extra_images)):
+            await image_service.generate_extra_images(
+                scene.extra_images, scene_id, payload["main_prompt"],
+                payload["image_model"], reference_images=payload.get("reference_images"),
+            )
+    finally:
+        await persist()
+
+
+async def _run_video_job(payload: dict, resumed: bool) -> None:
+    """Generate a scene's video clip from its image."""
+    scene_id = payload["scene_id"]
+    story_session, persist = await _load_job_target(payload)
+    scene = story_session.scenes.get(scene_id) if story_session else None
+    if not scene or not scene.image:
+        logger.info(f"Skipping video job for scene {scene_id}: story no longer available")
+        return
+    image = scene.image
+    if resumed and image.video_status == "complete":
+        return
+
+    try:
+        await image_service.generate_video(
+            image, scene_id, resume=resumed, on_submitted=persist,
+        )
+    finally:
+        await persist()
+    if image.video_status == "failed":
+        raise RuntimeError(image.video_error or "video generation failed")
+
+
+async def _run_cover_art_job(payload: dict, resumed: bool) -> None:
+    """Generate a completed story's cover art (persisted by GalleryService)."""
+    if resumed:
+        saved = await gallery_service.aio.get_story(payload["story_id"])
+        if not saved or saved.cover_art_status == "complete":
+            return
+    await gallery_service.generate_cover_art(image_service=image_service, **payload)
+
+
+job_queue.register("scene_image", _run_scene_image_job)
+job_queue.register("extra_images", _run_extra_images_job)
+job_queue.register("video", _run_video_job)
+job_queue.register("cover_art", _run_cover_art_job)
+
+
 def create_tier_router(tier_config: TierConfig) -> APIRouter:
     """Create a router for a specific audience tier.
 
@@ -87,7 +303,402 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     cookie_path = f"/{tier_config.prefix}/"
     session_cookie = f"session_{tier_config.prefix}"
 
-    def _setup_extra_images(scene, main_prompt, image_model, photo_paths):
+    def _media_job_payload(session_id: str | None, story_session, scene_id: str, **extra) -> dict:
+        """Build a media job payload that can find its scene again after a restart."""
+        return {
+            "tier": tier_config.name,
+            "session_id": session_id,
+            "story_id": story_session.story.story_id,
+            "suffix": _progress_suffix(story_session),
+            "scene_id": scene_id,
+            **extra,
+        }
+
+    def _submit_scene_image(
+        session_id: str | None, story_session, scene_id: str,
+        image_model: str, reference_images: list[str] | None,
+    ) -> int:
+        """Queue generation of a scene's main image at the highest priority."""
+        return job_queue.submit(
+            "scene_image",
+            _media_job_payload(
+                session_id, story_session, scene_id,
+                image_model=image_model, reference_images=reference_images,
+            ),
+            PRIORITY_SCENE_IMAGE, image_provider(image_model),
+        )
+
+    def _start_video_chain(image: Image, scene_id: str, session_id: str | None, story_session) -> None:
+        """Queue the scene's video once its image is done."""
+        task = asyncio.create_task(
+            _chain_video_after_image(image, scene_id, session_id, story_session)
+        )
+        _video_chain_tasks.add(task)
+        task.add_done_callback(_video_chain_tasks.discard)
+
+    def _prewarm_narration(request: Request, session_id: str, scene: Scene) -> None:
+        """Start synthesizing the scene's narration into the TTS cache.
+
+        Uses the voice Read Aloud would use. Replaces (and cancels) any
+        pre-warm still running for the session's previous scene.
+        """
+        _cancel_narration_prewarm(session_id)
+        if not app_settings.tts_prewarm or not app_settings.openai_api_key:
+            return
+        voice = request.cookies.get(
+            f"tts_voice_{tier_config.prefix}", tier_config.tts_default_voice
+        )
+        started = asyncio.Event()
+        task = asyncio.create_task(
+            prewarm_speech(scene.content, voice, tier_config.tts_instructions, started)
+        )
+        _narration_prewarm_tasks[session_id] = (scene.scene_id, voice, task, started)
+
+        def _done(_task):
+            entry = _narration_prewarm_tasks.get(session_id)
+            if entry and entry[2] is _task:
+                del _narration_prewarm_tasks[session_id]
+            if not _task.cancelled() and _task.exception():
+                logger.warning(f"Narration pre-warm failed for scene {scene.scene_id}: {_task.exception()}")
+
+        task.add_done_callback(_done)
+
+    def _cancel_narration_prewarm(session_id: str | None) -> None:
+        entry = _narration_prewarm_tasks.pop(session_id, None) if session_id else None
+        if entry:
+            entry[2].cancel()
+
+    async def _await_narration_prewarm(session_id: str | None, scene_id: str, voice: str) -> None:
+        """Wait for a matching in-flight pre-warm so Read Aloud reuses its audio
+        instead of paying for the same synthesis twice.
+
+        A pre-warm still queued behind other sessions' pre-warms is
+        cancelled instead, and Read Aloud synthesizes directly.
+        """
+        entry = _narration_prewarm_tasks.get(session_id) if session_id else None
+        if not entry or entry[0] != scene_id or entry[1] != voice:
+            return
+        if entry[3].is_set():
+            await asyncio.wait({entry[2]})
+        else:
+            _cancel_narration_prewarm(session_id)
+
+    def _compile_prompt_context(story) -> PromptContext:
+        """Build the story-level content guidelines, image style and roster photos.
+
+        Re-applies the profile, art style, story flavor, characters and
+        bedtime mode persisted on the story. Reads profile and character
+        files, so it runs on the file I/O pool.
+        """
+        sources: dict[Path, int] = {}
+
+        def track(path: Path) -> None:
+            sources.update(file_versions([path]))
+
+        # Build content guidelines and image style, re-applying profile if active
+        content_guidelines = tier_config.content_guidelines
+        image_style = tier_config.image_style
+
+        if story.profile_id:
+            track(profile_service.profile_path(tier_config.name, story.profile_id))
+            profile = profile_service.get_profile(tier_config.name, story.profile_id)
+            if profile:
+                # build_profile_context also reads these
+                for rc_id in profile.character_ids:
+                    track(character_service.character_path(tier_config.name, rc_id))
+                for char in profile.characters:
+                    if char.linked_profile_id:
+                        track(profile_service.profile_path(tier_config.name, char.linked_profile_id))
+                ctx_addition, style_addition, _ = profile_service.build_profile_context(
+                    profile, tier_config.name
+                )
+                if ctx_addition:
+                    content_guidelines = content_guidelines + "\n\n" + ctx_addition
+                if style_addition:
+                    image_style = (image_style + ", " + style_addition) if image_style else style_addition
+
+        # Apply user-selected art style (persisted on story)
+        art_style_prompt = get_art_style_prompt(story.art_style)
+        if art_style_prompt:
+            image_style = (image_style + ", " + art_style_prompt) if image_style else art_style_prompt
+
+        # Rebuild story flavor from persisted options
+        story_flavor = build_story_flavor_prompt(
+            protagonist_gender=story.protagonist_gender,
+            protagonist_age=story.protagonist_age,
+            character_type=story.character_type,
+            num_characters=story.num_characters,
+            writing_style=story.writing_style,
+            conflict_type=story.conflict_type,
+        )
+        if story_flavor:
+            content_guidelines = content_guidelines + "\n\n" + story_flavor
+
+        # Rebuild character prompt from persisted character fields
+        if story.character_name:
+            char_block = f"CHARACTER:\nName: {story.character_name}"
+            if story.character_description:
+                char_block += f"\nAppearance: {story.character_description}"
+            char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
+            content_guidelines = content_guidelines + "\n\n" + char_block
+            if story.character_description:
+                image_style = (image_style + ", " + story.character_description) if image_style else story.character_description
+
+        # Rebuild roster character context from persisted roster_character_ids
+        roster_photo_paths: list[str] = []
+        for rc_id in story.roster_character_ids:
+            track(character_service.character_path(tier_config.name, rc_id))
+            rc = character_service.get_character(tier_config.name, rc_id)
+            if rc:
+                roster_photo_paths.extend(character_service.get_absolute_photo_paths(rc))
+                char_block = f"CHARACTER:\nName: {rc.name}"
+                if rc.description:
+                    char_block += f"\nAppearance: {rc.description}"
+                if tier_config.name == "nsfw" and rc.relationship_stage != "strangers":
+                    from app.story_options import RELATIONSHIP_PROMPTS
+                    rel_prompt = RELATIONSHIP_PROMPTS.get(rc.relationship_stage, "")
+                    if rel_prompt:
+                        char_block += f"\nRelationship: {rel_prompt.format(name=rc.name)}"
+                char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
+                content_guidelines = content_guidelines + "\n\n" + char_block
+                if rc.description:
+                    image_style = (image_style + ", " + rc.description) if image_style else rc.description
+
+        # Apply bedtime mode guidelines if active
+        if story.bedtime_mode:
+            content_guidelines = content_guidelines + "\n\n" + BEDTIME_CONTENT_GUIDELINES
+            image_style = BEDTIME_IMAGE_STYLE
+
+        context = PromptContext(
+            content_guidelines=content_guidelines,
+            image_style=image_style,
+            roster_photo_paths=roster_photo_paths,
+            sources=sources,
+        )
+        prompt_contexts.put(story, context)
+        return context
+
+    async def _prompt_context(story) -> PromptContext:
+        """Return the story's compiled prompt context, compiling it if stale."""
+        story = snapshot(story)
+        return await run_io(lambda: prompt_contexts.get(story) or _compile_prompt_context(story))
+
+    async def _build_continuation_kwargs(story_session, scene, choice_text: str) -> dict:
+        """Build the generate_scene() arguments for continuing from scene via choice_text."""
+        context_scenes = story_session.get_full_context()
+        context_summary, summarized_scenes = context_summaries.for_context(context_scenes)
+        new_depth = scene.depth + 1
+        prompt_context = await _prompt_context(story_session.story)
+
+        # Compute chapter info for epic stories
+        is_epic = story_session.story.length == StoryLength.EPIC
+        is_chapter_start = is_epic and (new_depth % SCENES_PER_CHAPTER == 0)
+        chapter_number = ((new_depth // SCENES_PER_CHAPTER) + 1) if is_epic else None
+        total_chapters = (story_session.story.target_depth // SCENES_PER_CHAPTER) if is_epic else None
+
+        return {
+            "prompt": story_session.story.prompt,
+            "story_length": story_session.story.length,
+            "context_scenes": context_scenes,
+            "current_depth": new_depth,
+            "target_depth": story_session.story.target_depth,
+            "choice_text": choice_text,
+            "content_guidelines": prompt_context.content_guidelines,
+            "image_style": prompt_context.image_style,
+            "model": story_session.story.model,
+            "is_chapter_start": is_chapter_start,
+            "chapter_number": chapter_number,
+            "total_chapters": total_chapters,
+            "context_summary": context_summary,
+            "summarized_scenes": summarized_scenes,
+        }
+
+    def _refresh_context_summary(story_session) -> None:
+        """Fold the story's earlier scenes into its rolling summary in the background."""
+        context_summaries.refresh(
+            story_session.get_full_context(),
+            functools.partial(
+                story_service.fold_summary,
+                model=story_session.story.model,
+                content_guidelines=tier_config.content_guidelines,
+            ),
+        )
+
+    async def _speculate_next_scenes(session_id, story_session, scene) -> None:
+        """Pre-generate the next scene for each unexplored choice (opt-in)."""
+        if not speculation_service.enabled or not session_id:
+            return
+        if scene.is_ending or scene.scene_id != story_session.story.current_scene_id:
+            return
+        unexplored = [c for c in scene.choices if not c.next_scene_id]
+        if not unexplored:
+            return
+        base_kwargs = await _build_continuation_kwargs(story_session, scene, "")
+        speculation_service.speculate(
+            session_id,
+            tier_config.name,
+            scene.scene_id,
+            {c.choice_id: {**base_kwargs, "choice_text": c.text} for c in unexplored},
+            story_service.generate_scene,
+        )
+
+    async def _commit_next_scene(
+        request: Request, session_id: str, story_session, scene, choice,
+        scene_data: dict, generation_kwargs: dict,
+        new_scene_id: str | None = None, new_image: Image | None = None,
+    ) -> Scene:
+        """Attach a generated scene under choice, start its media and save progress.
+
+        Pass new_image when its generation already started while the scene
+        text was streaming in; choice is appended to scene if it is new.
+        """
+        is_chapter_start = generation_kwargs["is_chapter_start"]
+        chapter_number = generation_kwargs["chapter_number"]
+        image_started = new_image is not None
+        if new_image is None:
+            new_image = Image(prompt=scene_data["image_prompt"])
+        new_choices = [
+            Choice(text=c["text"]) for c in scene_data.get("choices", [])
+        ]
+        new_scene = Scene(
+            **({"scene_id": new_scene_id} if new_scene_id else {}),
+            content=scene_data["content"],
+            image=new_image,
+            choices=new_choices,
+            is_ending=scene_data.get("is_ending", False),
+            depth=generation_kwargs["current_depth"],
+            parent_scene_id=scene.scene_id,
+            choice_taken_id=choice.choice_id,
+            chapter_number=chapter_number if is_chapter_start else None,
+            chapter_title=scene_data.get("chapter_title") if is_chapter_start else None,
+        )
+
+        def attach(latest) -> None:
+            parent = latest.scenes.get(scene.scene_id, scene)
+            taken = next((c for c in parent.choices if c.choice_id == choice.choice_id), None)
+            if taken is None:
+                taken = choice
+                parent.choices.append(choice)
+            taken.next_scene_id = new_scene.scene_id
+            latest.navigate_forward(new_scene)
+
+        choice.next_scene_id = new_scene.scene_id
+        story_session = _modify_story(session_id, story_session, attach)
+
+        ref_images = await _build_reference_images(story_session)
+        if not image_started:
+            _submit_scene_image(
+                session_id, story_session, new_scene.scene_id,
+                story_session.story.image_model, ref_images,
+            )
+
+        # Picture book mode: generate extra images for young ages
+        if is_picture_book_age(story_session.story.protagonist_age):
+            _setup_extra_images(
+                new_scene, scene_data["image_prompt"],
+                story_session.story.image_model, ref_images or [],
+                session_id, story_session,
+            )
+
+        if story_session.story.video_mode:
+            _start_video_chain(new_image, new_scene.scene_id, session_id, story_session)
+
+        _prewarm_narration(request, session_id, new_scene)
+
+        # Auto-save completed stories to gallery, or save progress
+        if new_scene.is_ending:
+            await gallery_service.aio.save_story(snapshot(story_session))
+            _start_cover_art(story_session)
+            await _advance_relationships_for_story(story_session)
+            await gallery_service.aio.delete_progress(tier_config.name, suffix=_progress_suffix(story_session))
+            if session_id:
+                await upload_service.aio.cleanup_session(session_id)
+        else:
+            await _save_progress(story_session)
+
+        return new_scene
+
+    def _wants_event_stream(request: Request) -> bool:
+        return "text/event-stream" in request.headers.get("accept", "")
+
+    def _stream_next_scene(
+        request: Request, session_id: str, story_session, scene, choice,
+        generation_kwargs: dict, speculated: bool = False,
+    ) -> StreamingResponse:
+        """Generate the next scene, streaming its text to the browser as SSE.
+
+        Sends "content" events with narrative text as it arrives, then
+        "done" with the new scene's URL, or "error". The scene image starts
+        generating as soon as its prompt is parsed. Generation runs in its
+        own task, so the scene is still committed under the choice if the
+        reader disconnects mid-stream.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        def send(event: str, data: dict) -> None:
+            events.put_nowait(f"event: {event}\ndata: {json.dumps(data)}\n\n")
+
+        async def generate():
+            new_scene_id = str(uuid.uuid4())
+            new_image = None
+            image_job_id = None
+            try:
+                scene_data = None
+                if speculated:
+                    scene_data = await speculation_service.take(
+                        session_id, scene.scene_id, choice.choice_id
+                    )
+                if scene_data is not None:
+                    send("content", {"text": scene_data["content"]})
+                else:
+                    async for event, value in story_service.stream_scene(**generation_kwargs):
+                        if event == "content":
+                            send("content", {"text": value})
+                        elif event == "image_prompt":
+                            new_image = Image(prompt=value)
+                            _detached_images[new_scene_id] = new_image
+                            image_job_id = _submit_scene_image(
+                                session_id, story_session, new_scene_id,
+                                story_session.story.image_model,
+                                await _build_reference_images(story_session),
+                            )
+                        elif event == "scene":
+                            scene_data = value
+
+                new_scene = await _commit_next_scene(
+                    request, session_id, story_session, scene, choice,
+                    scene_data, generation_kwargs,
+                    new_scene_id=new_scene_id, new_image=new_image,
+                )
+                send("done", {"url": f"{url_prefix}/story/scene/{new_scene.scene_id}"})
+            except Exception as e:
+                logger.error(f"Failed to stream next scene: {e}")
+                if image_job_id:
+                    job_queue.cancel(image_job_id)
+                update_session(session_id, story_session)
+                send("error", {
+                    "message": f"Failed to generate the next scene: {e}",
+                    "retry_url": f"{url_prefix}/story/scene/{scene.scene_id}",
+                })
+            finally:
+                _detached_images.pop(new_scene_id, None)
+                events.put_nowait(None)
+
+        task = asyncio.create_task(generate())
+        _scene_stream_tasks.add(task)
+        task.add_done_callback(_scene_stream_tasks.discard)
+
+        async def body():
+            while (event := await events.get()) is not None:
+                yield event
+
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    def _setup_extra_images(scene, main_prompt, image_model, photo_paths, session_id, story_session):
         """If picture book mode is active, create extra Image objects and kick off generation."""
         story = None  # Will be set from caller context
         # Caller passes protagonist_age; this is checked before calling
@@ -98,37 +709,48 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         available_image_keys = [m.key for m in get_available_image_models()]
         fast_model = FAST_IMAGE_MODEL if FAST_IMAGE_MODEL in available_image_keys else image_model
 
-        asyncio.create_task(
-            image_service.generate_extra_images(
-                extra_images, scene.scene_id, main_prompt,
-                fast_model, reference_images=photo_paths or None,
-            )
+        job_queue.submit(
+            "extra_images",
+            _media_job_payload(
+                session_id, story_session, scene.scene_id,
+                main_prompt=main_prompt, image_model=fast_model,
+                reference_images=photo_paths or None,
+            ),
+            PRIORITY_EXTRA_IMAGE, image_provider(fast_model),
         )
 
     def _start_cover_art(story_session):
         """Kick off async cover art generation for a completed story."""
-        story = story_session.story
-        asyncio.create_task(
-            gallery_service.generate_cover_art(
-                image_service=image_service,
-                story_id=story.story_id,
-                title=story.title,
-                prompt=story.prompt,
-                image_model=story.image_model,
-                tier=tier_config.name,
-                art_style=story.art_style,
-            )
-        )
-
-    async def _chain_video_after_image(image, scene_id):
-        """Wait for image generation to complete, then generate video."""
-        max_wait = 120  # 2 minutes
-        waited = 0
-        while image.status not in (ImageStatus.COMPLETE, ImageStatus.FAILED) and waited < max_wait:
-            await asyncio.sleep(2)
-            waited += 2
+        _submit_cover_art(story_session.story)
+
+    def _submit_cover_art(story) -> None:
+        """Queue cover art for a Story or SavedStory at the lowest priority."""
+        job_queue.submit(
+            "cover_art",
+            {
+                "story_id": story.story_id,
+                "title": story.title,
+                "prompt": story.prompt,
+                "image_model": story.image_model,
+                "tier": tier_config.name,
+                "art_style": story.art_style,
+            },
+            PRIORITY_COVER_ART, image_provider(story.image_model),
+        )
+
+    async def _chain_video_after_image(image, scene_id, session_id, story_session):
+        """Queue the video as soon as the scene's image generation settles."""
+        if image.status not in (ImageStatus.COMPLETE, ImageStatus.FAILED):
+            try:
+                await media_completions.wait("image", scene_id, timeout=VIDEO_CHAIN_MAX_WAIT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Gave up waiting on image for scene {scene_id}; no video queued")
+                return
         if image.status == ImageStatus.COMPLETE:
-            await image_service.generate_video(image, scene_id)
+            job_queue.submit(
+                "video", _media_job_payload(session_id, story_session, scene_id),
+                PRIORITY_VIDEO, "xai",
+            )
 
     def _ctx(extra: dict | None = None) -> dict:
         """Build common template context with tier info."""
@@ -137,13 +759,25 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             ctx.update(extra)
         return ctx
 
-    def _advance_relationships_for_story(story_session):
+    def _modify_story(session_id: str, story_session, apply: Callable[[StorySession], None]):
+        """Apply a change to the latest copy of the session and save it.
+
+        Returns the session as saved, which is a fresh copy rather than
+        story_session if another worker wrote it since this request read it.
+        """
+        latest = modify_session(session_id, apply)
+        if latest is None:
+            apply(story_session)
+            return story_session
+        return latest
+
+    async def _advance_relationships_for_story(story_session):
         """Advance relationship stage for all roster characters in a completed story (NSFW only)."""
         if tier_config.name != "nsfw":
             return
         roster_ids = getattr(story_session.story, "roster_character_ids", [])
         for rc_id in roster_ids:
-            character_service.advance_relationship(tier_config.name, rc_id)
+            await character_service.aio.advance_relationship(tier_config.name, rc_id)
 
     def _get_story_session(request: Request) -> StorySession | None:
         session_id = request.cookies.get(session_cookie)
@@ -151,7 +785,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             return None
         return get_session(session_id)
 
-    def _build_reference_images(story_session: StorySession) -> list[str] | None:
+    async def _build_reference_images(story_session: StorySession) -> list[str] | None:
         """Build the reference image list for image generation.
 
         Priority: direct uploads > roster character photos > generated scene reference.
@@ -163,39 +797,19 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         if story.reference_photo_paths:
             return story.reference_photo_paths[:3] or None
 
+        # Roster character photos, from the compiled prompt context
         refs: list[str] = []
-        # Collect roster character photos
-        for rc_id in story.roster_character_ids:
-            rc = character_service.get_character(tier_config.name, rc_id)
-            if rc:
-                rc_photos = character_service.get_absolute_photo_paths(rc)
-                for rp in rc_photos:
-                    if len(refs) < 3:
-                        refs.append(rp)
+        if story.roster_character_ids:
+            refs = (await _prompt_context(story)).roster_photo_paths[:3]
 
         # Append generated scene reference if available and file exists
         if story.generated_reference_path:
             gen_path = Path(story.generated_reference_path)
-            if gen_path.exists() and len(refs) < 3:
+            if len(refs) < 3 and await run_io(gen_path.exists):
                 refs.append(str(gen_path))
 
         return refs or None
 
-    async def _generate_and_track_reference(
-        image: Image, scene_id: str, image_model: str,
-        reference_images: list[str] | None, story: Story,
-    ) -> None:
-        """Wrapper around generate_image that updates the rolling reference on success."""
-        await image_service.generate_image(
-            image, scene_id, image_model,
-            reference_images=reference_images,
-        )
-        if image.status == ImageStatus.COMPLETE:
-            from app.services.image import STATIC_IMAGES_DIR
-            gen_path = STATIC_IMAGES_DIR / f"{scene_id}.png"
-            if gen_path.exists():
-                story.generated_reference_path = str(gen_path)
-
     def _get_session_id(request: Request) -> str | None:
         return request.cookies.get(session_cookie)
 
@@ -205,6 +819,12 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             return "_chapter"
         return ""
 
+    async def _save_progress(story_session: StorySession) -> None:
+        """Save the tier's in-progress story on the file I/O pool."""
+        await _write_progress(
+            tier_config.name, story_session, suffix=_progress_suffix(story_session),
+        )
+
     @router.get("/")
     async def tier_home(request: Request):
         """Tier home page with prompt input form."""
@@ -212,7 +832,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Check for in-progress story to show resume banner
         resume_story = None
-        progress = gallery_service.load_progress(tier_config.name)
+        progress = await gallery_service.aio.load_progress(tier_config.name)
         if progress:
             resume_story = {
                 "title": progress.story.title,
@@ -222,7 +842,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Check for in-progress chapter (epic) story
         resume_chapter = None
-        chapter_progress = gallery_service.load_progress(tier_config.name, suffix="_chapter")
+        chapter_progress = await gallery_service.aio.load_progress(tier_config.name, suffix="_chapter")
         if chapter_progress:
             ch_depth = len(chapter_progress.path_history) - 1
             ch_number = (ch_depth // SCENES_PER_CHAPTER) + 1
@@ -250,13 +870,13 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             default_image_model = available_image_models[0].key
 
         # Get profiles for memory mode toggle
-        profiles = profile_service.list_profiles(tier_config.name)
+        profiles = await profile_service.aio.list_profiles(tier_config.name)
 
         # Get roster characters for character picker
         import json
         roster_characters = []
         roster_characters_json = "[]"
-        roster_characters = character_service.list_characters(tier_config.name)
+        roster_characters = await character_service.aio.list_characters(tier_config.name)
         if roster_characters:
             # Build JSON for picker initialization
             roster_json_data = []
@@ -277,7 +897,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             roster_characters_json = json.dumps(roster_json_data)
 
         # Get family for Family Mode toggle
-        family = family_service.get_family(tier_config.name)
+        family = await family_service.aio.get_family(tier_config.name)
 
         # Build inline attribute config for character section
         from app.story_options import get_attributes_for_tier
@@ -385,7 +1005,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Clean up previous session's uploads if starting a new story
         old_session_id = _get_session_id(request)
         if old_session_id:
-            upload_service.cleanup_session(old_session_id)
+            await upload_service.aio.cleanup_session(old_session_id)
 
         # Validate model against available models, fall back to tier default
         available_keys = [m.key for m in get_available_models()]
@@ -433,10 +1053,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 content_guidelines = content_guidelines + "\n" + scripture_addition
 
         if memory_mode == "on" and profile_id:
-            profile = profile_service.get_profile(tier_config.name, profile_id)
+            profile = await profile_service.aio.get_profile(tier_config.name, profile_id)
             if profile:
                 active_profile_id = profile_id
-                ctx_addition, style_addition, photo_paths = profile_service.build_profile_context(
+                ctx_addition, style_addition, photo_paths = await profile_service.aio.build_profile_context(
                     profile, tier_config.name
                 )
                 if ctx_addition:
@@ -446,9 +1066,9 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Inject family context if Family Mode is enabled
         if family_mode == "on":
-            family = family_service.get_family(tier_config.name)
+            family = await family_service.aio.get_family(tier_config.name)
             if family:
-                family_ctx = family_service.build_family_context(family)
+                family_ctx = await family_service.aio.build_family_context(family)
                 if family_ctx:
                     content_guidelines = content_guidelines + "\n\n" + family_ctx
 
@@ -504,7 +1124,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Merge profile's character_ids into roster selection (T026)
         if memory_mode == "on" and profile_id:
-            profile_obj = profile_service.get_profile(tier_config.name, profile_id)
+            profile_obj = await profile_service.aio.get_profile(tier_config.name, profile_id)
             if profile_obj and profile_obj.character_ids:
                 for pc_id in profile_obj.character_ids:
                     if pc_id not in roster_character_ids:
@@ -516,7 +1136,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             rc_id = rc_id.strip()
             if not rc_id:
                 continue
-            rc = character_service.get_character(tier_config.name, rc_id)
+            rc = await character_service.aio.get_character(tier_config.name, rc_id)
             if rc:
                 valid_roster_ids.append(rc_id)
                 char_block = f"CHARACTER:\nName: {rc.name}"
@@ -534,7 +1154,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                     image_style = (image_style + ", " + rc.description) if image_style else rc.description
                 # Collect roster character photos (up to 3 total across all characters)
                 if len(photo_paths) < 3:
-                    rc_photos = character_service.get_absolute_photo_paths(rc)
+                    rc_photos = await character_service.aio.get_absolute_photo_paths(rc)
                     for rp in rc_photos:
                         if len(photo_paths) < 3:
                             photo_paths.append(rp)
@@ -559,7 +1179,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 pass
 
         # Replace any existing in-progress save for this tier (FR-009)
-        gallery_service.delete_progress(tier_config.name)
+        await gallery_service.aio.delete_progress(tier_config.name)
 
         try:
             story_length = StoryLength(length)
@@ -595,6 +1215,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 is_chapter_start=is_chapter_start,
                 chapter_number=chapter_number,
                 total_chapters=total_chapters,
+                hedge=True,
             )
 
             image = Image(prompt=scene_data["image_prompt"])
@@ -653,31 +1274,32 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                     logger.warning(f"Upload validation failed: {upload_err}")
                     # Continue without reference photos rather than failing the story
 
-            ref_images = _build_reference_images(story_session)
-            asyncio.create_task(
-                _generate_and_track_reference(
-                    image, scene.scene_id, image_model,
-                    ref_images, story,
-                )
+            # Compiled once here; every later choice reuses it
+            await _prompt_context(story)
+            ref_images = await _build_reference_images(story_session)
+            _submit_scene_image(
+                session_id, story_session, scene.scene_id,
+                image_model, ref_images,
             )
 
             # Picture book mode: generate extra images for young ages
             if is_picture_book_age(protagonist_age):
-                _setup_extra_images(scene, scene_data["image_prompt"], image_model, ref_images or [])
+                _setup_extra_images(
+                    scene, scene_data["image_prompt"], image_model, ref_images or [],
+                    session_id, story_session,
+                )
 
             if story.video_mode:
-                asyncio.create_task(
-                    _chain_video_after_image(image, scene.scene_id)
-                )
+                _start_video_chain(image, scene.scene_id, session_id, story_session)
 
             # Auto-save if the first scene is already an ending
             if scene.is_ending:
-                gallery_service.save_story(story_session)
+                await gallery_service.aio.save_story(snapshot(story_session))
                 _start_cover_art(story_session)
-                _advance_relationships_for_story(story_session)
-                upload_service.cleanup_session(session_id)
+                await _advance_relationships_for_story(story_session)
+                await upload_service.aio.cleanup_session(session_id)
             else:
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+                await _save_progress(story_session)
 
             redirect = RedirectResponse(
                 url=f"{url_prefix}/story/scene/{scene.scene_id}", status_code=303
@@ -770,7 +1392,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Clean up previous session's uploads
         old_session_id = _get_session_id(request)
         if old_session_id:
-            upload_service.cleanup_session(old_session_id)
+            await upload_service.aio.cleanup_session(old_session_id)
 
         # Build content guidelines and image style
         content_guidelines = tier_config.content_guidelines
@@ -800,14 +1422,14 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Inject family context if Family Mode is enabled
         if family_mode == "on":
-            family = family_service.get_family(tier_config.name)
+            family = await family_service.aio.get_family(tier_config.name)
             if family:
-                family_ctx = family_service.build_family_context(family)
+                family_ctx = await family_service.aio.build_family_context(family)
                 if family_ctx:
                     content_guidelines = content_guidelines + "\n\n" + family_ctx
 
         # Delete any in-progress story
-        gallery_service.delete_progress(tier_config.name)
+        await gallery_service.aio.delete_progress(tier_config.name)
 
         try:
             story_length = StoryLength(length)
@@ -834,6 +1456,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 content_guidelines=content_guidelines,
                 image_style=image_style,
                 model=model,
+                hedge=True,
             )
 
             image = Image(prompt=scene_data["image_prompt"])
@@ -873,25 +1496,26 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             story_session.navigate_forward(scene)
             session_id = create_session(story_session)
 
-            ref_images = _build_reference_images(story_session)
-            asyncio.create_task(
-                _generate_and_track_reference(
-                    image, scene.scene_id, image_model,
-                    ref_images, story,
-                )
+            ref_images = await _build_reference_images(story_session)
+            _submit_scene_image(
+                session_id, story_session, scene.scene_id,
+                image_model, ref_images,
             )
 
             # Picture book mode for young ages
             protagonist_age = flavor_selections.get("protagonist_age", "")
             if is_picture_book_age(protagonist_age):
-                _setup_extra_images(scene, scene_data["image_prompt"], image_model, ref_images or [])
+                _setup_extra_images(
+                    scene, scene_data["image_prompt"], image_model, ref_images or [],
+                    session_id, story_session,
+                )
 
             if scene.is_ending:
-                gallery_service.save_story(story_session)
+                await gallery_service.aio.save_story(snapshot(story_session))
                 _start_cover_art(story_session)
-                _advance_relationships_for_story(story_session)
+                await _advance_relationships_for_story(story_session)
             else:
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+                await _save_progress(story_session)
 
             redirect = RedirectResponse(
                 url=f"{url_prefix}/story/scene/{scene.scene_id}", status_code=303
@@ -929,6 +1553,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             c.choice_id for c in scene.choices if c.next_scene_id
         }
 
+        if not scene.is_ending and scene.scene_id == story_session.story.current_scene_id:
+            _refresh_context_summary(story_session)
+        await _speculate_next_scenes(_get_session_id(request), story_session, scene)
+
         # Build tree data for tree map
         tree_data = build_tree(
             story_session.scenes,
@@ -960,10 +1588,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 "tts_current_voice": request.cookies.get(f"tts_voice_{tier_config.prefix}", tier_config.tts_default_voice),
                 "tts_autoplay": request.cookies.get(f"tts_autoplay_{tier_config.prefix}", str(tier_config.tts_autoplay_default).lower()),
                 "bedtime_mode": story_session.story.bedtime_mode,
-                "has_reference_images": bool(_build_reference_images(story_session)),
+                "has_reference_images": bool(await _build_reference_images(story_session)),
                 "has_generated_reference": bool(story_session.story.generated_reference_path),
                 "show_recap": scene.depth >= 1,
                 "recap_expanded": request.query_params.get("resumed") == "1",
+                "recap_text": story_session.recap_cache.get(scene.parent_scene_id or "", ""),
                 "recap_url": f"{url_prefix}/story/recap/{scene.scene_id}",
             }),
         )
@@ -979,26 +1608,52 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         if not scene or scene.depth < 1:
             return JSONResponse({"status": "error"})
 
-        # Build cache key from path history up to this scene
-        depth = scene.depth
-        path_slice = story_session.path_history[:depth + 1]
-        cache_key = "|".join(path_slice[:depth])  # scenes before current
-
-        # Check cache
-        if cache_key in story_session.recap_cache:
-            return JSONResponse({
-                "status": "ok",
-                "text": story_session.recap_cache[cache_key],
-            })
-
-        # Generate recap from scenes along the path before the current one
-        context_scenes = [
-            story_session.scenes[sid]
-            for sid in path_slice[:depth]
-            if sid in story_session.scenes
-        ]
-        if not context_scenes:
+        # The recap covers the path through the scene's parent
+        recap_text = await _recap_through(
+            _get_session_id(request), story_session, scene.parent_scene_id or "",
+        )
+        if not recap_text:
             return JSONResponse({"status": "error"})
+        return JSONResponse({"status": "ok", "text": recap_text})
+
+    def _start_recap(session_id: str | None, story_session, scene_id: str) -> asyncio.Task | None:
+        """Start writing the recap of the path through scene_id, unless cached or underway."""
+        if scene_id in story_session.recap_cache or scene_id not in story_session.scenes:
+            return None
+        key = (session_id, scene_id)
+        task = _recap_tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(_write_recap(session_id, story_session, scene_id))
+            _recap_tasks[key] = task
+            task.add_done_callback(lambda _: _recap_tasks.pop(key, None))
+        return task
+
+    async def _recap_through(session_id: str | None, story_session, scene_id: str) -> str:
+        """Return the recap of the path through scene_id, writing it if needed."""
+        task = _start_recap(session_id, story_session, scene_id)
+        if task is None:
+            return story_session.recap_cache.get(scene_id, "")
+        # Shielded so a reader navigating away doesn't cancel a recap others await
+        recap_text = await asyncio.shield(task)
+        if recap_text:
+            story_session.recap_cache[scene_id] = recap_text
+        return recap_text
+
+    async def _write_recap(session_id: str | None, story_session, scene_id: str) -> str:
+        """Fold the path through scene_id into the recap of its nearest recapped ancestor.
+
+        recap_cache is keyed by the last scene a recap covers, so sibling
+        branches share every common ancestor's recap. Without one, the
+        story's rolling context summary is the next best starting point.
+        The recap is saved to the session, so other workers see it too.
+        """
+        path = story_session.path_to(scene_id)
+        previous, start = context_summaries.covering(path)
+        for i in range(len(path) - 2, max(start - 1, 0) - 1, -1):
+            cached = story_session.recap_cache.get(path[i].scene_id)
+            if cached:
+                previous, start = cached, i + 1
+                break
 
         # Tier-specific recap style guidance
         recap_styles = {
@@ -1009,18 +1664,35 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         recap_style = recap_styles.get(tier_config.name, "")
 
         recap_text = await story_service.generate_recap(
-            scenes=context_scenes,
+            scenes=path,
             model=story_session.story.model,
             content_guidelines=tier_config.content_guidelines,
             recap_style=recap_style,
+            previous_recap=previous,
+            start=start,
         )
-
         if not recap_text:
-            return JSONResponse({"status": "error"})
+            return recap_text
 
-        # Cache and return
-        story_session.recap_cache[cache_key] = recap_text
-        return JSONResponse({"status": "ok", "text": recap_text})
+        def store(latest) -> None:
+            # Drop recaps keyed by the old joined-path scheme as new ones arrive
+            for key in [k for k in latest.recap_cache if "|" in k]:
+                del latest.recap_cache[key]
+            latest.recap_cache[scene_id] = recap_text
+
+        store(story_session)
+        if session_id:
+            try:
+                modify_session(session_id, store)
+            except SessionConflict:
+                logger.warning(f"Could not save recap to session {session_id}: kept conflicting")
+        return recap_text
+
+    def _prefetch_recap(session_id: str, story_session) -> None:
+        """Start the current scene's recap so it is ready when a resumed story opens."""
+        scene = story_session.current_scene
+        if scene and scene.depth >= 1 and scene.parent_scene_id:
+            _start_recap(session_id, story_session, scene.parent_scene_id)
 
     @router.post("/story/keep-going/{scene_id}")
     async def keep_going(request: Request, scene_id: str):
@@ -1029,8 +1701,13 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         session_id = _get_session_id(request)
         if not story_session or not session_id:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
-        story_session.story.target_depth += 3
-        update_session(session_id, story_session)
+        # Candidates were written for the old pacing
+        speculation_service.discard(session_id)
+
+        def extend(latest) -> None:
+            latest.story.target_depth += 3
+
+        _modify_story(session_id, story_session, extend)
         return RedirectResponse(
             url=f"{url_prefix}/story/scene/{scene_id}", status_code=303
         )
@@ -1048,8 +1725,12 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         new_target = scene.depth + 2
         if new_target <= scene.depth:
             new_target = scene.depth + 1
-        story_session.story.target_depth = new_target
-        update_session(session_id, story_session)
+        speculation_service.discard(session_id)
+
+        def shorten(latest) -> None:
+            latest.story.target_depth = new_target
+
+        _modify_story(session_id, story_session, shorten)
         return RedirectResponse(
             url=f"{url_prefix}/story/scene/{scene_id}", status_code=303
         )
@@ -1061,8 +1742,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         session_id = _get_session_id(request)
         if not story_session or not session_id:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
-        story_session.story.generated_reference_path = ""
-        update_session(session_id, story_session)
+
+        def reset(latest) -> None:
+            latest.story.generated_reference_path = ""
+
+        story_session = _modify_story(session_id, story_session, reset)
         current_scene_id = story_session.story.current_scene_id
         return RedirectResponse(
             url=f"{url_prefix}/story/scene/{current_scene_id}", status_code=303
@@ -1097,168 +1781,34 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             existing_scene = story_session.scenes.get(selected_choice.next_scene_id)
             if existing_scene:
                 # Use navigate_to to rebuild path_history correctly for the branch
-                story_session.navigate_to(existing_scene.scene_id)
-                update_session(session_id, story_session)
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+                story_session = _modify_story(
+                    session_id, story_session,
+                    lambda latest: latest.navigate_to(existing_scene.scene_id),
+                )
+                await _save_progress(story_session)
+                _prewarm_narration(request, session_id, existing_scene)
                 return RedirectResponse(
                     url=f"{url_prefix}/story/scene/{existing_scene.scene_id}",
                     status_code=303,
                 )
 
         try:
-            context_scenes = story_session.get_full_context()
-            new_depth = scene.depth + 1
-
-            # Build content guidelines and image style, re-applying profile if active
-            content_guidelines = tier_config.content_guidelines
-            image_style = tier_config.image_style
-            choice_photo_paths: list[str] = []
-
-            if story_session.story.profile_id:
-                profile = profile_service.get_profile(
-                    tier_config.name, story_session.story.profile_id
+            generation_kwargs = await _build_continuation_kwargs(story_session, scene, selected_choice.text)
+            if _wants_event_stream(request):
+                return _stream_next_scene(
+                    request, session_id, story_session, scene, selected_choice,
+                    generation_kwargs, speculated=True,
                 )
-                if profile:
-                    ctx_addition, style_addition, profile_photos = profile_service.build_profile_context(
-                        profile, tier_config.name
-                    )
-                    if ctx_addition:
-                        content_guidelines = content_guidelines + "\n\n" + ctx_addition
-                    if style_addition:
-                        image_style = (image_style + ", " + style_addition) if image_style else style_addition
-                    choice_photo_paths = profile_photos
-
-            # Apply user-selected art style (persisted on story)
-            art_style_prompt = get_art_style_prompt(story_session.story.art_style)
-            if art_style_prompt:
-                image_style = (image_style + ", " + art_style_prompt) if image_style else art_style_prompt
-
-            # Rebuild story flavor from persisted options
-            story_flavor = build_story_flavor_prompt(
-                protagonist_gender=story_session.story.protagonist_gender,
-                protagonist_age=story_session.story.protagonist_age,
-                character_type=story_session.story.character_type,
-                num_characters=story_session.story.num_characters,
-                writing_style=story_session.story.writing_style,
-                conflict_type=story_session.story.conflict_type,
-            )
-            if story_flavor:
-                content_guidelines = content_guidelines + "\n\n" + story_flavor
-
-
-            # Rebuild character prompt from persisted character fields
-            if story_session.story.character_name:
-                char_block = f"CHARACTER:\nName: {story_session.story.character_name}"
-                if story_session.story.character_description:
-                    char_block += f"\nAppearance: {story_session.story.character_description}"
-                char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
-                content_guidelines = content_guidelines + "\n\n" + char_block
-                if story_session.story.character_description:
-                    image_style = (image_style + ", " + story_session.story.character_description) if image_style else story_session.story.character_description
-
-            # Rebuild roster character context from persisted roster_character_ids
-            for rc_id in story_session.story.roster_character_ids:
-                rc = character_service.get_character(tier_config.name, rc_id)
-                if rc:
-                    char_block = f"CHARACTER:\nName: {rc.name}"
-                    if rc.description:
-                        char_block += f"\nAppearance: {rc.description}"
-                    if tier_config.name == "nsfw" and rc.relationship_stage != "strangers":
-                        from app.story_options import RELATIONSHIP_PROMPTS
-                        rel_prompt = RELATIONSHIP_PROMPTS.get(rc.relationship_stage, "")
-                        if rel_prompt:
-                            char_block += f"\nRelationship: {rel_prompt.format(name=rc.name)}"
-                    char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
-                    content_guidelines = content_guidelines + "\n\n" + char_block
-                    if rc.description:
-                        image_style = (image_style + ", " + rc.description) if image_style else rc.description
-                    if len(choice_photo_paths) < 3:
-                        rc_photos = character_service.get_absolute_photo_paths(rc)
-                        for rp in rc_photos:
-                            if len(choice_photo_paths) < 3:
-                                choice_photo_paths.append(rp)
-
-            # Apply bedtime mode guidelines if active
-            if story_session.story.bedtime_mode:
-                content_guidelines = content_guidelines + "\n\n" + BEDTIME_CONTENT_GUIDELINES
-                image_style = BEDTIME_IMAGE_STYLE
-
-            # Direct uploads take priority over profile photos (FR-008)
-            if story_session.story.reference_photo_paths:
-                choice_photo_paths = story_session.story.reference_photo_paths
 
-            # Compute chapter info for epic stories
-            is_epic = story_session.story.length == StoryLength.EPIC
-            is_chapter_start = is_epic and (new_depth % SCENES_PER_CHAPTER == 0)
-            chapter_number = ((new_depth // SCENES_PER_CHAPTER) + 1) if is_epic else None
-            total_chapters = (story_session.story.target_depth // SCENES_PER_CHAPTER) if is_epic else None
+            # Commit a speculated scene instantly if one was generated for this choice
+            scene_data = await speculation_service.take(session_id, scene_id, choice_id)
+            if scene_data is None:
+                scene_data = await story_service.generate_scene(**generation_kwargs, hedge=True)
 
-            scene_data = await story_service.generate_scene(
-                prompt=story_session.story.prompt,
-                story_length=story_session.story.length,
-                context_scenes=context_scenes,
-                current_depth=new_depth,
-                target_depth=story_session.story.target_depth,
-                choice_text=selected_choice.text,
-                content_guidelines=content_guidelines,
-                image_style=image_style,
-                model=story_session.story.model,
-                is_chapter_start=is_chapter_start,
-                chapter_number=chapter_number,
-                total_chapters=total_chapters,
+            new_scene = await _commit_next_scene(
+                request, session_id, story_session, scene, selected_choice,
+                scene_data, generation_kwargs,
             )
-
-            new_image = Image(prompt=scene_data["image_prompt"])
-            new_choices = [
-                Choice(text=c["text"]) for c in scene_data.get("choices", [])
-            ]
-            new_scene = Scene(
-                content=scene_data["content"],
-                image=new_image,
-                choices=new_choices,
-                is_ending=scene_data.get("is_ending", False),
-                depth=new_depth,
-                parent_scene_id=scene.scene_id,
-                choice_taken_id=choice_id,
-                chapter_number=chapter_number if is_chapter_start else None,
-                chapter_title=scene_data.get("chapter_title") if is_chapter_start else None,
-            )
-
-            selected_choice.next_scene_id = new_scene.scene_id
-            story_session.navigate_forward(new_scene)
-            update_session(session_id, story_session)
-
-            ref_images = _build_reference_images(story_session)
-            asyncio.create_task(
-                _generate_and_track_reference(
-                    new_image, new_scene.scene_id, story_session.story.image_model,
-                    ref_images, story_session.story,
-                )
-            )
-
-            # Picture book mode: generate extra images for young ages
-            if is_picture_book_age(story_session.story.protagonist_age):
-                _setup_extra_images(
-                    new_scene, scene_data["image_prompt"],
-                    story_session.story.image_model, ref_images or [],
-                )
-
-            if story_session.story.video_mode:
-                asyncio.create_task(
-                    _chain_video_after_image(new_image, new_scene.scene_id)
-                )
-
-            # Auto-save completed stories to gallery, or save progress
-            if new_scene.is_ending:
-                gallery_service.save_story(story_session)
-                _start_cover_art(story_session)
-                _advance_relationships_for_story(story_session)
-                gallery_service.delete_progress(tier_config.name, suffix=_progress_suffix(story_session))
-                if session_id:
-                    upload_service.cleanup_session(session_id)
-            else:
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
-
             return RedirectResponse(
                 url=f"{url_prefix}/story/scene/{new_scene.scene_id}",
                 status_code=303,
@@ -1295,162 +1845,22 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             )
 
         try:
-            context_scenes = story_session.get_full_context()
-            new_depth = scene.depth + 1
-
-            # Build content guidelines and image style
-            content_guidelines = tier_config.content_guidelines
-            image_style = tier_config.image_style
-            choice_photo_paths: list[str] = []
-
-            if story_session.story.profile_id:
-                profile = profile_service.get_profile(
-                    tier_config.name, story_session.story.profile_id
-                )
-                if profile:
-                    ctx_addition, style_addition, profile_photos = profile_service.build_profile_context(
-                        profile, tier_config.name
-                    )
-                    if ctx_addition:
-                        content_guidelines = content_guidelines + "\n\n" + ctx_addition
-                    if style_addition:
-                        image_style = (image_style + ", " + style_addition) if image_style else style_addition
-                    choice_photo_paths = profile_photos
-
-            # Apply user-selected art style
-            art_style_prompt = get_art_style_prompt(story_session.story.art_style)
-            if art_style_prompt:
-                image_style = (image_style + ", " + art_style_prompt) if image_style else art_style_prompt
-
-            # Rebuild story flavor from persisted options
-            story_flavor = build_story_flavor_prompt(
-                protagonist_gender=story_session.story.protagonist_gender,
-                protagonist_age=story_session.story.protagonist_age,
-                character_type=story_session.story.character_type,
-                num_characters=story_session.story.num_characters,
-                writing_style=story_session.story.writing_style,
-                conflict_type=story_session.story.conflict_type,
-            )
-            if story_flavor:
-                content_guidelines = content_guidelines + "\n\n" + story_flavor
-
-
-            # Rebuild character prompt from persisted character fields
-            if story_session.story.character_name:
-                char_block = f"CHARACTER:\nName: {story_session.story.character_name}"
-                if story_session.story.character_description:
-                    char_block += f"\nAppearance: {story_session.story.character_description}"
-                char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
-                content_guidelines = content_guidelines + "\n\n" + char_block
-                if story_session.story.character_description:
-                    image_style = (image_style + ", " + story_session.story.character_description) if image_style else story_session.story.character_description
-
-            # Rebuild roster character context from persisted roster_character_ids
-            for rc_id in story_session.story.roster_character_ids:
-                rc = character_service.get_character(tier_config.name, rc_id)
-                if rc:
-                    char_block = f"CHARACTER:\nName: {rc.name}"
-                    if rc.description:
-                        char_block += f"\nAppearance: {rc.description}"
-                    if tier_config.name == "nsfw" and rc.relationship_stage != "strangers":
-                        from app.story_options import RELATIONSHIP_PROMPTS
-                        rel_prompt = RELATIONSHIP_PROMPTS.get(rc.relationship_stage, "")
-                        if rel_prompt:
-                            char_block += f"\nRelationship: {rel_prompt.format(name=rc.name)}"
-                    char_block += "\nThis character MUST appear in every scene. Use their name consistently. Maintain their physical description across all scenes."
-                    content_guidelines = content_guidelines + "\n\n" + char_block
-                    if rc.description:
-                        image_style = (image_style + ", " + rc.description) if image_style else rc.description
-                    if len(choice_photo_paths) < 3:
-                        rc_photos = character_service.get_absolute_photo_paths(rc)
-                        for rp in rc_photos:
-                            if len(choice_photo_paths) < 3:
-                                choice_photo_paths.append(rp)
-
-            # Apply bedtime mode guidelines if active
-            if story_session.story.bedtime_mode:
-                content_guidelines = content_guidelines + "\n\n" + BEDTIME_CONTENT_GUIDELINES
-                image_style = BEDTIME_IMAGE_STYLE
-
-            # Direct uploads take priority
-            if story_session.story.reference_photo_paths:
-                choice_photo_paths = story_session.story.reference_photo_paths
-
-            # Compute chapter info for epic stories
-            is_epic = story_session.story.length == StoryLength.EPIC
-            is_chapter_start = is_epic and (new_depth % SCENES_PER_CHAPTER == 0)
-            chapter_number = ((new_depth // SCENES_PER_CHAPTER) + 1) if is_epic else None
-            total_chapters = (story_session.story.target_depth // SCENES_PER_CHAPTER) if is_epic else None
-
-            scene_data = await story_service.generate_scene(
-                prompt=story_session.story.prompt,
-                story_length=story_session.story.length,
-                context_scenes=context_scenes,
-                current_depth=new_depth,
-                target_depth=story_session.story.target_depth,
-                choice_text=custom_text,
-                content_guidelines=content_guidelines,
-                image_style=image_style,
-                model=story_session.story.model,
-                is_chapter_start=is_chapter_start,
-                chapter_number=chapter_number,
-                total_chapters=total_chapters,
-            )
-
-            new_image = Image(prompt=scene_data["image_prompt"])
-            new_choices = [
-                Choice(text=c["text"]) for c in scene_data.get("choices", [])
-            ]
-
+            speculation_service.discard(session_id)
+            generation_kwargs = await _build_continuation_kwargs(story_session, scene, custom_text)
             # Create a Choice on the current scene for the custom text
             custom_choice_obj = Choice(text=custom_text)
-            new_scene = Scene(
-                content=scene_data["content"],
-                image=new_image,
-                choices=new_choices,
-                is_ending=scene_data.get("is_ending", False),
-                depth=new_depth,
-                parent_scene_id=scene.scene_id,
-                choice_taken_id=custom_choice_obj.choice_id,
-                chapter_number=chapter_number if is_chapter_start else None,
-                chapter_title=scene_data.get("chapter_title") if is_chapter_start else None,
-            )
-            custom_choice_obj.next_scene_id = new_scene.scene_id
-            scene.choices.append(custom_choice_obj)
-
-            story_session.navigate_forward(new_scene)
-            update_session(session_id, story_session)
-
-            ref_images = _build_reference_images(story_session)
-            asyncio.create_task(
-                _generate_and_track_reference(
-                    new_image, new_scene.scene_id, story_session.story.image_model,
-                    ref_images, story_session.story,
+            if _wants_event_stream(request):
+                return _stream_next_scene(
+                    request, session_id, story_session, scene, custom_choice_obj,
+                    generation_kwargs,
                 )
-            )
 
-            # Picture book mode: generate extra images for young ages
-            if is_picture_book_age(story_session.story.protagonist_age):
-                _setup_extra_images(
-                    new_scene, scene_data["image_prompt"],
-                    story_session.story.image_model, ref_images or [],
-                )
-
-            if story_session.story.video_mode:
-                asyncio.create_task(
-                    _chain_video_after_image(new_image, new_scene.scene_id)
-                )
-
-            if new_scene.is_ending:
-                gallery_service.save_story(story_session)
-                _start_cover_art(story_session)
-                _advance_relationships_for_story(story_session)
-                gallery_service.delete_progress(tier_config.name, suffix=_progress_suffix(story_session))
-                if session_id:
-                    upload_service.cleanup_session(session_id)
-            else:
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+            scene_data = await story_service.generate_scene(**generation_kwargs, hedge=True)
 
+            new_scene = await _commit_next_scene(
+                request, session_id, story_session, scene, custom_choice_obj,
+                scene_data, generation_kwargs,
+            )
             return RedirectResponse(
                 url=f"{url_prefix}/story/scene/{new_scene.scene_id}",
                 status_code=303,
@@ -1476,10 +1886,16 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         if not story_session or not session_id:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
 
-        previous = story_session.navigate_backward()
-        if previous:
-            update_session(session_id, story_session)
-            gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        _cancel_narration_prewarm(session_id)
+        speculation_service.discard(session_id)
+        if len(story_session.path_history) > 1:
+            moved: list[Scene | None] = []
+            story_session = _modify_story(
+                session_id, story_session,
+                lambda latest: moved.append(latest.navigate_backward()),
+            )
+            previous = moved[-1] or story_session.current_scene
+            await _save_progress(story_session)
             return RedirectResponse(
                 url=f"{url_prefix}/story/scene/{previous.scene_id}",
                 status_code=303,
@@ -1512,16 +1928,19 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         if not story_session or not session_id:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
 
-        result = story_session.navigate_to(scene_id)
-        if not result:
+        _cancel_narration_prewarm(session_id)
+        speculation_service.discard(session_id)
+        if scene_id not in story_session.scenes:
             # Scene not found, redirect to current scene
             return RedirectResponse(
                 url=f"{url_prefix}/story/scene/{story_session.story.current_scene_id}",
                 status_code=303,
             )
 
-        update_session(session_id, story_session)
-        gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        story_session = _modify_story(
+            session_id, story_session, lambda latest: latest.navigate_to(scene_id),
+        )
+        await _save_progress(story_session)
         return RedirectResponse(
             url=f"{url_prefix}/story/scene/{scene_id}",
             status_code=303,
@@ -1530,11 +1949,12 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.get("/story/resume")
     async def resume_story(request: Request):
         """Restore an in-progress story from disk and redirect to current scene."""
-        progress = gallery_service.load_progress(tier_config.name)
+        progress = await gallery_service.aio.load_progress(tier_config.name)
         if not progress:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
 
         session_id = create_session(progress)
+        _prefetch_recap(session_id, progress)
         redirect = RedirectResponse(
             url=f"{url_prefix}/story/scene/{progress.story.current_scene_id}?resumed=1",
             status_code=303,
@@ -1548,12 +1968,14 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/story/abandon")
     async def abandon_story(request: Request):
         """Explicitly abandon the current in-progress story."""
-        gallery_service.delete_progress(tier_config.name)
+        await gallery_service.aio.delete_progress(tier_config.name)
 
         # Clear in-memory session and uploads if one exists
         session_id = _get_session_id(request)
         if session_id:
-            upload_service.cleanup_session(session_id)
+            _cancel_narration_prewarm(session_id)
+            speculation_service.discard(session_id)
+            await upload_service.aio.cleanup_session(session_id)
             delete_session(session_id)
 
         redirect = RedirectResponse(url=f"{url_prefix}/", status_code=303)
@@ -1563,11 +1985,12 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.get("/story/resume-chapter")
     async def resume_chapter_story(request: Request):
         """Restore an in-progress chapter (epic) story from disk."""
-        progress = gallery_service.load_progress(tier_config.name, suffix="_chapter")
+        progress = await gallery_service.aio.load_progress(tier_config.name, suffix="_chapter")
         if not progress:
             return RedirectResponse(url=f"{url_prefix}/", status_code=303)
 
         session_id = create_session(progress)
+        _prefetch_recap(session_id, progress)
         redirect = RedirectResponse(
             url=f"{url_prefix}/story/scene/{progress.story.current_scene_id}?resumed=1",
             status_code=303,
@@ -1581,7 +2004,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/story/abandon-chapter")
     async def abandon_chapter_story(request: Request):
         """Abandon the in-progress chapter (epic) story."""
-        gallery_service.delete_progress(tier_config.name, suffix="_chapter")
+        await gallery_service.aio.delete_progress(tier_config.name, suffix="_chapter")
         return RedirectResponse(url=f"{url_prefix}/", status_code=303)
 
     @router.post("/story/image/{scene_id}/retry")
@@ -1623,16 +2046,14 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         image.error = None
 
         # Start new background generation with reference images
-        ref_images = _build_reference_images(story_session)
-        asyncio.create_task(
-            _generate_and_track_reference(
-                image, scene_id, story_session.story.image_model,
-                ref_images, story_session.story,
-            )
+        ref_images = await _build_reference_images(story_session)
+        _submit_scene_image(
+            _get_session_id(request), story_session, scene_id,
+            story_session.story.image_model, ref_images,
         )
 
         # Persist progress
-        gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        await _save_progress(story_session)
 
         return JSONResponse({"status": "generating"})
 
@@ -1669,16 +2090,14 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         image.error = None
 
         # Start new background generation with reference images
-        ref_images = _build_reference_images(story_session)
-        asyncio.create_task(
-            _generate_and_track_reference(
-                image, scene_id, story_session.story.image_model,
-                ref_images, story_session.story,
-            )
+        ref_images = await _build_reference_images(story_session)
+        _submit_scene_image(
+            _get_session_id(request), story_session, scene_id,
+            story_session.story.image_model, ref_images,
         )
 
         # Persist progress
-        gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        await _save_progress(story_session)
 
         return JSONResponse({"status": "generating"})
 
@@ -1708,19 +2127,95 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         available_image_keys = [m.key for m in get_available_image_models()]
         fast_model = FAST_IMAGE_MODEL if FAST_IMAGE_MODEL in available_image_keys else story_session.story.image_model
 
-        # Generate directly using the image service
-        asyncio.create_task(
-            image_service.generate_image(
-                extra_img, f"{scene_id}_extra_{index}", fast_model,
-            )
+        job_queue.submit(
+            "extra_images",
+            _media_job_payload(
+                _get_session_id(request), story_session, scene_id,
+                index=index, image_model=fast_model,
+            ),
+            PRIORITY_EXTRA_IMAGE, image_provider(fast_model),
         )
         # Restore the prompt (generate_image doesn't change it but be safe)
         extra_img.prompt = original_prompt
 
-        gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        await _save_progress(story_session)
 
         return JSONResponse({"status": "generating"})
 
+    @router.get("/story/events")
+    async def media_event_stream(request: Request, scene_id: str | None = None):
+        """Push image, extra image, video and cover art status changes as SSE.
+
+        Starts with the current state of scene_id's media, then forwards
+        transitions for any scene in the session as they are published.
+        The JSON status endpoints below remain as the polling fallback.
+        """
+        session_id = _get_session_id(request)
+        story_session = _get_story_session(request)
+        if not story_session:
+            # EventSource gives up on a 204, and the page falls back to polling
+            return Response(status_code=204)
+
+        state = {"session": story_session}
+
+        def match(event: str, data: dict) -> bool:
+            current = state["session"]
+            if event == "cover_art":
+                return data["story_id"] == current.story.story_id
+            return data["scene_id"] in current.scenes
+
+        def snapshot() -> list[tuple[str, dict]]:
+            scene = state["session"].scenes.get(scene_id) if scene_id else None
+            if not scene:
+                return []
+            events = [("image", image_event(scene.scene_id, scene.image))]
+            events.extend(
+                ("extra_image", extra_image_event(scene.scene_id, i, ei))
+                for i, ei in enumerate(scene.extra_images)
+            )
+            if scene.image.video_status != "none":
+                events.append(("video", video_event(scene.scene_id, scene.image)))
+            return events
+
+        queue = media_events.subscribe(match)
+        # Last payload sent per media item, so resyncs only send changes
+        sent: dict[tuple, dict] = {}
+
+        def encode(events: list[tuple[str, dict]]) -> str:
+            out = []
+            for event, data in events:
+                key = (event, data.get("scene_id") or data.get("story_id"), data.get("index"))
+                if sent.get(key) == data:
+                    continue
+                sent[key] = data
+                out.append(f"event: {event}\ndata: {json.dumps(data)}\n\n")
+            return "".join(out)
+
+        async def body():
+            try:
+                yield "retry: 3000\n\n" + encode(snapshot())
+                deadline = time.monotonic() + MEDIA_EVENTS_MAX_SECONDS
+                while time.monotonic() < deadline:
+                    try:
+                        event = await asyncio.wait_for(queue.get(), MEDIA_EVENTS_RESYNC_SECONDS)
+                        chunk = encode([event])
+                        if chunk:
+                            yield chunk
+                    except asyncio.TimeoutError:
+                        current = get_session(session_id)
+                        if current is None:
+                            return
+                        state["session"] = current
+                        yield ": keepalive\n\n" + encode(snapshot())
+            finally:
+                media_events.unsubscribe(queue)
+
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     @router.get("/story/image/{scene_id}")
     async def image_status(request: Request, scene_id: str):
         """Check image generation status for a scene."""
@@ -1789,11 +2284,12 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         image.video_url = None
         image.video_error = None
 
-        asyncio.create_task(
-            image_service.generate_video(image, scene_id)
+        job_queue.submit(
+            "video", _media_job_payload(_get_session_id(request), story_session, scene_id),
+            PRIORITY_VIDEO, "xai",
         )
 
-        gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+        await _save_progress(story_session)
 
         return JSONResponse({"status": "generating"})
 
@@ -1846,7 +2342,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     async def profiles_page(request: Request):
         """Display profile management page for this tier."""
         error = request.query_params.get("error")
-        profiles = profile_service.list_profiles(tier_config.name)
+        profiles = await profile_service.aio.list_profiles(tier_config.name)
         return templates.TemplateResponse(
             request, "profiles.html", _ctx({
                 "profiles": profiles,
@@ -1871,7 +2367,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             )
         themes_list = [t.strip() for t in themes.split(",") if t.strip()] if themes else []
         elements_list = [e.strip() for e in story_elements.split(",") if e.strip()] if story_elements else []
-        profile_service.create_profile(
+        await profile_service.aio.create_profile(
             tier=tier_config.name,
             name=name,
             themes=themes_list,
@@ -1886,11 +2382,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         """Display edit form for a profile."""
         error = request.query_params.get("error")
         warning = request.query_params.get("warning")
-        profile = profile_service.get_profile(tier_config.name, profile_id)
+        profile = await profile_service.aio.get_profile(tier_config.name, profile_id)
         if not profile:
             return RedirectResponse(url=f"{url_prefix}/profiles", status_code=303)
         other_profiles = [
-            p for p in profile_service.list_profiles(tier_config.name)
+            p for p in await profile_service.aio.list_profiles(tier_config.name)
             if p.profile_id != profile_id
         ]
         roster_characters = []
@@ -1919,7 +2415,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         """Update a profile's preferences."""
         themes_list = [t.strip() for t in themes.split(",") if t.strip()] if themes else []
         elements_list = [e.strip() for e in story_elements.split(",") if e.strip()] if story_elements else []
-        profile_service.update_profile(
+        await profile_service.aio.update_profile(
             tier=tier_config.name,
             profile_id=profile_id,
             name=name,
@@ -1939,18 +2435,18 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         character_ids: list[str] = Form(default=[]),
     ):
         """Update which roster characters are associated with a profile."""
-        profile = profile_service.get_profile(tier_config.name, profile_id)
+        profile = await profile_service.aio.get_profile(tier_config.name, profile_id)
         if not profile:
             return RedirectResponse(url=f"{url_prefix}/profiles", status_code=303)
         # Validate that all character_ids actually exist
         valid_ids = []
         for cid in character_ids:
-            if character_service.get_character(tier_config.name, cid):
+            if await character_service.aio.get_character(tier_config.name, cid):
                 valid_ids.append(cid)
         profile.character_ids = valid_ids
         from datetime import datetime
         profile.updated_at = datetime.now()
-        profile_service._save_profile(profile)
+        await profile_service.aio._save_profile(profile)
         return RedirectResponse(
             url=f"{url_prefix}/profiles/{profile_id}", status_code=303
         )
@@ -1958,7 +2454,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/profiles/{profile_id}/delete")
     async def delete_profile(request: Request, profile_id: str):
         """Delete a profile and clean up references."""
-        profile_service.delete_profile(tier_config.name, profile_id)
+        await profile_service.aio.delete_profile(tier_config.name, profile_id)
         return RedirectResponse(url=f"{url_prefix}/profiles", status_code=303)
 
     @router.post("/profiles/{profile_id}/characters/add")
@@ -1971,7 +2467,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     ):
         """Add a character to a profile."""
         link_id = linked_profile_id if linked_profile_id else None
-        result = profile_service.add_character(
+        result = await profile_service.aio.add_character(
             tier=tier_config.name,
             profile_id=profile_id,
             name=name,
@@ -1998,7 +2494,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     ):
         """Update a character's details."""
         link_id = linked_profile_id if linked_profile_id else None
-        profile_service.update_character(
+        await profile_service.aio.update_character(
             tier=tier_config.name,
             profile_id=profile_id,
             character_id=character_id,
@@ -2015,7 +2511,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, profile_id: str, character_id: str
     ):
         """Remove a character from a profile."""
-        profile_service.delete_character(
+        await profile_service.aio.delete_character(
             tier_config.name, profile_id, character_id
         )
         return RedirectResponse(
@@ -2039,7 +2535,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         photo_bytes = await photo.read()
         content_type = photo.content_type or ""
 
-        ok, message = profile_service.save_character_photo(
+        ok, message = await profile_service.aio.save_character_photo(
             tier_config.name, profile_id, character_id,
             photo_bytes, content_type,
         )
@@ -2067,7 +2563,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, profile_id: str, character_id: str,
     ):
         """Remove a character's reference photo."""
-        profile_service.delete_character_photo(
+        await profile_service.aio.delete_character_photo(
             tier_config.name, profile_id, character_id
         )
         return RedirectResponse(
@@ -2079,17 +2575,14 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, profile_id: str, character_id: str,
     ):
         """Serve a character's reference photo (tier-isolated)."""
-        photo_path = profile_service.get_character_photo_path(
+        photo_path = await profile_service.aio.get_character_photo_path(
             tier_config.name, profile_id, character_id
         )
-        if not photo_path or not photo_path.exists():
+        if not photo_path or not await run_io(photo_path.exists):
             return Response(status_code=404)
 
         content_type = "image/jpeg" if photo_path.suffix == ".jpg" else "image/png"
-        return Response(
-            content=photo_path.read_bytes(),
-            media_type=content_type,
-        )
+        return FileResponse(photo_path, media_type=content_type)
 
     # --- Character Roster Routes ---
 
@@ -2102,11 +2595,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         success = request.query_params.get("success")
         edit_id = request.query_params.get("edit")
         edit_outfit_id = request.query_params.get("edit_outfit")
-        characters = character_service.list_characters(tier_config.name)
+        characters = await character_service.aio.list_characters(tier_config.name)
         edit_character = None
         editing_outfit = None
         if edit_id:
-            edit_character = character_service.get_character(tier_config.name, edit_id)
+            edit_character = await character_service.aio.get_character(tier_config.name, edit_id)
             if edit_character and edit_outfit_id:
                 for o in edit_character.outfits:
                     if o.outfit_id == edit_outfit_id:
@@ -2161,11 +2654,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             if val and isinstance(val, str) and val.strip():
                 attributes[attr_key] = val.strip()
 
-        character = character_service.create_character(
+        character = await character_service.aio.create_character(
             tier_config.name, name, description, attributes=attributes
         )
         if not character:
-            if character_service.name_exists(tier_config.name, name):
+            if await character_service.aio.name_exists(tier_config.name, name):
                 return RedirectResponse(
                     url=f"{url_prefix}/characters?error=A+character+with+that+name+already+exists",
                     status_code=303,
@@ -2177,7 +2670,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Save photos if provided
         photo_files = [f for f in reference_photos if f.filename]
         if photo_files:
-            character_service.save_character_photos(
+            await character_service.aio.save_character_photos(
                 tier_config.name, character.character_id, photo_files
             )
         return RedirectResponse(
@@ -2197,7 +2690,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         """Update a roster character."""
         # Remove photos first
         for filename in remove_photos:
-            character_service.remove_character_photo(
+            await character_service.aio.remove_character_photo(
                 tier_config.name, character_id, filename
             )
         # Collect structured attributes from attr_* form fields
@@ -2211,11 +2704,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 attributes[attr_key] = val.strip()
 
         # Update name/description/attributes
-        updated = character_service.update_character(
+        updated = await character_service.aio.update_character(
             tier_config.name, character_id, name, description, attributes=attributes
         )
         if not updated:
-            if character_service.name_exists(tier_config.name, name, exclude_id=character_id):
+            if await character_service.aio.name_exists(tier_config.name, name, exclude_id=character_id):
                 return RedirectResponse(
                     url=f"{url_prefix}/characters?error=A+character+with+that+name+already+exists",
                     status_code=303,
@@ -2227,7 +2720,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Save new photos if provided
         photo_files = [f for f in reference_photos if f.filename]
         if photo_files:
-            character_service.save_character_photos(
+            await character_service.aio.save_character_photos(
                 tier_config.name, character_id, photo_files
             )
         return RedirectResponse(
@@ -2238,7 +2731,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/characters/{character_id}/delete")
     async def delete_character_route(request: Request, character_id: str):
         """Delete a roster character."""
-        character_service.delete_character(tier_config.name, character_id)
+        await character_service.aio.delete_character(tier_config.name, character_id)
         return RedirectResponse(
             url=f"{url_prefix}/characters?success=Character+deleted",
             status_code=303,
@@ -2257,7 +2750,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 url=f"{url_prefix}/characters?edit={character_id}&error=Invalid+relationship+stage",
                 status_code=303,
             )
-        character = character_service.get_character(tier_config.name, character_id)
+        character = await character_service.aio.get_character(tier_config.name, character_id)
         if not character:
             return RedirectResponse(
                 url=f"{url_prefix}/characters?error=Character+not+found",
@@ -2265,7 +2758,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             )
         character.relationship_stage = relationship_stage
         character.updated_at = datetime.now()
-        character_service._save_character(character)
+        await character_service.aio._save_character(character)
         return RedirectResponse(
             url=f"{url_prefix}/characters?edit={character_id}&success=Relationship+updated",
             status_code=303,
@@ -2276,16 +2769,13 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, character_id: str, filename: str,
     ):
         """Serve a roster character's reference photo."""
-        photo_path = character_service.get_character_photo_path(
+        photo_path = await character_service.aio.get_character_photo_path(
             tier_config.name, character_id, filename
         )
         if not photo_path:
             return Response(status_code=404)
         content_type = "image/jpeg" if photo_path.suffix == ".jpg" else "image/png"
-        return Response(
-            content=photo_path.read_bytes(),
-            media_type=content_type,
-        )
+        return FileResponse(photo_path, media_type=content_type)
 
     # --- Outfit CRUD routes ---
 
@@ -2303,11 +2793,11 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             return RedirectResponse(url=f"{redir}&error=Outfit+name+is+required", status_code=303)
         if not outfit_description or not outfit_description.strip():
             return RedirectResponse(url=f"{redir}&error=Outfit+description+is+required", status_code=303)
-        outfit = character_service.add_outfit(tier_config.name, character_id, outfit_name, outfit_description)
+        outfit = await character_service.aio.add_outfit(tier_config.name, character_id, outfit_name, outfit_description)
         if not outfit:
             return RedirectResponse(url=f"{redir}&error=An+outfit+with+that+name+already+exists", status_code=303)
         if outfit_photo and outfit_photo.filename:
-            character_service.save_outfit_photo(tier_config.name, character_id, outfit.outfit_id, outfit_photo)
+            await character_service.aio.save_outfit_photo(tier_config.name, character_id, outfit.outfit_id, outfit_photo)
         return RedirectResponse(url=f"{redir}&success=Outfit+created", status_code=303)
 
     @router.post("/characters/{character_id}/outfits/{outfit_id}/update")
@@ -2323,34 +2813,34 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         """Update an existing outfit."""
         redir = f"{url_prefix}/characters?edit={character_id}"
         if remove_outfit_photo:
-            character_service.remove_outfit_photo(tier_config.name, character_id, outfit_id)
-        updated = character_service.update_outfit(tier_config.name, character_id, outfit_id, outfit_name, outfit_description)
+            await character_service.aio.remove_outfit_photo(tier_config.name, character_id, outfit_id)
+        updated = await character_service.aio.update_outfit(tier_config.name, character_id, outfit_id, outfit_name, outfit_description)
         if not updated:
             return RedirectResponse(url=f"{redir}&error=Outfit+not+found+or+duplicate+name", status_code=303)
         if outfit_photo and outfit_photo.filename:
-            character_service.save_outfit_photo(tier_config.name, character_id, outfit_id, outfit_photo)
+            await character_service.aio.save_outfit_photo(tier_config.name, character_id, outfit_id, outfit_photo)
         return RedirectResponse(url=f"{redir}&success=Outfit+updated", status_code=303)
 
     @router.post("/characters/{character_id}/outfits/{outfit_id}/delete")
     async def delete_outfit_route(request: Request, character_id: str, outfit_id: str):
         """Delete an outfit."""
-        character_service.delete_outfit(tier_config.name, character_id, outfit_id)
+        await character_service.aio.delete_outfit(tier_config.name, character_id, outfit_id)
         redir = f"{url_prefix}/characters?edit={character_id}"
         return RedirectResponse(url=f"{redir}&success=Outfit+deleted", status_code=303)
 
     @router.get("/characters/{character_id}/outfits/{outfit_id}/photo/{filename}")
     async def serve_outfit_photo(request: Request, character_id: str, outfit_id: str, filename: str):
         """Serve an outfit reference photo."""
-        photo_path = character_service.get_outfit_photo_path(tier_config.name, character_id, outfit_id, filename)
+        photo_path = await character_service.aio.get_outfit_photo_path(tier_config.name, character_id, outfit_id, filename)
         if not photo_path:
             return Response(status_code=404)
         content_type = "image/jpeg" if photo_path.suffix == ".jpg" else "image/png"
-        return Response(content=photo_path.read_bytes(), media_type=content_type)
+        return FileResponse(photo_path, media_type=content_type)
 
     @router.get("/characters/api/list")
     async def list_characters_api(request: Request):
         """Return all roster characters as JSON."""
-        characters = character_service.list_characters(tier_config.name)
+        characters = await character_service.aio.list_characters(tier_config.name)
         result = []
         for char in characters:
             photo_urls = []
@@ -2392,19 +2882,32 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.get("/gallery")
     async def gallery(request: Request):
         """Display gallery of completed stories and agent mode chats."""
-        stories = gallery_service.list_stories(tier_config.name)
+        try:
+            page = max(1, int(request.query_params.get("page", "1")))
+        except ValueError:
+            page = 1
+        total = await gallery_service.aio.count_stories(tier_config.name)
+        total_pages = max(1, -(-total // GALLERY_PAGE_SIZE))
+        page = min(page, total_pages)
+        stories = await gallery_service.aio.list_stories(
+            tier_config.name,
+            limit=GALLERY_PAGE_SIZE,
+            offset=(page - 1) * GALLERY_PAGE_SIZE,
+        )
         saved_chats = []
         return templates.TemplateResponse(
             request, "gallery.html", _ctx({
                 "stories": stories,
                 "saved_chats": saved_chats,
+                "page": page,
+                "total_pages": total_pages,
             })
         )
 
     @router.get("/gallery/{story_id}")
     async def gallery_story(request: Request, story_id: str):
         """Redirect to root scene of a saved story."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
@@ -2428,58 +2931,64 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         )
 
     @router.get("/gallery/{story_id}/export/html")
-    async def export_story_html(request: Request, story_id: str):
-        """Download a completed story as a self-contained HTML file."""
-        saved = gallery_service.get_story(story_id)
+    async def export_story_html(request: Request, story_id: str, quality: int | None = None):
+        """Download a completed story as a self-contained HTML file.
+
+        Served from the per-revision export cache; optional ?quality=
+        (20-95) sets the embedded image quality.
+        """
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
             )
-        html_content = export_html(saved)
-        filename = f"{saved.title}.html"
-        return Response(
-            content=html_content,
+        export_path = await prepare_export(saved, "html", quality=quality)
+        return FileResponse(
+            export_path,
             media_type="text/html",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            filename=f"{saved.title}.html",
         )
 
     @router.get("/gallery/{story_id}/export/pdf")
     async def export_story_pdf(request: Request, story_id: str):
         """Download a completed story as a PDF document."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
             )
-        pdf_bytes = export_pdf(saved)
-        filename = f"{saved.title}.pdf"
-        return Response(
-            content=pdf_bytes,
+        export_path = await prepare_export(saved, "pdf")
+        return FileResponse(
+            export_path,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            filename=f"{saved.title}.pdf",
+        )
+
+    @router.post("/gallery/{story_id}/export/{kind}/prepare")
+    async def prepare_story_export(request: Request, story_id: str, kind: str, quality: int | None = None):
+        """Start building an HTML or PDF export so the later download is instant."""
+        saved = await gallery_service.aio.get_story(story_id)
+        if not saved or saved.tier != tier_config.name:
+            return JSONResponse({"error": "Story not found"}, status_code=404)
+        if kind not in ("html", "pdf"):
+            return JSONResponse({"error": "Unknown export format"}, status_code=404)
+        ready = await start_export(saved, kind, quality=quality)
+        return JSONResponse(
+            {"status": "ready" if ready else "preparing"},
+            status_code=200 if ready else 202,
         )
 
     @router.post("/gallery/{story_id}/regenerate-cover")
     async def regenerate_cover(request: Request, story_id: str):
         """Regenerate cover art for a saved story."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
             )
         saved.cover_art_status = "generating"
-        gallery_service.update_story(saved)
-        asyncio.create_task(
-            gallery_service.generate_cover_art(
-                image_service=image_service,
-                story_id=saved.story_id,
-                title=saved.title,
-                prompt=saved.prompt,
-                image_model=saved.image_model,
-                tier=tier_config.name,
-                art_style=saved.art_style,
-            )
-        )
+        await gallery_service.aio.update_story(saved)
+        _submit_cover_art(saved)
         # Find root scene to redirect to reader
         root_scene_id = None
         for sid, scene in saved.scenes.items():
@@ -2502,7 +3011,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.get("/family")
     async def family_page(request: Request):
         """Family settings page."""
-        family = family_service.get_family(tier_config.name)
+        family = await family_service.aio.get_family(tier_config.name)
         error = request.query_params.get("error")
         success = request.query_params.get("success")
         return templates.TemplateResponse(
@@ -2524,7 +3033,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         """Save a new child or parent to the family."""
         from app.models import Family, FamilyChild, FamilyParent
 
-        family = family_service.get_family(tier_config.name)
+        family = await family_service.aio.get_family(tier_config.name)
         if not family:
             family = Family(tier=tier_config.name)
 
@@ -2547,7 +3056,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 added = True
 
         if added:
-            family_service.save_family(family)
+            await family_service.aio.save_family(family)
             return RedirectResponse(
                 url=f"{url_prefix}/family?success=Family+updated!", status_code=303
             )
@@ -2559,10 +3068,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/family/remove-child/{index}")
     async def remove_child(request: Request, index: int):
         """Remove a child by index."""
-        family = family_service.get_family(tier_config.name)
+        family = await family_service.aio.get_family(tier_config.name)
         if family and 0 <= index < len(family.children):
             family.children.pop(index)
-            family_service.save_family(family)
+            await family_service.aio.save_family(family)
         return RedirectResponse(
             url=f"{url_prefix}/family?success=Child+removed", status_code=303
         )
@@ -2570,10 +3079,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/family/remove-parent/{index}")
     async def remove_parent(request: Request, index: int):
         """Remove a parent by index."""
-        family = family_service.get_family(tier_config.name)
+        family = await family_service.aio.get_family(tier_config.name)
         if family and 0 <= index < len(family.parents):
             family.parents.pop(index)
-            family_service.save_family(family)
+            await family_service.aio.save_family(family)
         return RedirectResponse(
             url=f"{url_prefix}/family?success=Parent+removed", status_code=303
         )
@@ -2581,7 +3090,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.post("/family/delete")
     async def delete_family(request: Request):
         """Delete the entire family."""
-        family_service.delete_family(tier_config.name)
+        await family_service.aio.delete_family(tier_config.name)
         return RedirectResponse(
             url=f"{url_prefix}/family?success=Family+deleted", status_code=303
         )
@@ -2593,7 +3102,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
     @router.get("/gallery/{story_id}/continue")
     async def continue_story_form(request: Request, story_id: str):
         """Show sequel customization form pre-filled with original story settings."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
@@ -2636,7 +3145,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         intensity: str = Form(""),
     ):
         """Start a sequel from a completed gallery story."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
@@ -2700,7 +3209,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         choice_photo_paths: list[str] = []
         valid_roster_ids: list[str] = []
         for rc_id in saved.roster_character_ids:
-            rc = character_service.get_character(tier_config.name, rc_id)
+            rc = await character_service.aio.get_character(tier_config.name, rc_id)
             if rc:
                 valid_roster_ids.append(rc_id)
                 char_block = f"CHARACTER:\nName: {rc.name}"
@@ -2711,7 +3220,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 if rc.description:
                     image_style = (image_style + ", " + rc.description) if image_style else rc.description
                 if len(choice_photo_paths) < 3:
-                    rc_photos = character_service.get_absolute_photo_paths(rc)
+                    rc_photos = await character_service.aio.get_absolute_photo_paths(rc)
                     for rp in rc_photos:
                         if len(choice_photo_paths) < 3:
                             choice_photo_paths.append(rp)
@@ -2728,8 +3237,8 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Clean up previous session
         old_session_id = _get_session_id(request)
         if old_session_id:
-            upload_service.cleanup_session(old_session_id)
-        gallery_service.delete_progress(tier_config.name)
+            await upload_service.aio.cleanup_session(old_session_id)
+        await gallery_service.aio.delete_progress(tier_config.name)
 
         try:
             story_length = StoryLength(effective_length)
@@ -2757,6 +3266,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
                 is_chapter_start=is_chapter_start,
                 chapter_number=chapter_number,
                 total_chapters=total_chapters,
+                hedge=True,
             )
 
             image = Image(prompt=scene_data["image_prompt"])
@@ -2800,20 +3310,18 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             story_session.navigate_forward(scene)
             session_id = create_session(story_session)
 
-            ref_images = _build_reference_images(story_session)
-            asyncio.create_task(
-                _generate_and_track_reference(
-                    image, scene.scene_id, effective_image_model,
-                    ref_images, story,
-                )
+            ref_images = await _build_reference_images(story_session)
+            _submit_scene_image(
+                session_id, story_session, scene.scene_id,
+                effective_image_model, ref_images,
             )
 
             if scene.is_ending:
-                gallery_service.save_story(story_session)
+                await gallery_service.aio.save_story(snapshot(story_session))
                 _start_cover_art(story_session)
-                _advance_relationships_for_story(story_session)
+                await _advance_relationships_for_story(story_session)
             else:
-                gallery_service.save_progress(tier_config.name, story_session, suffix=_progress_suffix(story_session))
+                await _save_progress(story_session)
 
             redirect = RedirectResponse(
                 url=f"{url_prefix}/story/scene/{scene.scene_id}", status_code=303
@@ -2838,7 +3346,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, story_id: str, scene_id: str
     ):
         """Download a coloring page as a print-ready PDF."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return JSONResponse({"error": "Story not found"}, status_code=404)
 
@@ -2848,11 +3356,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Check if the coloring page PNG exists on disk
         coloring_path = Path(__file__).resolve().parent.parent / "static" / "images" / f"{scene_id}_coloring.png"
-        if not coloring_path.exists() or coloring_path.stat().st_size == 0:
+        if not await run_io(lambda: coloring_path.exists() and coloring_path.stat().st_size > 0):
             return JSONResponse({"error": "Coloring page not yet generated. Generate it first."}, status_code=404)
 
-        from app.services.export import export_coloring_pdf
-        pdf_bytes = bytes(export_coloring_pdf(coloring_path))
+        pdf_bytes = bytes(await run_in_export_pool(export_coloring_pdf, coloring_path))
         filename = f"{saved.title}_coloring_{scene_id}.pdf"
         return Response(
             content=pdf_bytes,
@@ -2865,7 +3372,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, story_id: str, scene_id: str
     ):
         """Generate a coloring page for a scene and return the URL as JSON."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return JSONResponse({"error": "Story not found"}, status_code=404)
 
@@ -2894,7 +3401,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, story_id: str, scene_id: str
     ):
         """Regenerate a scene image with a user-edited prompt in the gallery."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return JSONResponse(
                 {"status": "failed", "error": "Story not found"}, status_code=404
@@ -2942,7 +3449,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
         # Persist updated story
         try:
-            gallery_service.update_story(saved)
+            await gallery_service.aio.update_story(saved)
         except Exception as e:
             return JSONResponse(
                 {"status": "failed", "error": "Failed to save updated story"}
@@ -2959,7 +3466,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         request: Request, story_id: str, scene_id: str
     ):
         """Read a specific scene of a saved story by scene ID."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return RedirectResponse(
                 url=f"{url_prefix}/gallery", status_code=303
@@ -2981,10 +3488,10 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
         # Look up sequel chain data
         parent_story = None
         if saved.parent_story_id:
-            parent_story = gallery_service.get_story(saved.parent_story_id)
+            parent_story = await gallery_service.aio.get_story(saved.parent_story_id)
         sequel_stories = []
         for sid in saved.sequel_story_ids:
-            sq = gallery_service.get_story(sid)
+            sq = await gallery_service.aio.get_story(sid)
             if sq:
                 sequel_stories.append(sq)
 
@@ -3006,6 +3513,62 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
 
     # --- TTS Narration Endpoints ---
 
+    def _set_tts_voice_cookie(response: Response, voice: str | None) -> Response:
+        if voice:
+            response.set_cookie(
+                f"tts_voice_{tier_config.prefix}", voice,
+                path=cookie_path, httponly=False,
+            )
+        return response
+
+    async def _tts_response(request: Request, text: str, effective_voice: str, voice: str | None):
+        """Serve narration audio from the disk cache, or stream it from the provider.
+
+        Cache hits are content-addressed files served with a strong ETag and
+        Range support. On a miss the first chunk is awaited before responding
+        so a provider failure still surfaces as a 502 rather than an empty
+        audio stream.
+        """
+        cached = get_cached_speech(text, effective_voice, tier_config.tts_instructions)
+        if cached:
+            etag = f'"{cached.stem}"'
+            if request.headers.get("if-none-match") == etag:
+                return _set_tts_voice_cookie(
+                    Response(status_code=304, headers={"ETag": etag}), voice
+                )
+            return _set_tts_voice_cookie(
+                FileResponse(
+                    cached,
+                    media_type="audio/mpeg",
+                    headers={"ETag": etag, "Cache-Control": "no-cache"},
+                ),
+                voice,
+            )
+
+        audio = stream_speech(
+            text=text,
+            voice=effective_voice,
+            instructions=tier_config.tts_instructions,
+        )
+        try:
+            first_chunk = await anext(audio, b"")
+        except Exception as e:
+            await audio.aclose()
+            logger.error(f"TTS generation failed: {e}")
+            return JSONResponse({"detail": "TTS generation failed"}, status_code=502)
+
+        async def body():
+            try:
+                yield first_chunk
+                async for chunk in audio:
+                    yield chunk
+            except Exception as e:
+                logger.error(f"TTS generation failed mid-stream: {e}")
+            finally:
+                await audio.aclose()
+
+        return _set_tts_voice_cookie(StreamingResponse(body(), media_type="audio/mpeg"), voice)
+
     @router.get("/story/tts/{scene_id}")
     async def story_tts(request: Request, scene_id: str, voice: str | None = None):
         """Generate TTS audio for a scene in the active story."""
@@ -3021,28 +3584,13 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             f"tts_voice_{tier_config.prefix}", tier_config.tts_default_voice
         )
 
-        try:
-            audio_bytes = await generate_speech(
-                text=scene.content,
-                voice=effective_voice,
-                instructions=tier_config.tts_instructions,
-            )
-        except Exception as e:
-            logger.error(f"TTS generation failed: {e}")
-            return JSONResponse({"detail": "TTS generation failed"}, status_code=502)
-
-        response = Response(content=audio_bytes, media_type="audio/mpeg")
-        if voice:
-            response.set_cookie(
-                f"tts_voice_{tier_config.prefix}", voice,
-                path=cookie_path, httponly=False,
-            )
-        return response
+        await _await_narration_prewarm(_get_session_id(request), scene_id, effective_voice)
+        return await _tts_response(request, scene.content, effective_voice, voice)
 
     @router.get("/gallery/tts/{story_id}/{scene_id}")
     async def gallery_tts(request: Request, story_id: str, scene_id: str, voice: str | None = None):
         """Generate TTS audio for a scene in a saved gallery story."""
-        saved = gallery_service.get_story(story_id)
+        saved = await gallery_service.aio.get_story(story_id)
         if not saved or saved.tier != tier_config.name:
             return JSONResponse({"detail": "Story not found"}, status_code=404)
 
@@ -3054,23 +3602,7 @@ def create_tier_router(tier_config: TierConfig) -> APIRouter:
             f"tts_voice_{tier_config.prefix}", tier_config.tts_default_voice
         )
 
-        try:
-            audio_bytes = await generate_speech(
-                text=scene.content,
-                voice=effective_voice,
-                instructions=tier_config.tts_instructions,
-            )
-        except Exception as e:
-            logger.error(f"TTS generation failed: {e}")
-            return JSONResponse({"detail": "TTS generation failed"}, status_code=502)
-
-        response = Response(content=audio_bytes, media_type="audio/mpeg")
-        if voice:
-            response.set_cookie(
-                f"tts_voice_{tier_config.prefix}", voice,
-                path=cookie_path, httponly=False,
-            )
-        return response
+        return await _tts_response(request, scene.content, effective_voice, voice)
 
     @router.get("/tts/voices")
     async def tts_voices(request: Request):
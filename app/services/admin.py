@@ -1,9 +1,21 @@
-import json
 import logging
 import shutil
 from pathlib import Path
 
-from app.models import SavedStory, StorySession
+from app.models import SavedStory
+from app.models_registry import get_model_display_name
+from app.services import codec
+from app.services.catalog import get_story_catalog, load_story_summary
+from app.services.export import invalidate_exports
+from app.services.gallery import progress_journal
+from app.services.io_pool import AsyncMethods
+from app.services.jobs import job_queue
+from app.services.progress_journal import read_progress
+from app.services.video_poller import video_poller
+from app.services.provider_router import provider_router
+from app.services.speculation import speculation_service
+from app.services.token_usage import token_usage
+from app.session import get_session_stats
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +53,9 @@ def _dir_stats(directory: Path, pattern: str) -> tuple[int, int]:
 
 
 class AdminService:
+    def __init__(self):
+        self.aio = AsyncMethods(self)
+
     def get_storage_stats(self) -> dict:
         """Return file counts and sizes for all storage directories."""
         story_count, story_bytes = _dir_stats(STORIES_DIR, "*.json")
@@ -57,6 +72,39 @@ class AdminService:
             "total_display": _format_size(story_bytes + progress_bytes + image_bytes + video_bytes),
         }
 
+    def get_session_stats(self) -> dict:
+        """Return active session counts, resident memory and eviction counters."""
+        stats = get_session_stats()
+        stats["resident_display"] = _format_size(stats["resident_bytes"])
+        return stats
+
+    def get_speculation_stats(self) -> dict:
+        """Return speculative generation hit/miss counters and token spend."""
+        stats = speculation_service.get_stats()
+        stats["hit_rate_display"] = f"{stats['hit_rate'] * 100:.0f}%"
+        return stats
+
+    def get_prompt_cache_stats(self) -> dict:
+        """Return per-model input tokens split into cached and uncached."""
+        stats = token_usage.get_stats()
+        for totals in stats["models"].values():
+            totals["cached_display"] = f"{totals['cached_ratio'] * 100:.0f}%"
+        return stats
+
+    def get_provider_health(self) -> dict:
+        """Return rolling latency, error rate and breaker state per text provider."""
+        stats = provider_router.get_stats()
+        for key, health in stats["providers"].items():
+            health["display_name"] = get_model_display_name(key)
+            health["error_rate_display"] = f"{health['error_rate'] * 100:.0f}%"
+            health["p50_display"] = f"{health['p50']:.1f}s" if health["p50"] is not None else "—"
+            health["p95_display"] = f"{health['p95']:.1f}s" if health["p95"] is not None else "—"
+        return stats
+
+    def get_job_stats(self) -> dict:
+        """Return background media job counts, timings and provider slot usage."""
+        return {**job_queue.get_stats(), "videos": video_poller.get_stats()}
+
     def list_all_stories(self) -> list[dict]:
         """Load all saved stories across all tiers. Returns list of metadata dicts."""
         stories = []
@@ -65,8 +113,7 @@ class AdminService:
 
         for filepath in sorted(STORIES_DIR.glob("*.json"), reverse=True):
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                saved = SavedStory.model_validate(data)
+                saved = load_story_summary(filepath)
                 stories.append({
                     "story_id": saved.story_id,
                     "title": saved.title,
@@ -76,7 +123,7 @@ class AdminService:
                     "image_model": saved.image_model,
                     "created_at": saved.created_at,
                     "completed_at": saved.completed_at,
-                    "scene_count": len(saved.scenes),
+                    "scene_count": saved.scene_count,
                     "error": False,
                 })
             except Exception as e:
@@ -105,8 +152,7 @@ class AdminService:
         # Try to load story to find scene IDs
         if filepath.exists():
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                saved = SavedStory.model_validate(data)
+                saved = codec.read_model(filepath, SavedStory)
                 for scene_id in saved.scenes:
                     img = IMAGES_DIR / f"{scene_id}.png"
                     if img.exists():
@@ -123,6 +169,8 @@ class AdminService:
             logger.info(f"Deleted story {story_id} ({images_deleted} images, {videos_deleted} videos)")
         else:
             logger.warning(f"Story file not found: {story_id}")
+        get_story_catalog().remove(story_id)
+        invalidate_exports(story_id)
 
         return {
             "images_deleted": images_deleted,
@@ -137,8 +185,7 @@ class AdminService:
         if STORIES_DIR.exists():
             for filepath in STORIES_DIR.glob("*.json"):
                 try:
-                    data = json.loads(filepath.read_text(encoding="utf-8"))
-                    saved = SavedStory.model_validate(data)
+                    saved = codec.read_model(filepath, SavedStory)
                     scene_ids.update(saved.scenes.keys())
                 except Exception:
                     pass
@@ -147,8 +194,7 @@ class AdminService:
         if PROGRESS_DIR.exists():
             for filepath in PROGRESS_DIR.glob("*.json"):
                 try:
-                    data = json.loads(filepath.read_text(encoding="utf-8"))
-                    session = StorySession.model_validate(data)
+                    session = read_progress(filepath)
                     scene_ids.update(session.scenes.keys())
                 except Exception:
                     pass
@@ -162,8 +208,7 @@ class AdminService:
             return active_ids
         for filepath in PROGRESS_DIR.glob("*.json"):
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                session = StorySession.model_validate(data)
+                session = read_progress(filepath)
                 for photo_path in session.story.reference_photo_paths:
                     p = Path(photo_path)
                     if p.parent.parent == UPLOADS_DIR:
@@ -251,8 +296,7 @@ class AdminService:
         for filepath in PROGRESS_DIR.glob("*.json"):
             tier_name = filepath.stem
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                session = StorySession.model_validate(data)
+                session = read_progress(filepath)
                 entries.append({
                     "tier_name": tier_name,
                     "prompt": session.story.prompt[:80],
@@ -281,8 +325,7 @@ class AdminService:
 
         if filepath.exists():
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                session = StorySession.model_validate(data)
+                session = read_progress(filepath)
                 for scene_id in session.scenes:
                     img = IMAGES_DIR / f"{scene_id}.png"
                     if img.exists():
@@ -303,7 +346,7 @@ class AdminService:
             except Exception as e:
                 logger.warning(f"Could not parse progress for media cleanup: {e}")
 
-            filepath.unlink()
+            progress_journal.delete(filepath)
             logger.info(f"Deleted in-progress save for {tier_name}" +
                         (" (uploads cleaned)" if uploads_cleaned else ""))
 
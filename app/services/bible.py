@@ -7,9 +7,8 @@ child-friendly verse text. Falls back gracefully if API is unreachable.
 import logging
 import re
 
-import httpx
-
 from app.config import settings
+from app.services.clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -165,36 +164,36 @@ class BibleService:
             passage_ref = f"{osis}.1"
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{YOUVERSION_BASE_URL}/verses",
-                    params={
-                        "references": passage_ref,
-                        "version_id": NIRV_TRANSLATION_ID,
-                    },
-                    headers={
-                        "accept": "application/json",
-                        "x-youversion-developer-token": settings.bible_api_key,
-                    },
+            response = await get_http_client(YOUVERSION_BASE_URL).get(
+                f"{YOUVERSION_BASE_URL}/verses",
+                params={
+                    "references": passage_ref,
+                    "version_id": NIRV_TRANSLATION_ID,
+                },
+                headers={
+                    "accept": "application/json",
+                    "x-youversion-developer-token": settings.bible_api_key,
+                },
+                timeout=10.0,
+            )
+            if response.status_code == 200:
+                data = response.json()
+                # Extract verse text from response
+                verses = data.get("data", {}).get("verses", [])
+                if verses:
+                    text_parts = []
+                    for verse in verses:
+                        content = verse.get("content", "")
+                        if content:
+                            # Strip HTML tags if any
+                            clean = re.sub(r"<[^>]+>", "", content).strip()
+                            if clean:
+                                text_parts.append(clean)
+                    return " ".join(text_parts)
+            else:
+                logger.warning(
+                    f"YouVersion API returned {response.status_code} for {passage_ref}"
                 )
-                if response.status_code == 200:
-                    data = response.json()
-                    # Extract verse text from response
-                    verses = data.get("data", {}).get("verses", [])
-                    if verses:
-                        text_parts = []
-                        for verse in verses:
-                            content = verse.get("content", "")
-                            if content:
-                                # Strip HTML tags if any
-                                clean = re.sub(r"<[^>]+>", "", content).strip()
-                                if clean:
-                                    text_parts.append(clean)
-                        return " ".join(text_parts)
-                else:
-                    logger.warning(
-                        f"YouVersion API returned {response.status_code} for {passage_ref}"
-                    )
         except Exception as e:
             logger.warning(f"Failed to fetch verses for {scripture_reference}: {e}")
 
@@ -0,0 +1,256 @@
+"""Story catalog — an SQLite index of saved story summary fields.
+
+Gallery listings query this index instead of parsing every
+data/stories/*.json file (JSON or MessagePack, see codec.py). GalleryService keeps it current on every story
+write; reconcile() picks up files added, changed or removed outside the app.
+load_story_summary() reads a single story file's header without its scenes.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from app.models import SavedStory, SavedStorySummary
+from app.services import codec
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+STORIES_DIR = BASE_DIR / "data" / "stories"
+CATALOG_PATH = BASE_DIR / "data" / "catalog.db"
+
+SCHEMA_VERSION = 2
+
+# Top-level keys that make up the story body rather than its header
+BODY_KEYS = {"scenes", "path_history"}
+
+READ_CHUNK_SIZE = 16 * 1024
+
+
+def _read_header(filepath: Path) -> dict:
+    """Parse the top-level keys of a story file up to the first body key.
+
+    Reads the file in chunks and decodes one key/value pair at a time, so
+    the cost depends on the header size rather than the number of scenes.
+    """
+    with filepath.open("rb") as f:
+        if not codec.is_json(f.read(64)):
+            return _read_msgpack_header(filepath)
+
+    decoder = json.JSONDecoder()
+    header: dict = {}
+    with filepath.open(encoding="utf-8") as f:
+        buf = f.read(READ_CHUNK_SIZE)
+        eof = len(buf) < READ_CHUNK_SIZE
+        pos = 0
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+
+        skip(" \t\r\n")
+        if buf[pos:pos + 1] != "{":
+            raise ValueError("story file is not a JSON object")
+        pos += 1
+
+        while True:
+            start = pos
+            try:
+                skip(" \t\r\n,")
+                if buf[pos:pos + 1] == "}":
+                    return header
+                key, pos = decoder.raw_decode(buf, pos)
+                skip(" \t\r\n")
+                if buf[pos:pos + 1] != ":":
+                    raise json.JSONDecodeError("Expecting ':'", buf, pos)
+                if key in BODY_KEYS:
+                    return header
+                skip(": \t\r\n")
+                value, pos = decoder.raw_decode(buf, pos)
+                skip(" \t\r\n")
+                # A value ending exactly at the buffer edge may be truncated
+                # (e.g. a number split across chunks), so require a delimiter
+                if pos >= len(buf) and not eof:
+                    raise json.JSONDecodeError("Value at chunk boundary", buf, pos)
+                header[key] = value
+            except (json.JSONDecodeError, IndexError):
+                if eof:
+                    raise
+                chunk = f.read(READ_CHUNK_SIZE)
+                eof = len(chunk) < READ_CHUNK_SIZE
+                buf = buf[start:] + chunk
+                pos = 0
+
+
+def _read_msgpack_header(filepath: Path) -> dict:
+    """_read_header for story files written by the msgpack codec."""
+    if codec.msgpack is None:
+        raise ValueError("story file is MessagePack-encoded but msgpack is not installed")
+    header: dict = {}
+    with filepath.open("rb") as f:
+        unpacker = codec.msgpack.Unpacker(f, raw=False, read_size=READ_CHUNK_SIZE)
+        for _ in range(unpacker.read_map_header()):
+            key = unpacker.unpack()
+            if key in BODY_KEYS:
+                break
+            header[key] = unpacker.unpack()
+    return header
+
+
+def load_story_summary(filepath: Path) -> SavedStorySummary:
+    """Load the summary of a saved story without parsing its scenes.
+
+    Files written before the header fields existed lack scene_count and are
+    fully parsed instead.
+    """
+    header = _read_header(filepath)
+    if "scene_count" in header:
+        return SavedStorySummary.model_validate(header)
+    saved = codec.read_model(filepath, SavedStory)
+    saved.refresh_summary()
+    return summarize(saved)
+
+
+def summarize(saved: SavedStory) -> SavedStorySummary:
+    """Build the summary for an in-memory SavedStory."""
+    return SavedStorySummary.model_validate(saved, from_attributes=True)
+
+
+class StoryCatalog:
+    def __init__(self, db_path: Path = CATALOG_PATH, stories_dir: Path = STORIES_DIR):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stories_dir = stories_dir
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None,
+            timeout=10.0,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # The catalog is derived data: rebuild it from disk on schema changes
+            self._conn.execute("DROP TABLE IF EXISTS stories")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stories ("
+            "story_id TEXT PRIMARY KEY, tier TEXT NOT NULL, "
+            "completed_at TEXT NOT NULL, file_mtime REAL NOT NULL, "
+            "summary TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_stories_tier_completed "
+            "ON stories (tier, completed_at DESC)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_stories_completed "
+            "ON stories (completed_at DESC)"
+        )
+
+    def upsert(self, summary: SavedStorySummary, filepath: Path) -> None:
+        """Insert or refresh the catalog row for a story that was just written."""
+        try:
+            mtime = filepath.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stories "
+                "(story_id, tier, completed_at, file_mtime, summary) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    summary.story_id,
+                    summary.tier,
+                    summary.completed_at.isoformat(),
+                    mtime,
+                    summary.model_dump_json(),
+                ),
+            )
+
+    def remove(self, story_id: str) -> None:
+        """Drop a story from the catalog."""
+        with self._lock:
+            self._conn.execute("DELETE FROM stories WHERE story_id = ?", (story_id,))
+
+    def list_stories(
+        self, tier: str | None = None, limit: int | None = None, offset: int = 0,
+    ) -> list[SavedStorySummary]:
+        """Return story summaries newest first, optionally for a single tier."""
+        query = "SELECT summary FROM stories"
+        params: list = []
+        if tier is not None:
+            query += " WHERE tier = ?"
+            params.append(tier)
+        query += " ORDER BY completed_at DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [SavedStorySummary.model_validate_json(r[0]) for r in rows]
+
+    def count(self, tier: str | None = None) -> int:
+        """Return the number of catalogued stories, optionally for a single tier."""
+        with self._lock:
+            if tier is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM stories").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM stories WHERE tier = ?", (tier,)
+                ).fetchone()
+        return row[0]
+
+    def reconcile(self) -> None:
+        """Bring the catalog in line with the story files on disk.
+
+        Only files whose mtime differs from the catalogued value are read,
+        and then only up to their header, so this is a directory listing
+        plus stat() calls in the common case.
+        """
+        if not self.stories_dir.exists():
+            return
+        with self._lock:
+            known = {
+                row[0]: row[1]
+                for row in self._conn.execute("SELECT story_id, file_mtime FROM stories")
+            }
+
+        on_disk: set[str] = set()
+        indexed = 0
+        for filepath in self.stories_dir.glob("*.json"):
+            story_id = filepath.stem
+            on_disk.add(story_id)
+            try:
+                mtime = filepath.stat().st_mtime
+            except OSError:
+                continue
+            if known.get(story_id) == mtime:
+                continue
+            try:
+                summary = load_story_summary(filepath)
+            except Exception as e:
+                logger.warning(f"Skipping corrupted story file {filepath}: {e}")
+                continue
+            self.upsert(summary, filepath)
+            indexed += 1
+
+        stale = set(known) - on_disk
+        for story_id in stale:
+            self.remove(story_id)
+
+        if indexed or stale:
+            logger.info(f"Story catalog reconciled: {indexed} indexed, {len(stale)} removed")
+
+
+_catalog: StoryCatalog | None = None
+
+
+def get_story_catalog() -> StoryCatalog:
+    """Return the process-wide catalog, reconciling it with disk on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = StoryCatalog()
+        _catalog.reconcile()
+    return _catalog
@@ -1,4 +1,3 @@
-import json
 import logging
 import shutil
 from datetime import datetime
@@ -8,6 +7,8 @@ from pathlib import Path
 from PIL import Image as PILImage
 
 from app.models import CharacterOutfit, RosterCharacter
+from app.services import codec
+from app.services.io_pool import AsyncMethods
 
 logger = logging.getLogger(__name__)
 
@@ -77,12 +78,16 @@ class CharacterService:
 
     def __init__(self):
         DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.aio = AsyncMethods(self)
 
     def _tier_dir(self, tier: str) -> Path:
         d = DATA_DIR / tier
         d.mkdir(parents=True, exist_ok=True)
         return d
 
+    def character_path(self, tier: str, character_id: str) -> Path:
+        return self._tier_dir(tier) / f"{character_id}.json"
+
     def _photo_dir(self, tier: str, character_id: str) -> Path:
         d = DATA_DIR / tier / character_id / "photos"
         d.mkdir(parents=True, exist_ok=True)
@@ -116,12 +121,11 @@ class CharacterService:
 
     def get_character(self, tier: str, character_id: str) -> RosterCharacter | None:
         """Load a single character by ID."""
-        filepath = self._tier_dir(tier) / f"{character_id}.json"
+        filepath = self.character_path(tier, character_id)
         if not filepath.exists():
             return None
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
-            return RosterCharacter.model_validate(data)
+            return codec.read_model(filepath, RosterCharacter)
         except Exception as e:
             logger.warning(f"Failed to load character {character_id}: {e}")
             return None
@@ -132,8 +136,7 @@ class CharacterService:
         tier_dir = self._tier_dir(tier)
         for filepath in tier_dir.glob("*.json"):
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                characters.append(RosterCharacter.model_validate(data))
+                characters.append(codec.read_model(filepath, RosterCharacter))
             except Exception as e:
                 logger.warning(f"Skipping corrupted character {filepath}: {e}")
         characters.sort(key=lambda c: c.name.lower())
@@ -173,7 +176,7 @@ class CharacterService:
 
     def delete_character(self, tier: str, character_id: str) -> bool:
         """Delete a character and all its photos."""
-        filepath = self._tier_dir(tier) / f"{character_id}.json"
+        filepath = self.character_path(tier, character_id)
         if not filepath.exists():
             return False
         try:
@@ -277,12 +280,9 @@ class CharacterService:
 
     def _save_character(self, character: RosterCharacter) -> None:
         """Write a character to disk."""
-        filepath = self._tier_dir(character.tier) / f"{character.character_id}.json"
+        filepath = self.character_path(character.tier, character.character_id)
         try:
-            filepath.write_text(
-                character.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            codec.write_model(filepath, character)
         except Exception as e:
             logger.error(f"Failed to save character {character.character_id}: {e}")
 
@@ -0,0 +1,93 @@
+"""Application-lifetime HTTP clients shared by every provider integration.
+
+Plain httpx clients are pooled per host so repeated downloads, video polls
+and verse lookups reuse keep-alive connections instead of paying a new
+TCP+TLS handshake each time. HTTP/2 is negotiated when the optional h2
+package is installed. close_clients() runs from the FastAPI lifespan hook;
+clients are recreated lazily if requested afterwards.
+"""
+
+import importlib.util
+import logging
+from urllib.parse import urlsplit
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+XAI_BASE_URL = "https://api.x.ai/v1"
+
+DEFAULT_TIMEOUT = 30.0
+
+# host -> pooled client
+_http_clients: dict[str, httpx.AsyncClient] = {}
+# provider name -> SDK client
+_openai_clients: dict[str, AsyncOpenAI] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections_per_host,
+        max_keepalive_connections=settings.http_max_connections_per_host,
+        keepalive_expiry=settings.http_keepalive_seconds,
+    )
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Return the pooled client for the host of url (or a bare host name)."""
+    host = urlsplit(url).netloc or url
+    client = _http_clients.get(host)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=_limits(),
+            timeout=DEFAULT_TIMEOUT,
+        )
+        _http_clients[host] = client
+    return client
+
+
+def _get_sdk_client(name: str, api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+    client = _openai_clients.get(name)
+    if client is None or client.is_closed():
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, limits=_limits()),
+        )
+        _openai_clients[name] = client
+    return client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client shared by story, image, TTS and voice."""
+    return _get_sdk_client("openai", settings.openai_api_key)
+
+
+def get_xai_client() -> AsyncOpenAI | None:
+    """Return the shared xAI (OpenAI-compatible) client, or None if not configured."""
+    if not settings.xai_api_key:
+        return None
+    return _get_sdk_client("xai", settings.xai_api_key, XAI_BASE_URL)
+
+
+async def close_clients() -> None:
+    """Close every pooled client. Called on application shutdown."""
+    for host, client in list(_http_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP client for {host}: {e}")
+    _http_clients.clear()
+
+    for name, client in list(_openai_clients.items()):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close {name} client: {e}")
+    _openai_clients.clear()
@@ -0,0 +1,339 @@
+"""Codecs for the story, progress and roster files under data/.
+
+These files used to be written as indent=2 JSON and read back with
+json.loads + model_validate. They are now written by the codec named in
+STORAGE_CODEC:
+
+- "json" (default): compact JSON, encoded and parsed by pydantic-core
+  straight into the model without an intermediate dict.
+- "msgpack": MessagePack, somewhat smaller on disk. Needs the optional
+  msgpack package; without it the json codec is used.
+
+Files keep their .json names whatever the codec. Reads sniff the first
+byte (a JSON object starts with "{", a MessagePack map never does), so
+legacy pretty JSON, compact JSON and MessagePack files can sit side by
+side and switching codecs needs no migration. To rewrite existing files
+in the current codec anyway:
+
+    python -m app.services.codec migrate [--dry-run]
+
+and to compare codecs on a synthetic or real story:
+
+    python -m app.services.codec bench [--scenes N] [--story PATH]
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, TypeVar
+
+import pydantic_core
+from pydantic import BaseModel
+
+from app.config import settings
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_JSON_WHITESPACE = b" \t\r\n"
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write data to path via a temp file in the same directory and a rename."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+        tmp = Path(f.name)
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+    tmp.replace(path)
+
+
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return pydantic_core.to_json(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return pydantic_core.from_json(data)
+
+    def dump_model(self, model: BaseModel) -> bytes:
+        return model.model_dump_json().encode("utf-8")
+
+    def load_model(self, model_cls: type[ModelT], data: bytes) -> ModelT:
+        return model_cls.model_validate_json(data)
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    def dumps(self, obj: Any) -> bytes:
+        # to_jsonable_python turns datetimes etc. into the strings JSON would hold
+        return msgpack.packb(pydantic_core.to_jsonable_python(obj), use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+    def dump_model(self, model: BaseModel) -> bytes:
+        return msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+
+    def load_model(self, model_cls: type[ModelT], data: bytes) -> ModelT:
+        return model_cls.model_validate(self.loads(data))
+
+
+JSON = JsonCodec()
+MSGPACK = MsgpackCodec() if msgpack is not None else None
+
+_warned_fallback = False
+
+
+def get_codec() -> JsonCodec | MsgpackCodec:
+    """Return the codec new files are written with."""
+    global _warned_fallback
+    if settings.storage_codec == "msgpack":
+        if MSGPACK is not None:
+            return MSGPACK
+        if not _warned_fallback:
+            logger.warning("STORAGE_CODEC=msgpack but msgpack is not installed; writing JSON")
+            _warned_fallback = True
+    return JSON
+
+
+def is_json(prefix: bytes) -> bool:
+    """Whether a file starting with prefix holds JSON (pretty or compact)."""
+    return prefix.lstrip(_JSON_WHITESPACE)[:1] in (b"{", b"[")
+
+
+def codec_for(data: bytes) -> JsonCodec | MsgpackCodec:
+    """Return the codec that wrote data."""
+    if is_json(data[:64]):
+        return JSON
+    if MSGPACK is None:
+        raise ValueError("file is MessagePack-encoded but msgpack is not installed")
+    return MSGPACK
+
+
+def dumps(obj: Any) -> bytes:
+    return get_codec().dumps(obj)
+
+
+def loads(data: bytes) -> Any:
+    return codec_for(data).loads(data)
+
+
+def dump_model(model: BaseModel) -> bytes:
+    return get_codec().dump_model(model)
+
+
+def load_model(model_cls: type[ModelT], data: bytes) -> ModelT:
+    return codec_for(data).load_model(model_cls, data)
+
+
+def read(path: Path) -> Any:
+    """Read a file written by any codec as plain dicts and lists."""
+    return loads(path.read_bytes())
+
+
+def read_model(path: Path, model_cls: type[ModelT]) -> ModelT:
+    """Read and validate a file written by any codec."""
+    return load_model(model_cls, path.read_bytes())
+
+
+def write(path: Path, obj: Any) -> None:
+    atomic_write(path, dumps(obj))
+
+
+def write_model(path: Path, model: BaseModel) -> None:
+    atomic_write(path, dump_model(model))
+
+
+# --- Command line: migrate / bench ---
+
+def _data_files() -> list[Path]:
+    """Every codec-written file under data/, progress snapshots excluded."""
+    files = list((DATA_DIR / "stories").glob("*.json"))
+    for sub in ("characters", "profiles", "family"):
+        files.extend((DATA_DIR / sub).glob("*/*.json"))
+    return sorted(files)
+
+
+def migrate(dry_run: bool = False) -> dict:
+    """Rewrite every file under data/ in the current codec.
+
+    Progress snapshots are folded together with their journals. Run it with
+    the app stopped. Returns counts and total sizes before and after.
+    """
+    from app.services.catalog import get_story_catalog
+    from app.services.progress_journal import rewrite_progress
+
+    codec = get_codec()
+    stats = {"codec": codec.name, "files": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    for path in _data_files():
+        try:
+            raw = path.read_bytes()
+            data = codec.dumps(loads(raw))
+            if not dry_run:
+                atomic_write(path, data)
+        except Exception as e:
+            logger.warning(f"Could not migrate {path}: {e}")
+            stats["failed"] += 1
+            continue
+        stats["files"] += 1
+        stats["bytes_before"] += len(raw)
+        stats["bytes_after"] += len(data)
+
+    for path in sorted((DATA_DIR / "progress").glob("*.json")):
+        try:
+            before = path.stat().st_size
+            journal = path.with_suffix(".journal")
+            if journal.exists():
+                before += journal.stat().st_size
+            after = rewrite_progress(path, dry_run=dry_run)
+        except Exception as e:
+            logger.warning(f"Could not migrate {path}: {e}")
+            stats["failed"] += 1
+            continue
+        stats["files"] += 1
+        stats["bytes_before"] += before
+        stats["bytes_after"] += after
+
+    if not dry_run and (DATA_DIR / "stories").exists():
+        get_story_catalog().reconcile()
+    return stats
+
+
+def _bench_story(scenes: int):
+    from datetime import datetime
+
+    from app.models import SavedScene, SavedStory
+
+    text = "The lantern flickered as the path split beneath the old oak tree. " * 20
+    scene_map = {}
+    for i in range(scenes):
+        scene_id = f"scene-{i:04d}"
+        scene_map[scene_id] = SavedScene(
+            scene_id=scene_id,
+            parent_scene_id=f"scene-{i - 1:04d}" if i else None,
+            choice_taken_id="choice-1" if i else None,
+            content=text,
+            image_url=f"/static/images/{scene_id}.png",
+            image_prompt="A winding forest path at dusk, watercolor",
+            choices=[
+                {"choice_id": f"choice-{n}", "text": f"Option {n}", "next_scene_id": None}
+                for n in range(1, 4)
+            ],
+            depth=i,
+        )
+    saved = SavedStory(
+        story_id="bench",
+        title="Benchmark Story",
+        prompt="A walk through the forest",
+        tier="kids",
+        length="long",
+        target_depth=scenes,
+        model="claude",
+        image_model="gpt-image-1",
+        created_at=datetime.now(),
+        completed_at=datetime.now(),
+        scenes=scene_map,
+        path_history=list(scene_map),
+    )
+    saved.refresh_summary()
+    return saved
+
+
+def bench(scenes: int = 50, story: Path | None = None, rounds: int = 50) -> list[dict]:
+    """Time encode/decode of one SavedStory with each available codec."""
+    import json
+    import time
+
+    from app.models import SavedStory
+
+    saved = read_model(story, SavedStory) if story else _bench_story(scenes)
+
+    def legacy_dump():
+        return saved.model_dump_json(indent=2).encode("utf-8")
+
+    def legacy_load(data):
+        return SavedStory.model_validate(json.loads(data))
+
+    candidates = [("pretty json (legacy)", legacy_dump, legacy_load)]
+    for codec in (JSON, MSGPACK):
+        if codec is not None:
+            candidates.append((
+                codec.name,
+                lambda c=codec: c.dump_model(saved),
+                lambda data, c=codec: c.load_model(SavedStory, data),
+            ))
+
+    results = []
+    for name, dump, load in candidates:
+        data = dump()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            dump()
+        encode = (time.perf_counter() - start) / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            load(data)
+        decode = (time.perf_counter() - start) / rounds
+        results.append({
+            "codec": name,
+            "bytes": len(data),
+            "encode_ms": round(encode * 1000, 3),
+            "decode_ms": round(decode * 1000, 3),
+            "encode_mb_s": round(len(data) / encode / 1e6, 1),
+            "decode_mb_s": round(len(data) / decode / 1e6, 1),
+        })
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.services.codec")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_cmd = commands.add_parser("migrate", help="rewrite data/ in the current codec")
+    migrate_cmd.add_argument("--dry-run", action="store_true", help="report sizes without writing")
+    bench_cmd = commands.add_parser("bench", help="compare codec speed and size")
+    bench_cmd.add_argument("--scenes", type=int, default=50, help="scenes in the synthetic story")
+    bench_cmd.add_argument("--story", type=Path, help="benchmark this story file instead")
+    bench_cmd.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "migrate":
+        stats = migrate(dry_run=args.dry_run)
+        action = "Would rewrite" if args.dry_run else "Rewrote"
+        print(
+            f"{action} {stats['files']} file(s) as {stats['codec']}: "
+            f"{stats['bytes_before']:,} -> {stats['bytes_after']:,} bytes"
+            + (f" ({stats['failed']} failed)" if stats["failed"] else "")
+        )
+    else:
+        if MSGPACK is None:
+            print("msgpack is not installed; skipping the msgpack codec")
+        print(f"{'codec':<22}{'bytes':>10}{'enc ms':>10}{'dec ms':>10}{'enc MB/s':>10}{'dec MB/s':>10}")
+        for r in bench(scenes=args.scenes, story=args.story, rounds=args.rounds):
+            print(
+                f"{r['codec']:<22}{r['bytes']:>10,}{r['encode_ms']:>10}{r['decode_ms']:>10}"
+                f"{r['encode_mb_s']:>10}{r['decode_mb_s']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Rolling, model-written summaries of a story's earlier scenes.
+
+Long stories used to be squeezed under CONTEXT_CHAR_THRESHOLD by pasting
+the first 2000 characters of the earlier scenes, rebuilt from every scene
+on every choice. Instead, a summary of the scenes along the reader's path
+is kept here and folded forward in the background:
+
+    summary(path[:b + N]) = fold(summary(path[:b]), path[b:b + N])
+
+with N = CONTEXT_RECENT_SCENES. Generation gets the deepest summary that
+still leaves at least N scenes verbatim, so a prompt holds one summary
+plus N to 2N - 1 recent scenes however long the story runs. The summary
+only changes every N scenes, which leaves the transcript prefix cacheable
+by the provider in between.
+
+Stories whose verbatim transcript fits under CONTEXT_CHAR_THRESHOLD are
+sent in full, as before: a summary is only used once the transcript
+exceeds it, and only written once the next scene would take it over.
+
+Summaries are keyed by the id of the last scene they cover. A scene's path
+is fixed by the scene tree, so branches share their common ancestors'
+summaries. They are kept in memory only: after a restart the first scene
+view of a resumed story summarizes its whole prefix in one call.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from app.config import settings
+from app.models import Scene
+
+logger = logging.getLogger(__name__)
+
+# Summaries kept, least recently used dropped first
+MAX_ENTRIES = 2048
+
+# fold(summary, path, start) -> summary of path, given summary of path[:start];
+# returns "" on failure
+FoldFn = Callable[[str, list[Scene], int], Awaitable[str]]
+
+
+def transcript_chars(path: list[Scene]) -> int:
+    """Approximate size of path sent verbatim (scene texts without labels)."""
+    return sum(len(scene.content) for scene in path)
+
+
+def _boundary(length: int) -> int:
+    """Scenes the summary should cover for a path of length scenes."""
+    step = settings.context_recent_scenes
+    if step <= 0 or length < 2 * step:
+        return 0
+    return (length - step) // step * step
+
+
+class ContextSummaries:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        # scene_id -> summary of the path from the root through that scene
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        # scene_id -> task summarizing through that scene
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def _deepest(self, path: list[Scene], boundary: int) -> tuple[str, int]:
+        """Return the deepest cached summary covering at most boundary scenes."""
+        step = settings.context_recent_scenes
+        while boundary > 0:
+            summary = self._entries.get(path[boundary - 1].scene_id)
+            if summary is not None:
+                self._entries.move_to_end(path[boundary - 1].scene_id)
+                return summary, boundary
+            boundary -= step
+        return "", 0
+
+    def for_context(self, path: list[Scene]) -> tuple[str, int]:
+        """Return (summary, scenes it covers) to send with path, or ("", 0).
+
+        Falls back to a shallower summary, with more scenes left verbatim,
+        while the one path needs is still being written. Nothing is
+        summarized while path fits under CONTEXT_CHAR_THRESHOLD.
+        """
+        if transcript_chars(path) <= settings.context_char_threshold:
+            return "", 0
+        return self._deepest(path, _boundary(len(path)))
+
+    def covering(self, path: list[Scene]) -> tuple[str, int]:
+        """Return the deepest cached summary of any prefix of path, or ("", 0)."""
+        step = settings.context_recent_scenes
+        if step <= 0:
+            return "", 0
+        return self._deepest(path, len(path) // step * step)
+
+    def refresh(self, path: list[Scene], fold: FoldFn) -> None:
+        """Start writing the summary the scene after path will need, if missing.
+
+        Only once a scene of average length would take the transcript over
+        CONTEXT_CHAR_THRESHOLD, so short stories never pay for a summary.
+        """
+        boundary = _boundary(len(path) + 1)
+        if not boundary:
+            return
+        chars = transcript_chars(path)
+        if chars + chars // len(path) <= settings.context_char_threshold:
+            return
+        scene_id = path[boundary - 1].scene_id
+        if scene_id in self._entries or scene_id in self._tasks:
+            return
+        task = asyncio.create_task(self._summarize(scene_id, path[:boundary], fold))
+        self._tasks[scene_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(scene_id, None))
+
+    async def _summarize(self, scene_id: str, path: list[Scene], fold: FoldFn) -> None:
+        previous, start = self._deepest(path, len(path) - settings.context_recent_scenes)
+        try:
+            summary = await fold(previous, path, start)
+        except Exception as e:
+            logger.warning(f"Context summary through scene {scene_id} failed: {e}")
+            return
+        if not summary:
+            return
+        logger.info(f"Summarized scenes {start + 1}-{len(path)} into the context summary through {scene_id}")
+        self._entries[scene_id] = summary
+        self._entries.move_to_end(scene_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+context_summaries = ContextSummaries()
@@ -0,0 +1,216 @@
+"""Resized WebP (and optionally AVIF) copies of generated images.
+
+Providers return 1-3 MB PNGs, which were served as-is everywhere from
+gallery thumbnails to the mobile reader. After an image is saved, a worker
+pool writes narrower, compressed copies next to it under
+static/images/derived/, and templates offer them through srcset via the
+responsive_image() template global. The original PNG stays the <img> src
+fallback and is what the lightbox and exports use.
+
+Derivative names carry the source's modification time, so a regenerated
+image gets new derivative URLs instead of browsers keeping the old ones.
+Images saved before derivatives existed (or regenerated since) are
+backfilled the first time a page renders them.
+
+Rendering never touches the disk: responsive_image() only reads what is
+already known about an image's derivatives, and looks up unknown or
+stale images on the file I/O pool for later renders.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image as PILImage, features
+from markupsafe import Markup, escape
+
+from app.config import settings
+from app.services.io_pool import submit_io
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent.parent / "static"
+STATIC_IMAGES_DIR = STATIC_DIR / "images"
+DERIVED_DIR = STATIC_IMAGES_DIR / "derived"
+
+# Widths offered in srcset; widths at or above the source's own width are
+# replaced by a single full-width copy
+DERIVATIVE_WIDTHS = (320, 640, 1024)
+
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+AVIF_AVAILABLE = features.check("avif")
+
+# Seconds an image's derivatives are trusted before they are looked up
+# again, which catches images regenerated by another worker process
+SOURCES_RECHECK_SECONDS = 60.0
+
+# Pillow releases the GIL while resizing and encoding, so threads suffice
+_pool = ThreadPoolExecutor(
+    max_workers=max(1, settings.image_derivative_workers),
+    thread_name_prefix="derivatives",
+)
+_lock = threading.Lock()
+# source path -> future of the build in flight
+_building: dict[Path, Future] = {}
+# image url -> (source version, {format: [(url, width), ...]}, when looked
+# up) for images whose derivatives exist
+_sources: dict[str, tuple[str, dict[str, list[tuple[str, int]]], float]] = {}
+# image urls being looked up on the file I/O pool
+_resolving: set[str] = set()
+
+
+def _formats() -> list[str]:
+    formats = ["webp"]
+    if settings.image_avif and AVIF_AVAILABLE:
+        formats.insert(0, "avif")
+    return formats
+
+
+def _widths(source_width: int) -> list[int]:
+    widths = [w for w in DERIVATIVE_WIDTHS if w < source_width]
+    widths.append(min(source_width, DERIVATIVE_WIDTHS[-1]))
+    return widths
+
+
+def _version(path: Path) -> str:
+    """Short tag for the current contents of path, from its modification time."""
+    return f"{path.stat().st_mtime_ns:x}"
+
+
+def _parse_name(name: str, stem: str) -> tuple[str, int] | None:
+    """Return (version, width) if name is a derivative of the image named stem.
+
+    Derivatives written before names were versioned come back with an
+    empty version.
+    """
+    if not name.startswith(f"{stem}-"):
+        return None
+    parts = name[len(stem) + 1:].partition(".")[0].split("-")
+    if not parts[-1].isdigit() or len(parts) > 2:
+        return None
+    return (parts[0] if len(parts) == 2 else ""), int(parts[-1])
+
+
+def build_derivatives(path: Path) -> None:
+    """Write every width/format derivative of path. Runs on a worker thread."""
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    version = _version(path)
+    with PILImage.open(path) as source:
+        source.load()
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+        for width in _widths(source.width):
+            height = round(source.height * width / source.width)
+            resized = source if width == source.width else source.resize(
+                (width, height), PILImage.LANCZOS,
+            )
+            for fmt in _formats():
+                target = DERIVED_DIR / f"{path.stem}-{version}-{width}.{fmt}"
+                partial = target.with_name(target.name + ".part")
+                quality = AVIF_QUALITY if fmt == "avif" else WEBP_QUALITY
+                resized.save(partial, format=fmt.upper(), quality=quality)
+                partial.replace(target)
+    # Drop derivatives of earlier versions of this image
+    for candidate in DERIVED_DIR.glob(f"{path.stem}-*"):
+        parsed = _parse_name(candidate.name, path.stem)
+        if parsed and parsed[0] != version:
+            candidate.unlink(missing_ok=True)
+    with _lock:
+        _sources.pop(f"/static/images/{path.name}", None)
+
+
+def schedule(path: Path) -> None:
+    """Build path's derivatives in the background; repeat calls coalesce."""
+    with _lock:
+        if path in _building:
+            return
+
+        def _done(future):
+            with _lock:
+                _building.pop(path, None)
+            if future.exception():
+                logger.warning(f"Image derivatives failed for {path.name}: {future.exception()}")
+
+        future = _pool.submit(build_derivatives, path)
+        _building[path] = future
+    future.add_done_callback(_done)
+
+
+def _source_path(url: str) -> Path | None:
+    """Resolve an image url, ignoring any ?t= cache-buster, to its file."""
+    if not url or not url.startswith("/static/images/") or not url.endswith(".png"):
+        return None
+    path = STATIC_IMAGES_DIR / url.removeprefix("/static/images/")
+    return path if path.parent == STATIC_IMAGES_DIR else None
+
+
+def _resolve_sources(url: str) -> None:
+    """Look up url's derivatives on disk and remember them. Runs on the file I/O pool."""
+    try:
+        path = _source_path(url)
+        try:
+            version = _version(path)
+        except OSError:
+            with _lock:
+                _sources.pop(url, None)
+            return
+
+        found: dict[str, list[tuple[str, int]]] = {}
+        for fmt in _formats():
+            entries = [
+                (f"/static/images/derived/{candidate.name}", parsed[1])
+                for candidate in DERIVED_DIR.glob(f"{path.stem}-{version}-*.{fmt}")
+                if (parsed := _parse_name(candidate.name, path.stem)) and parsed[0] == version
+            ]
+            if entries:
+                found[fmt] = sorted(entries, key=lambda e: e[1])
+        if "webp" not in found:
+            # Saved before derivatives existed, or regenerated since: backfill for next time
+            with _lock:
+                _sources.pop(url, None)
+            schedule(path)
+            return
+        with _lock:
+            _sources[url] = (version, found, time.monotonic())
+    finally:
+        with _lock:
+            _resolving.discard(url)
+
+
+def _find_sources(url: str) -> dict[str, list[tuple[str, int]]] | None:
+    """Return url's known derivatives, looking them up in the background if unknown or stale."""
+    url = url.partition("?")[0]
+    if _source_path(url) is None:
+        return None
+    with _lock:
+        cached = _sources.get(url)
+        stale = cached is None or time.monotonic() - cached[2] > SOURCES_RECHECK_SECONDS
+        if stale and url not in _resolving:
+            _resolving.add(url)
+            submit_io(_resolve_sources, url)
+    return cached[1] if cached else None
+
+
+def responsive_image(url: str, alt: str = "", sizes: str = "100vw", **attrs) -> Markup:
+    """Render a <picture> offering url's derivatives, falling back to the plain image.
+
+    Extra keyword arguments become attributes on the <img> (class_ for class).
+    """
+    attr_html = "".join(
+        f' {escape(name.rstrip("_").replace("_", "-"))}="{escape(value)}"'
+        for name, value in attrs.items()
+    )
+    img = Markup(f'<img src="{escape(url)}" alt="{escape(alt)}"{attr_html}>')
+    sources = _find_sources(url)
+    if not sources:
+        return img
+    source_tags = "".join(
+        f'<source type="image/{fmt}" sizes="{escape(sizes)}" '
+        f'srcset="{escape(", ".join(f"{src} {width}w" for src, width in entries))}">'
+        for fmt, entries in sources.items()
+    )
+    return Markup(f"<picture>{source_tags}{img}</picture>")
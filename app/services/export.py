@@ -1,17 +1,50 @@
-"""Export service for generating self-contained HTML and PDF story files."""
+"""Export service for generating self-contained HTML and PDF story files.
 
+HTML and PDF exports are built in a process pool, since fpdf2 and the image
+re-encoding are CPU-bound and would otherwise stall the event loop. Each
+export is built once per story revision into data/exports/{story_id}/ and
+served from there. The file name is a hash of the story's content, its
+image files and the encoding options, so any change produces a new
+export. update_story() clears the story's directory.
+"""
+
+import asyncio
 import base64
+import hashlib
+import io
 import logging
+import multiprocessing
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from fpdf import FPDF
 from jinja2 import Environment, FileSystemLoader
+from PIL import Image as PILImage
 
+from app.config import settings
 from app.models import SavedStory
+from app.services.io_pool import run_io
 
 logger = logging.getLogger(__name__)
 
 STATIC_IMAGES_DIR = Path(__file__).resolve().parent.parent.parent / "static" / "images"
+EXPORTS_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "exports"
+
+# HTML-embedded images are downscaled to at most this width
+EXPORT_IMAGE_MAX_WIDTH = 800
+
+# PDF images are pre-scaled to this width (170mm at ~180 dpi) before embedding
+PDF_IMAGE_MAX_WIDTH = 1200
+PDF_IMAGE_QUALITY = 85
+
+EXPORT_IMAGE_FORMATS = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+# Superseded exports younger than this are kept, since a download started
+# just before a newer revision was built may still be about to open them
+EXPORT_PRUNE_GRACE_SECONDS = 600
 
 PLACEHOLDER_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="400" height="400" viewBox="0 0 400 400">
   <rect width="400" height="400" fill="#2a2a4a"/>
@@ -28,33 +61,46 @@ def _get_placeholder_data_uri() -> str:
     return f"data:image/svg+xml;base64,{encoded}"
 
 
-def _read_image_as_base64(image_url: str | None) -> str:
-    """Resolve an image URL to a base64 data URI.
+def _read_image_as_base64(image_url: str | None, image_format: str, quality: int) -> str:
+    """Resolve an image URL to a downscaled base64 data URI.
 
-    Reads the PNG file from static/images/ and returns a data URI.
-    Returns placeholder SVG if the file is missing or unreadable.
+    Re-encodes the PNG from static/images/ as JPEG or WebP, no wider than
+    EXPORT_IMAGE_MAX_WIDTH. Returns placeholder SVG if the file is missing
+    or unreadable.
     """
-    if not image_url:
-        return _get_placeholder_data_uri()
-
-    # Strip /static/ prefix to get relative path
-    relative = image_url.lstrip("/")
-    if relative.startswith("static/"):
-        relative = relative[len("static/"):]
-
-    filepath = STATIC_IMAGES_DIR.parent / relative
-    if not filepath.exists() or filepath.stat().st_size == 0:
+    filepath = _resolve_image_path(image_url)
+    if filepath is None:
         return _get_placeholder_data_uri()
 
     try:
-        img_bytes = filepath.read_bytes()
-        encoded = base64.b64encode(img_bytes).decode("ascii")
-        return f"data:image/png;base64,{encoded}"
+        with PILImage.open(filepath) as img:
+            img.thumbnail((EXPORT_IMAGE_MAX_WIDTH, EXPORT_IMAGE_MAX_WIDTH * 4))
+            if image_format == "jpeg" and img.mode != "RGB":
+                img = img.convert("RGB")
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format.upper(), quality=quality)
+        encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+        return f"data:{EXPORT_IMAGE_FORMATS[image_format]};base64,{encoded}"
     except Exception as e:
         logger.warning(f"Failed to read image {filepath}: {e}")
         return _get_placeholder_data_uri()
 
 
+class _EmbeddedImage:
+    """A scene image data URI, encoded only when the template writes it out.
+
+    Keeps at most one encoded image in memory while an export renders.
+    """
+
+    def __init__(self, image_url: str | None, image_format: str, quality: int):
+        self.image_url = image_url
+        self.image_format = image_format
+        self.quality = quality
+
+    def __str__(self) -> str:
+        return _read_image_as_base64(self.image_url, self.image_format, self.quality)
+
+
 def _order_scenes_by_branch(saved_story: SavedStory) -> list[tuple[str, str]]:
     """Order scenes: main path first, then alternate branches depth-first.
 
@@ -128,8 +174,8 @@ def _order_scenes_by_branch(saved_story: SavedStory) -> list[tuple[str, str]]:
     return result
 
 
-def _build_scene_data(saved_story: SavedStory) -> list[dict]:
-    """Build ordered list of scene data dicts with base64 images.
+def _build_scene_data(saved_story: SavedStory, image_format: str, quality: int) -> list[dict]:
+    """Build ordered list of scene data dicts with lazily encoded images.
 
     Each dict has: scene_id, scene, image_data_uri, branch_label, chapter_num.
     """
@@ -143,7 +189,7 @@ def _build_scene_data(saved_story: SavedStory) -> list[dict]:
         scene_data.append({
             "scene_id": scene_id,
             "scene": scene,
-            "image_data_uri": _read_image_as_base64(scene.image_url),
+            "image_data_uri": _EmbeddedImage(scene.image_url, image_format, quality),
             "branch_label": branch_label,
             "chapter_num": chapter_num,
         })
@@ -159,17 +205,167 @@ _jinja_env = Environment(
 )
 
 
-def export_html(saved_story: SavedStory) -> str:
-    """Export a saved story as a self-contained HTML string.
+def _export_options(image_format: str | None, quality: int | None) -> tuple[str, int]:
+    image_format = (image_format or settings.export_image_format).lower()
+    if image_format not in EXPORT_IMAGE_FORMATS:
+        image_format = "jpeg"
+    quality = settings.export_image_quality if quality is None else quality
+    return image_format, max(20, min(95, quality))
+
 
-    Builds scene data with base64 images and renders the export.html template.
+def _export_path(
+    saved_story: SavedStory, kind: str, image_format: str, quality: int,
+) -> Path:
+    """Return where this revision of the story's export is cached.
+
+    The file name hashes everything the export depends on. PDFs always
+    embed JPEGs at PDF_IMAGE_QUALITY, so the image format and quality
+    options only count for HTML.
+    """
+    digest = hashlib.sha256(saved_story.model_dump_json().encode("utf-8"))
+    if kind == "pdf":
+        options = f"pdf:{PDF_IMAGE_MAX_WIDTH}:{PDF_IMAGE_QUALITY}"
+    else:
+        options = f"{kind}:{image_format}:{quality}:{EXPORT_IMAGE_MAX_WIDTH}"
+    digest.update(options.encode("ascii"))
+    for scene in saved_story.scenes.values():
+        path = _resolve_image_path(scene.image_url)
+        if path:
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+    return EXPORTS_DIR / saved_story.story_id / f"{digest.hexdigest()[:24]}.{kind}"
+
+
+def _locate_export(
+    saved_story: SavedStory, kind: str, image_format: str, quality: int,
+) -> tuple[Path, bool]:
+    """Return the export's cache path and whether it is already built. Runs on the I/O pool."""
+    filepath = _export_path(saved_story, kind, image_format, quality)
+    return filepath, filepath.exists()
+
+
+def _write_export(filepath: Path, write) -> None:
+    """Write an export through a temp file, then drop superseded exports of the same kind.
+
+    Only exports older than EXPORT_PRUNE_GRACE_SECONDS are dropped, so
+    concurrent downloads of other revisions or quality settings keep their
+    files.
     """
-    scenes_data = _build_scene_data(saved_story)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=filepath.parent, suffix=".part", delete=False) as f:
+        partial = Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            partial.unlink(missing_ok=True)
+            raise
+    partial.replace(filepath)
+    cutoff = time.time() - EXPORT_PRUNE_GRACE_SECONDS
+    for stale in filepath.parent.glob(f"*{filepath.suffix}"):
+        try:
+            if stale != filepath and stale.stat().st_mtime < cutoff:
+                stale.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _build_html_export(
+    saved_story: SavedStory, filepath: Path, image_format: str, quality: int,
+) -> None:
+    """Render export.html to filepath in chunks. Runs in the export pool."""
+    scenes_data = _build_scene_data(saved_story, image_format, quality)
     template = _jinja_env.get_template("export.html")
-    return template.render(
-        story=saved_story,
-        scenes_data=scenes_data,
-    )
+
+    def write(f):
+        for chunk in template.generate(story=saved_story, scenes_data=scenes_data):
+            f.write(chunk.encode("utf-8"))
+
+    _write_export(filepath, write)
+
+
+def _build_pdf_export(
+    saved_story: SavedStory, filepath: Path, image_format: str, quality: int,
+) -> None:
+    """Build the story PDF to filepath. Runs in the export pool."""
+    pdf_bytes = export_pdf(saved_story)
+    _write_export(filepath, lambda f: f.write(pdf_bytes))
+
+
+_BUILDERS = {"html": _build_html_export, "pdf": _build_pdf_export}
+
+_pool: ProcessPoolExecutor | None = None
+# cache path -> build in flight, so concurrent requests share one build
+_builds: dict[Path, asyncio.Future] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: workers import only this module, not the running app's threads
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.export_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def run_in_export_pool(fn, *args):
+    """Run a blocking export function in the worker process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), fn, *args)
+
+
+async def _start_build(
+    saved_story: SavedStory, kind: str, quality: int | None,
+) -> tuple[Path, asyncio.Future | None]:
+    """Return the export's cache path and its build, starting one if needed.
+
+    The build is None when the export is already cached. Hashing the story
+    and statting its images happens on the I/O pool, off the event loop.
+    """
+    image_format, quality = _export_options(None, quality)
+    filepath, cached = await run_io(_locate_export, saved_story, kind, image_format, quality)
+    if cached:
+        return filepath, None
+
+    build = _builds.get(filepath)
+    if build is None:
+        build = asyncio.ensure_future(run_in_export_pool(
+            _BUILDERS[kind], saved_story, filepath, image_format, quality,
+        ))
+        _builds[filepath] = build
+        build.add_done_callback(lambda _: _builds.pop(filepath, None))
+        logger.info(f"Building {kind} export for story {saved_story.story_id}")
+    return filepath, build
+
+
+async def start_export(saved_story: SavedStory, kind: str, quality: int | None = None) -> bool:
+    """Start building an export in the background. Returns True if it is already ready."""
+    _, build = await _start_build(saved_story, kind, quality)
+    return build is None
+
+
+async def prepare_export(saved_story: SavedStory, kind: str, quality: int | None = None) -> Path:
+    """Return the cached "html" or "pdf" export, building it in the pool if needed."""
+    filepath, build = await _start_build(saved_story, kind, quality)
+    if build is not None:
+        # shield: a client disconnecting must not cancel a build others share
+        await asyncio.shield(build)
+    return filepath
+
+
+def shutdown_export_pool() -> None:
+    """Stop the export worker processes. Called on application shutdown."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def invalidate_exports(story_id: str) -> None:
+    """Delete every cached export of a story."""
+    shutil.rmtree(EXPORTS_DIR / story_id, ignore_errors=True)
 
 
 def _resolve_image_path(image_url: str | None) -> Path | None:
@@ -187,6 +383,22 @@ def _resolve_image_path(image_url: str | None) -> Path | None:
     return None
 
 
+def _prescale_for_pdf(filepath: Path) -> io.BytesIO:
+    """Downscale an image to print width and re-encode it as JPEG.
+
+    fpdf2 embeds JPEG data as-is, which is much faster (and smaller) than
+    having it recompress a full-size PNG.
+    """
+    with PILImage.open(filepath) as img:
+        img.thumbnail((PDF_IMAGE_MAX_WIDTH, PDF_IMAGE_MAX_WIDTH * 4))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=PDF_IMAGE_QUALITY)
+    buffer.seek(0)
+    return buffer
+
+
 def export_pdf(saved_story: SavedStory) -> bytes:
     """Export a saved story as a PDF document.
 
@@ -272,7 +484,7 @@ def export_pdf(saved_story: SavedStory) -> bytes:
         if img_path:
             try:
                 # Scale image to fit page width (max ~170mm)
-                pdf.image(str(img_path), w=170)
+                pdf.image(_prescale_for_pdf(img_path), w=170)
                 pdf.ln(5)
             except Exception as e:
                 logger.warning(f"Failed to embed image in PDF: {e}")
@@ -1,8 +1,9 @@
-import json
 import logging
 from pathlib import Path
 
 from app.models import Family
+from app.services import codec
+from app.services.io_pool import AsyncMethods
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,7 @@ FAMILY_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "family"
 class FamilyService:
     def __init__(self):
         FAMILY_DIR.mkdir(parents=True, exist_ok=True)
+        self.aio = AsyncMethods(self)
 
     def _tier_dir(self, tier: str) -> Path:
         d = FAMILY_DIR / tier
@@ -27,8 +29,7 @@ class FamilyService:
         if not filepath.exists():
             return None
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
-            return Family.model_validate(data)
+            return codec.read_model(filepath, Family)
         except Exception as e:
             logger.warning(f"Failed to load family for tier {tier}: {e}")
             return None
@@ -36,10 +37,7 @@ class FamilyService:
     def save_family(self, family: Family) -> Family:
         """Save/overwrite the family for a tier."""
         filepath = self._family_path(family.tier)
-        filepath.write_text(
-            family.model_dump_json(indent=2),
-            encoding="utf-8",
-        )
+        codec.write_model(filepath, family)
         logger.info(f"Saved family for tier {family.tier}")
         return family
 
@@ -1,4 +1,3 @@
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -8,14 +7,24 @@ from app.models import (
     SavedChoice,
     SavedScene,
     SavedStory,
+    SavedStorySummary,
     StorySession,
 )
+from app.services import codec
+from app.services.catalog import get_story_catalog, load_story_summary, summarize
+from app.services.export import invalidate_exports
+from app.services.io_pool import AsyncMethods
+from app.services.media_events import media_events
+from app.services.progress_journal import ProgressJournal
 
 logger = logging.getLogger(__name__)
 
 STORIES_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "stories"
 PROGRESS_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "progress"
 
+# Shared so every GalleryService instance appends from the same base state
+progress_journal = ProgressJournal()
+
 COVER_STYLES = {
     "kids": "Bright, colorful children's book cover illustration, whimsical, friendly, cheerful atmosphere, picture book aesthetic",
     "bible": "Warm, reverent Bible storybook cover illustration, golden light, classical painting style, inspirational",
@@ -27,6 +36,7 @@ class GalleryService:
     def __init__(self):
         STORIES_DIR.mkdir(parents=True, exist_ok=True)
         PROGRESS_DIR.mkdir(parents=True, exist_ok=True)
+        self.aio = AsyncMethods(self)
 
     def save_story(self, story_session: StorySession) -> None:
         """Convert a completed StorySession to SavedStory and write to disk."""
@@ -99,14 +109,13 @@ class GalleryService:
             scenes=saved_scenes,
             path_history=list(story_session.path_history),
         )
+        saved.refresh_summary()
 
         filepath = STORIES_DIR / f"{story.story_id}.json"
         try:
-            filepath.write_text(
-                saved.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            codec.write_model(filepath, saved)
             logger.info(f"Saved story {story.story_id} to {filepath}")
+            get_story_catalog().upsert(summarize(saved), filepath)
 
             # Update parent story's forward reference if this is a sequel
             if story.parent_story_id:
@@ -164,6 +173,9 @@ class GalleryService:
                 else:
                     saved.cover_art_status = "failed"
                 self.update_story(saved)
+                media_events.publish_cover_art(
+                    story_id, saved.cover_art_status, saved.cover_art_url,
+                )
         except Exception as e:
             logger.warning(f"Cover art generation failed for story {story_id}: {e}")
             try:
@@ -171,26 +183,17 @@ class GalleryService:
                 if saved:
                     saved.cover_art_status = "failed"
                     self.update_story(saved)
+                    media_events.publish_cover_art(story_id, "failed")
             except Exception:
                 pass
 
-    def list_stories(self, tier: str) -> list[SavedStory]:
-        """Load all saved stories for a tier, sorted newest first."""
-        stories: list[SavedStory] = []
-        if not STORIES_DIR.exists():
-            return stories
-
-        for filepath in STORIES_DIR.glob("*.json"):
-            try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                saved = SavedStory.model_validate(data)
-                if saved.tier == tier:
-                    stories.append(saved)
-            except Exception as e:
-                logger.warning(f"Skipping corrupted story file {filepath}: {e}")
+    def list_stories(self, tier: str, limit: int | None = None, offset: int = 0) -> list[SavedStorySummary]:
+        """Return catalog summaries of a tier's saved stories, newest first."""
+        return get_story_catalog().list_stories(tier, limit=limit, offset=offset)
 
-        stories.sort(key=lambda s: s.completed_at, reverse=True)
-        return stories
+    def count_stories(self, tier: str) -> int:
+        """Return the number of saved stories for a tier."""
+        return get_story_catalog().count(tier)
 
     def get_story(self, story_id: str) -> SavedStory | None:
         """Load a single saved story by ID."""
@@ -199,33 +202,45 @@ class GalleryService:
             return None
 
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
-            return SavedStory.model_validate(data)
+            return codec.read_model(filepath, SavedStory)
         except Exception as e:
             logger.warning(f"Failed to load story {story_id}: {e}")
             return None
 
+    def get_story_summary(self, story_id: str) -> SavedStorySummary | None:
+        """Load a saved story's header fields without parsing its scenes."""
+        filepath = STORIES_DIR / f"{story_id}.json"
+        if not filepath.exists():
+            return None
+
+        try:
+            return load_story_summary(filepath)
+        except Exception as e:
+            logger.warning(f"Failed to load story summary {story_id}: {e}")
+            return None
+
     def update_story(self, saved: SavedStory) -> None:
         """Write an updated SavedStory back to disk."""
         filepath = STORIES_DIR / f"{saved.story_id}.json"
+        saved.refresh_summary()
         try:
-            filepath.write_text(
-                saved.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            codec.write_model(filepath, saved)
             logger.info(f"Updated story {saved.story_id}")
+            get_story_catalog().upsert(summarize(saved), filepath)
+            invalidate_exports(saved.story_id)
         except Exception as e:
             logger.error(f"Failed to update story {saved.story_id}: {e}")
             raise
 
     def save_progress(self, tier_name: str, story_session: StorySession, suffix: str = "") -> None:
-        """Save an in-progress story session to disk."""
+        """Save an in-progress story session to disk.
+
+        Appends the changes since the last save to the tier's progress
+        journal; see progress_journal for the file layout.
+        """
         filepath = PROGRESS_DIR / f"{tier_name}{suffix}.json"
         try:
-            filepath.write_text(
-                story_session.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            progress_journal.save(filepath, story_session)
             logger.info(f"Saved progress for tier {tier_name}{suffix}")
         except Exception as e:
             logger.error(f"Failed to save progress for tier {tier_name}{suffix}: {e}")
@@ -237,19 +252,18 @@ class GalleryService:
             return None
 
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
-            return StorySession.model_validate(data)
+            return progress_journal.load(filepath)
         except Exception as e:
             logger.warning(f"Corrupted progress file for tier {tier_name}{suffix}: {e}")
             self.delete_progress(tier_name, suffix=suffix)
             return None
 
     def delete_progress(self, tier_name: str, suffix: str = "") -> None:
-        """Delete the in-progress save file for a tier."""
+        """Delete the in-progress save (snapshot and journal) for a tier."""
         filepath = PROGRESS_DIR / f"{tier_name}{suffix}.json"
         if filepath.exists():
             try:
-                filepath.unlink()
+                progress_journal.delete(filepath)
                 logger.info(f"Deleted progress for tier {tier_name}{suffix}")
             except Exception as e:
                 logger.error(f"Failed to delete progress for tier {tier_name}{suffix}: {e}")
@@ -262,16 +276,14 @@ class GalleryService:
             return
 
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
+            data = codec.read(filepath)
             sequel_ids = data.get("sequel_story_ids", [])
             if sequel_story_id not in sequel_ids:
                 sequel_ids.append(sequel_story_id)
                 data["sequel_story_ids"] = sequel_ids
-                filepath.write_text(
-                    json.dumps(data, indent=2, default=str),
-                    encoding="utf-8",
-                )
+                codec.write(filepath, data)
                 logger.info(f"Added sequel link {sequel_story_id} to parent {parent_story_id}")
+                get_story_catalog().upsert(load_story_summary(filepath), filepath)
         except Exception as e:
             logger.error(f"Failed to update sequel link for {parent_story_id}: {e}")
 
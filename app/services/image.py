@@ -1,19 +1,24 @@
 import asyncio
 import base64
 import logging
+import time
 from pathlib import Path
+from typing import Awaitable, Callable
 
-import httpx
 from google import genai
-from openai import AsyncOpenAI, BadRequestError
+from openai import BadRequestError
 
 from app.config import settings
 from app.models import Image, ImageStatus
+from app.services.clients import XAI_BASE_URL, get_http_client, get_openai_client, get_xai_client
+from app.services.derivatives import schedule as schedule_derivatives
+from app.services.io_pool import run_io
+from app.services.media_events import media_completions, media_events
+from app.services.video_poller import video_poller
 
 logger = logging.getLogger(__name__)
 
 STATIC_IMAGES_DIR = Path(__file__).resolve().parent.parent.parent / "static" / "images"
-STATIC_VIDEOS_DIR = Path(__file__).resolve().parent.parent.parent / "static" / "videos"
 
 MAX_RETRIES = 2
 FAST_IMAGE_MODEL = "gpt-image-1-mini"
@@ -43,6 +48,32 @@ _OPENAI_IMAGE_MODELS = {"gpt-image-1", "gpt-image-1-mini", "gpt-image-1.5", "dal
 _FALLBACK_ORDER = ["gpt-image-1", "grok-imagine"]
 
 
+def _write_image_file(filepath: Path, img_bytes: bytes) -> None:
+    """Save generated image bytes, failing if nothing landed. Runs on the file I/O pool."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_bytes(img_bytes)
+    if filepath.stat().st_size == 0:
+        raise ValueError(f"Saved image file {filepath.name} is empty")
+
+
+def _read_reference_images(
+    reference_images: list[str], limit: int | None = None,
+) -> list[tuple[Path, bytes]]:
+    """Read up to limit of the reference images that still exist. Runs on the file I/O pool."""
+    found = []
+    for img_path in reference_images:
+        path = Path(img_path)
+        if path.exists():
+            found.append((path, path.read_bytes()))
+            if limit and len(found) >= limit:
+                break
+    return found
+
+
+def _mime_type(path: Path) -> str:
+    return "image/jpeg" if path.suffix in (".jpg", ".jpeg") else "image/png"
+
+
 class ContentRefusedError(Exception):
     """Raised when a model refuses to generate due to safety/content filters."""
     pass
@@ -50,18 +81,18 @@ class ContentRefusedError(Exception):
 
 class ImageService:
     def __init__(self):
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
         self.gemini_client = (
             genai.Client(api_key=settings.gemini_api_key)
             if settings.gemini_api_key else None
         )
-        self.xai_client = (
-            AsyncOpenAI(
-                base_url="https://api.x.ai/v1",
-                api_key=settings.xai_api_key,
-            )
-            if settings.xai_api_key else None
-        )
+
+    @property
+    def openai_client(self):
+        return get_openai_client()
+
+    @property
+    def xai_client(self):
+        return get_xai_client()
 
     async def generate_image(
         self, image: Image, scene_id: str, image_model: str = "gpt-image-1",
@@ -73,9 +104,20 @@ class ImageService:
         This method is designed to be run as a background task.
         Retries up to MAX_RETRIES times on failure with backoff.
         On content refusal (safety filters), skips retries and falls back
-        to a different model automatically.
+        to a different model automatically. Resolves the scene's "image"
+        completion once the image settles either way.
         """
+        try:
+            await self._generate_image(image, scene_id, image_model, reference_images)
+        finally:
+            media_completions.resolve("image", scene_id, image.status.value)
+
+    async def _generate_image(
+        self, image: Image, scene_id: str, image_model: str,
+        reference_images: list[str] | None,
+    ) -> None:
         image.status = ImageStatus.GENERATING
+        media_events.publish_image(scene_id, image)
         last_error = None
 
         for attempt in range(MAX_RETRIES + 1):
@@ -85,16 +127,13 @@ class ImageService:
                 )
 
                 # Save to disk
-                STATIC_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
                 filepath = STATIC_IMAGES_DIR / f"{scene_id}.png"
-                filepath.write_bytes(img_bytes)
-
-                # Verify file is valid (non-zero size)
-                if filepath.stat().st_size == 0:
-                    raise ValueError("Saved image file is empty")
+                await run_io(_write_image_file, filepath, img_bytes)
 
+                schedule_derivatives(filepath)
                 image.url = f"/static/images/{scene_id}.png"
                 image.status = ImageStatus.COMPLETE
+                media_events.publish_image(scene_id, image)
                 logger.info(f"Image generated for scene {scene_id} using {image_model}")
                 return
 
@@ -110,11 +149,12 @@ class ImageService:
                 )
                 if fallback_result:
                     img_bytes, used_model = fallback_result
-                    STATIC_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
                     filepath = STATIC_IMAGES_DIR / f"{scene_id}.png"
-                    filepath.write_bytes(img_bytes)
+                    await run_io(_write_image_file, filepath, img_bytes)
+                    schedule_derivatives(filepath)
                     image.url = f"/static/images/{scene_id}.png"
                     image.status = ImageStatus.COMPLETE
+                    media_events.publish_image(scene_id, image)
                     logger.info(
                         f"Image generated for scene {scene_id} using "
                         f"fallback {used_model} (original: {image_model})"
@@ -136,6 +176,7 @@ class ImageService:
         # All retries/fallbacks exhausted
         image.status = ImageStatus.FAILED
         image.error = str(last_error)
+        media_events.publish_image(scene_id, image)
         logger.error(
             f"Image generation failed for scene {scene_id} ({image_model}) after "
             f"all attempts. Prompt: {image.prompt[:200]}"
@@ -157,6 +198,7 @@ class ImageService:
         """
         async def _generate_one(image: Image, index: int, variation_suffix: str):
             image.status = ImageStatus.GENERATING
+            media_events.publish_extra_image(scene_id, index, image)
             varied_prompt = f"{variation_suffix}{main_prompt}"
             image.prompt = varied_prompt
             last_error = None
@@ -167,15 +209,13 @@ class ImageService:
                         fast_model, varied_prompt, reference_images
                     )
 
-                    STATIC_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
                     filepath = STATIC_IMAGES_DIR / f"{scene_id}_extra_{index}.png"
-                    filepath.write_bytes(img_bytes)
-
-                    if filepath.stat().st_size == 0:
-                        raise ValueError("Saved image file is empty")
+                    await run_io(_write_image_file, filepath, img_bytes)
 
+                    schedule_derivatives(filepath)
                     image.url = f"/static/images/{scene_id}_extra_{index}.png"
                     image.status = ImageStatus.COMPLETE
+                    media_events.publish_extra_image(scene_id, index, image)
                     logger.info(
                         f"Extra image {index} generated for scene {scene_id} "
                         f"using {fast_model}"
@@ -201,6 +241,7 @@ class ImageService:
 
             image.status = ImageStatus.FAILED
             image.error = str(last_error)
+            media_events.publish_extra_image(scene_id, index, image)
             logger.error(
                 f"Extra image {index} generation failed for scene {scene_id}"
             )
@@ -213,7 +254,14 @@ class ImageService:
                 suffix = _EXTRA_IMAGE_VARIATIONS[0][1]
             tasks.append(_generate_one(image, i, suffix))
 
-        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            statuses = {image.status for image in extra_images}
+            media_completions.resolve(
+                "extra_images", scene_id,
+                "complete" if statuses == {ImageStatus.COMPLETE} else "failed",
+            )
 
     async def _call_model(
         self, image_model: str, prompt: str,
@@ -284,11 +332,10 @@ class ImageService:
     ) -> bytes:
         """Execute the OpenAI API call. Returns raw image bytes."""
         if reference_images:
-            image_files = []
-            for img_path in reference_images:
-                path = Path(img_path)
-                if path.exists():
-                    image_files.append(path)
+            image_files = [
+                (path.name, data, _mime_type(path))
+                for path, data in await run_io(_read_reference_images, reference_images)
+            ]
 
             if image_files:
                 logger.info(
@@ -330,9 +377,8 @@ class ImageService:
         if hasattr(image_data, "b64_json") and image_data.b64_json:
             return base64.b64decode(image_data.b64_json)
         elif hasattr(image_data, "url") and image_data.url:
-            async with httpx.AsyncClient() as http:
-                img_response = await http.get(image_data.url)
-                return img_response.content
+            img_response = await get_http_client(image_data.url).get(image_data.url)
+            return img_response.content
         else:
             raise ValueError("No image data in OpenAI response")
 
@@ -350,12 +396,11 @@ class ImageService:
 
         if reference_images:
             # Use raw httpx for image editing with reference photos
-            valid_refs = [p for p in reference_images if Path(p).exists()]
+            valid_refs = await run_io(_read_reference_images, reference_images, limit=1)
             if valid_refs:
-                ref_path = Path(valid_refs[0])
-                mime = "image/jpeg" if ref_path.suffix in (".jpg", ".jpeg") else "image/png"
-                b64_data = base64.b64encode(ref_path.read_bytes()).decode("utf-8")
-                image_url = f"data:{mime};base64,{b64_data}"
+                ref_path, ref_bytes = valid_refs[0]
+                b64_data = base64.b64encode(ref_bytes).decode("utf-8")
+                image_url = f"data:{_mime_type(ref_path)};base64,{b64_data}"
 
                 ref_prompt = (
                     f"Use the person from the reference photo as the main character "
@@ -363,24 +408,24 @@ class ImageService:
                     f"accurately. Scene: {prompt}"
                 )
                 logger.info("Using Grok Imagine image editing with reference photo")
-                async with httpx.AsyncClient(timeout=60.0) as http:
-                    resp = await http.post(
-                        "https://api.x.ai/v1/images/generations",
-                        headers={
-                            "Authorization": f"Bearer {settings.xai_api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "model": "grok-imagine-image",
-                            "prompt": ref_prompt,
-                            "n": 1,
-                            "image_url": image_url,
-                            "response_format": "b64_json",
-                        },
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return base64.b64decode(data["data"][0]["b64_json"])
+                resp = await get_http_client(XAI_BASE_URL).post(
+                    f"{XAI_BASE_URL}/images/generations",
+                    headers={
+                        "Authorization": f"Bearer {settings.xai_api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": "grok-imagine-image",
+                        "prompt": ref_prompt,
+                        "n": 1,
+                        "image_url": image_url,
+                        "response_format": "b64_json",
+                    },
+                    timeout=60.0,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                return base64.b64decode(data["data"][0]["b64_json"])
 
         # Basic generation via OpenAI-compatible SDK
         response = await self.xai_client.images.generate(
@@ -394,9 +439,8 @@ class ImageService:
         if hasattr(image_data, "b64_json") and image_data.b64_json:
             return base64.b64decode(image_data.b64_json)
         elif hasattr(image_data, "url") and image_data.url:
-            async with httpx.AsyncClient() as http:
-                img_response = await http.get(image_data.url)
-                return img_response.content
+            img_response = await get_http_client(image_data.url).get(image_data.url)
+            return img_response.content
         else:
             raise ValueError("No image data in Grok Imagine response")
 
@@ -415,17 +459,14 @@ class ImageService:
 
         # Add reference images if provided
         if reference_images:
-            for img_path in reference_images:
-                path = Path(img_path)
-                if path.exists():
-                    mime = "image/jpeg" if path.suffix in (".jpg", ".jpeg") else "image/png"
-                    contents.append(
-                        genai.types.Part(
-                            inline_data=genai.types.Blob(
-                                mime_type=mime, data=path.read_bytes()
-                            )
+            for path, data in await run_io(_read_reference_images, reference_images):
+                contents.append(
+                    genai.types.Part(
+                        inline_data=genai.types.Blob(
+                            mime_type=_mime_type(path), data=data
                         )
                     )
+                )
             if contents:
                 logger.info(
                     f"Including {len(contents)} reference image(s) for Gemini"
@@ -492,12 +533,11 @@ class ImageService:
         generates a new one using the scene's image prompt with a
         coloring page style override. Returns the URL path.
         """
-        STATIC_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
         filepath = STATIC_IMAGES_DIR / f"{scene_id}_coloring.png"
         url_path = f"/static/images/{scene_id}_coloring.png"
 
         # Return cached version if it exists
-        if filepath.exists() and filepath.stat().st_size > 0:
+        if await run_io(lambda: filepath.exists() and filepath.stat().st_size > 0):
             logger.info(f"Coloring page cache hit for scene {scene_id}")
             return url_path
 
@@ -512,10 +552,7 @@ class ImageService:
             try:
                 img_bytes = await self._call_model(image_model, coloring_prompt)
 
-                filepath.write_bytes(img_bytes)
-
-                if filepath.stat().st_size == 0:
-                    raise ValueError("Saved coloring page file is empty")
+                await run_io(_write_image_file, filepath, img_bytes)
 
                 logger.info(
                     f"Coloring page generated for scene {scene_id} "
@@ -533,7 +570,7 @@ class ImageService:
                 )
                 if fallback_result:
                     img_bytes, used_model = fallback_result
-                    filepath.write_bytes(img_bytes)
+                    await run_io(_write_image_file, filepath, img_bytes)
                     logger.info(
                         f"Coloring page generated for scene {scene_id} using "
                         f"fallback {used_model}"
@@ -556,93 +593,90 @@ class ImageService:
         )
 
     async def generate_video(
-        self, image: Image, scene_id: str,
+        self, image: Image, scene_id: str, resume: bool = False,
+        on_submitted: Callable[[], Awaitable[None]] | None = None,
     ) -> None:
         """Generate a video clip for a scene using xAI Grok Imagine.
 
         Prefers image-to-video (using the scene's generated image) for
         visual continuity. Falls back to text-to-video if no image available.
-        Polls the xAI API until the video is ready or timeout.
+        The request is then handed to the shared video poller, which saves
+        the clip once xAI has rendered it. With resume=True, an in-flight
+        request recorded on the image is waited on instead of resubmitted;
+        on_submitted is awaited once a new request id is recorded, so the
+        caller can persist it.
         """
         if not settings.xai_api_key:
             image.video_status = "failed"
             image.video_error = "xAI API key not configured"
+            media_events.publish_video(scene_id, image)
+            media_completions.resolve("video", scene_id, image.video_status)
             return
 
         image.video_status = "generating"
+        media_events.publish_video(scene_id, image)
 
         try:
-            headers = {
-                "Authorization": f"Bearer {settings.xai_api_key}",
-                "Content-Type": "application/json",
-            }
-
-            body = {
-                "model": "grok-imagine-video",
-                "prompt": image.prompt,
-                "duration": 8,
-                "aspect_ratio": "1:1",
-                "resolution": "720p",
-            }
-
-            # Prefer image-to-video if the scene image is available
-            image_path = STATIC_IMAGES_DIR / f"{scene_id}.png"
-            if image_path.exists():
-                b64_data = base64.b64encode(image_path.read_bytes()).decode("utf-8")
-                body["image"] = {"url": f"data:image/png;base64,{b64_data}"}
-                logger.info(f"Using image-to-video for scene {scene_id}")
+            request_id = image.video_request_id if resume else None
+            if request_id:
+                logger.info(f"Resuming video generation for scene {scene_id}: {request_id}")
             else:
-                logger.info(f"Using text-to-video for scene {scene_id} (no image file)")
-
-            async with httpx.AsyncClient(timeout=30.0) as http:
-                # Submit video generation request
-                resp = await http.post(
-                    "https://api.x.ai/v1/videos/generations",
-                    headers=headers,
-                    json=body,
-                )
-                resp.raise_for_status()
-                request_id = resp.json()["request_id"]
-                logger.info(f"Video generation started for scene {scene_id}: {request_id}")
-
-            # Poll for result (up to 5 minutes, every 5 seconds)
-            max_polls = 60
-            async with httpx.AsyncClient(timeout=30.0) as http:
-                for poll in range(max_polls):
-                    await asyncio.sleep(5)
-                    poll_resp = await http.get(
-                        f"https://api.x.ai/v1/videos/{request_id}",
-                        headers={"Authorization": f"Bearer {settings.xai_api_key}"},
-                    )
-                    poll_data = poll_resp.json()
-
-                    # Response format: {"video": {"url": "..."}, "model": "..."}
-                    video_obj = poll_data.get("video", {})
-                    video_url = video_obj.get("url") if isinstance(video_obj, dict) else poll_data.get("url")
-                    if video_url:
-                        # Download and save the video
-                        video_resp = await http.get(video_url)
-                        STATIC_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
-                        video_path = STATIC_VIDEOS_DIR / f"{scene_id}.mp4"
-                        video_path.write_bytes(video_resp.content)
-
-                        if video_path.stat().st_size == 0:
-                            raise ValueError("Downloaded video file is empty")
-
-                        image.video_url = f"/static/videos/{scene_id}.mp4"
-                        image.video_status = "complete"
-                        logger.info(f"Video generated for scene {scene_id}")
-                        return
-
-                    if "error" in poll_data:
-                        raise ValueError(f"Video generation error: {poll_data['error']}")
-
-                # Timeout
-                raise TimeoutError(
-                    f"Video generation timed out after {max_polls * 5}s"
-                )
+                request_id = await self._submit_video(image, scene_id)
+                image.video_request_id = request_id
+                image.video_submitted_at = time.time()
+                if on_submitted:
+                    await on_submitted()
+
+            await video_poller.wait(request_id, scene_id, image.video_submitted_at)
+
+            image.video_url = f"/static/videos/{scene_id}.mp4"
+            image.video_status = "complete"
+            image.video_request_id = None
+            image.video_submitted_at = None
+            media_events.publish_video(scene_id, image)
+            logger.info(f"Video generated for scene {scene_id}")
 
         except Exception as e:
             image.video_status = "failed"
             image.video_error = str(e)
+            image.video_request_id = None
+            image.video_submitted_at = None
+            media_events.publish_video(scene_id, image)
             logger.error(f"Video generation failed for scene {scene_id}: {e}")
+        finally:
+            media_completions.resolve("video", scene_id, image.video_status)
+
+    async def _submit_video(self, image: Image, scene_id: str) -> str:
+        """Start an xAI video generation and return its request id."""
+        headers = {
+            "Authorization": f"Bearer {settings.xai_api_key}",
+            "Content-Type": "application/json",
+        }
+
+        body = {
+            "model": "grok-imagine-video",
+            "prompt": image.prompt,
+            "duration": 8,
+            "aspect_ratio": "1:1",
+            "resolution": "720p",
+        }
+
+        # Prefer image-to-video if the scene image is available
+        image_path = STATIC_IMAGES_DIR / f"{scene_id}.png"
+        existing = await run_io(_read_reference_images, [str(image_path)])
+        if existing:
+            b64_data = base64.b64encode(existing[0][1]).decode("utf-8")
+            body["image"] = {"url": f"data:image/png;base64,{b64_data}"}
+            logger.info(f"Using image-to-video for scene {scene_id}")
+        else:
+            logger.info(f"Using text-to-video for scene {scene_id} (no image file)")
+
+        resp = await get_http_client(XAI_BASE_URL).post(
+            f"{XAI_BASE_URL}/videos/generations",
+            headers=headers,
+            json=body,
+        )
+        resp.raise_for_status()
+        request_id = resp.json()["request_id"]
+        logger.info(f"Video generation started for scene {scene_id}: {request_id}")
+        return request_id
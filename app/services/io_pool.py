@@ -0,0 +1,96 @@
+"""Bounded thread pool for blocking file I/O called from the event loop.
+
+Story, progress, roster and upload files live on a network-attached
+volume in production, where a single read or rename can stall for tens of
+milliseconds. The services that touch those files are synchronous, so
+calling them straight from an async route blocked every other request for
+that long. Route handlers now go through a service's .aio proxy instead:
+
+    saved = await gallery_service.aio.get_story(story_id)
+
+which runs the same method on a dedicated pool of IO_WORKERS threads. The
+pool is bounded so a burst of slow reads queues up here rather than
+starving the default executor that other libraries share.
+
+Arguments are handed to another thread as-is. Pass a snapshot (see
+snapshot()) rather than a live StorySession the event loop may still be
+changing while the write runs.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import settings
+
+T = TypeVar("T")
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, settings.io_workers),
+                thread_name_prefix="file-io",
+            )
+        return _pool
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the file I/O pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def submit_io(fn: Callable[..., T], *args: Any) -> Future:
+    """Start a blocking call on the file I/O pool without waiting for it.
+
+    For synchronous code on the event loop, such as template globals, that
+    cannot await run_io().
+    """
+    return _get_pool().submit(fn, *args)
+
+
+def snapshot(model: ModelT) -> ModelT:
+    """Copy a model for a worker thread to read while the loop keeps mutating the original.
+
+    model_dump runs in pydantic-core without releasing the GIL, so the copy
+    is consistent even if another thread is mid-update.
+    """
+    return type(model).model_validate(model.model_dump())
+
+
+class AsyncMethods:
+    """Awaitable versions of an object's methods, each run with run_io()."""
+
+    def __init__(self, target: Any):
+        self._target = target
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self._target, name)
+        if asyncio.iscoroutinefunction(method):
+            raise AttributeError(f"{name} is already async; await it directly")
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_io(method, *args, **kwargs)
+
+        return call
+
+
+def shutdown_io_pool() -> None:
+    """Wait for in-flight file I/O to finish; the pool restarts on next use."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -0,0 +1,287 @@
+"""Durable background job queue for media generation.
+
+Image, extra image, video and cover art work is submitted here instead of
+being started with a bare asyncio.create_task(). Each job is recorded in an
+SQLite file before it runs, so work interrupted by a restart is picked up
+again on startup rather than leaving its Image stuck at "generating".
+
+Jobs run with a concurrency cap per provider (see JOB_CONCURRENCY_*), and
+within a provider the lowest priority value runs first: the current scene
+image ahead of extra images, video and cover art. Queue wait and run times
+are recorded on each row for the admin dashboard.
+
+A job belongs to the process that submitted it, because its handler
+updates that process's in-memory session. Jobs left behind by a process
+that is no longer running are adopted by the next one to start. Owners
+carry a per-boot id as well as host and PID: a restarted container comes
+back with the same hostname and PID 1, and must still adopt the jobs its
+previous run left behind.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.config import settings
+from app.models_registry import get_image_provider
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "jobs.db"
+
+PRIORITY_SCENE_IMAGE = 0
+PRIORITY_EXTRA_IMAGE = 1
+PRIORITY_VIDEO = 2
+PRIORITY_COVER_ART = 3
+
+# Finished jobs are kept this long for metrics, then pruned on startup
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Window for the average wait/run times shown in the admin dashboard
+METRICS_WINDOW_SECONDS = 24 * 3600
+
+JobHandler = Callable[[dict, bool], Awaitable[None]]
+
+
+def image_provider(image_model: str) -> str:
+    """Return the concurrency bucket ("openai", "xai", "google") for an image model."""
+    model = get_image_provider(image_model)
+    return model.provider.lower() if model else "openai"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    def __init__(self, db_path: Path = JOBS_DB_PATH):
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        self._handlers: dict[str, JobHandler] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # provider -> heap of (priority, job_id) waiting to run
+        self._queued: dict[str, list[tuple[int, int]]] = {}
+        # job_id -> (kind, payload, resumed) for queued jobs
+        self._pending: dict[int, tuple[str, dict, bool]] = {}
+        # provider -> {job_id: task} for running jobs
+        self._running: dict[str, dict[int, asyncio.Task]] = {}
+
+    def _owner_alive(self, owner: str, hostname: str) -> bool:
+        """Whether the process that wrote owner ("host:pid:boot", or legacy "host:pid") is running.
+
+        Only processes on this host can be checked. A PID equal to ours
+        from another boot belongs to a previous run of this container.
+        """
+        host, pid, *_ = owner.split(":") + [""]
+        if host != hostname or not pid.isdigit():
+            return False
+        if int(pid) == os.getpid():
+            return owner == self.owner
+        return _pid_alive(int(pid))
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the coroutine that runs jobs of this kind.
+
+        handler(payload, resumed) — resumed is True when the job was
+        adopted after a restart rather than submitted by this process.
+        """
+        self._handlers[kind] = handler
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.db_path), check_same_thread=False, isolation_level=None,
+                timeout=10.0,
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, "
+                "provider TEXT NOT NULL, priority INTEGER NOT NULL, "
+                "payload TEXT NOT NULL, status TEXT NOT NULL, owner TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL, error TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, owner)"
+            )
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db().execute(sql, params)
+
+    def _capacity(self, provider: str) -> int:
+        caps = {
+            "openai": settings.job_concurrency_openai,
+            "xai": settings.job_concurrency_xai,
+            "google": settings.job_concurrency_google,
+        }
+        return max(1, caps.get(provider, settings.job_concurrency_openai))
+
+    def submit(self, kind: str, payload: dict, priority: int, provider: str) -> int:
+        """Persist a job and schedule it. Returns the job id.
+
+        payload must be JSON-serializable and carry everything the handler
+        needs to find its target again after a restart.
+        """
+        cursor = self._execute(
+            "INSERT INTO jobs (kind, provider, priority, payload, status, owner, created_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+            (kind, provider, priority, json.dumps(payload), self.owner, time.time()),
+        )
+        job_id = cursor.lastrowid
+        self._enqueue(job_id, kind, provider, priority, payload, resumed=False)
+        return job_id
+
+    def _enqueue(
+        self, job_id: int, kind: str, provider: str, priority: int,
+        payload: dict, resumed: bool,
+    ) -> None:
+        self._pending[job_id] = (kind, payload, resumed)
+        heapq.heappush(self._queued.setdefault(provider, []), (priority, job_id))
+        self._dispatch(provider)
+
+    def _dispatch(self, provider: str) -> None:
+        """Start queued jobs for provider while it has free slots."""
+        queued = self._queued.get(provider, [])
+        running = self._running.setdefault(provider, {})
+        while queued and len(running) < self._capacity(provider):
+            _, job_id = heapq.heappop(queued)
+            entry = self._pending.pop(job_id, None)
+            if entry is None:
+                continue  # cancelled while queued
+            kind, payload, resumed = entry
+            self._execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "started_at = ? WHERE job_id = ?",
+                (time.time(), job_id),
+            )
+            task = asyncio.create_task(self._run(job_id, kind, payload, resumed))
+            running[job_id] = task
+            task.add_done_callback(
+                lambda t, p=provider, j=job_id: self._on_done(p, j, t)
+            )
+
+    async def _run(self, job_id: int, kind: str, payload: dict, resumed: bool) -> None:
+        handler = self._handlers.get(kind)
+        if handler is None:
+            raise RuntimeError(f"No handler registered for job kind {kind!r}")
+        await handler(payload, resumed)
+
+    def _on_done(self, provider: str, job_id: int, task: asyncio.Task) -> None:
+        self._running.get(provider, {}).pop(job_id, None)
+        if task.cancelled():
+            # Left as "running": the next process to start adopts it
+            return
+        error = task.exception()
+        if error:
+            logger.warning(f"Job {job_id} failed: {error}")
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE job_id = ?",
+            ("failed" if error else "done", time.time(), str(error) if error else None, job_id),
+        )
+        self._dispatch(provider)
+
+    def cancel(self, job_id: int) -> None:
+        """Drop a queued job or cancel a running one; it will not be resumed."""
+        self._pending.pop(job_id, None)
+        for running in self._running.values():
+            task = running.get(job_id)
+            if task:
+                task.cancel()
+        self._execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE job_id = ?",
+            (time.time(), job_id),
+        )
+
+    async def start(self) -> None:
+        """Prune old rows and adopt unfinished jobs of processes that are gone."""
+        hostname = socket.gethostname()
+        self._execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') "
+            "AND finished_at < ?",
+            (time.time() - JOB_RETENTION_SECONDS,),
+        )
+        rows = self._execute(
+            "SELECT job_id, kind, provider, priority, payload, owner FROM jobs "
+            "WHERE status IN ('queued', 'running') ORDER BY job_id"
+        ).fetchall()
+        adopted = 0
+        for job_id, kind, provider, priority, payload, owner in rows:
+            if self._owner_alive(owner, hostname):
+                continue
+            claimed = self._execute(
+                "UPDATE jobs SET status = 'queued', owner = ? WHERE job_id = ? AND owner = ?",
+                (self.owner, job_id, owner),
+            ).rowcount
+            if not claimed:
+                continue  # another process adopted it first
+            self._enqueue(job_id, kind, provider, priority, json.loads(payload), resumed=True)
+            adopted += 1
+        if adopted:
+            logger.info(f"Resumed {adopted} background job(s) from a previous run")
+
+    async def stop(self) -> None:
+        """Cancel running jobs; they stay recorded and resume on next start."""
+        tasks = [t for running in self._running.values() for t in running.values()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
+        self._queued.clear()
+
+    def get_stats(self) -> dict:
+        """Return job counts by status and kind plus timing averages."""
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        by_kind: dict[str, dict] = {}
+        since = time.time() - METRICS_WINDOW_SECONDS
+        rows = self._execute(
+            "SELECT kind, status, COUNT(*), "
+            "AVG(started_at - created_at), AVG(finished_at - started_at), "
+            "MAX(finished_at - started_at) "
+            "FROM jobs WHERE status IN ('queued', 'running') OR finished_at >= ? "
+            "GROUP BY kind, status",
+            (since,),
+        ).fetchall()
+        for kind, status, count, avg_wait, avg_run, max_run in rows:
+            counts[status] = counts.get(status, 0) + count
+            entry = by_kind.setdefault(kind, {
+                "kind": kind, "queued": 0, "running": 0, "done": 0, "failed": 0,
+                "avg_wait_seconds": 0.0, "avg_run_seconds": 0.0, "max_run_seconds": 0.0,
+            })
+            entry[status] = entry.get(status, 0) + count
+            if status == "done":
+                entry["avg_wait_seconds"] = round(avg_wait or 0.0, 1)
+                entry["avg_run_seconds"] = round(avg_run or 0.0, 1)
+                entry["max_run_seconds"] = round(max_run or 0.0, 1)
+        return {
+            **counts,
+            "kinds": sorted(by_kind.values(), key=lambda e: e["kind"]),
+            "providers": {
+                provider: {"running": len(self._running.get(provider, {})), "limit": self._capacity(provider)}
+                for provider in sorted({"openai", "xai", "google", *self._running})
+            },
+        }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,92 @@
+"""Event loop lag monitor.
+
+A heartbeat task on the event loop records when it last ran. A watchdog
+thread checks the heartbeat, and when the loop has not come back to it
+within LOOP_LAG_THRESHOLD_MS it logs the event loop thread's current
+stack: that is the callback blocking the loop, caught in the act. Each
+stall is reported once, with its total duration logged when the loop
+recovers.
+
+Set LOOP_LAG_THRESHOLD_MS=0 to disable.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# How often the heartbeat runs, as a fraction of the threshold
+HEARTBEAT_FRACTION = 0.25
+
+# Innermost frames of the blocked stack included in the warning
+STACK_DEPTH = 12
+
+
+class LoopLagMonitor:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._interval = 0.0
+        self._threshold = 0.0
+        self._last_beat = 0.0
+        # Heartbeat time of the stall already reported, so it is logged once
+        self._reported_beat: float | None = None
+
+    async def start(self) -> None:
+        threshold_ms = settings.loop_lag_threshold_ms
+        if threshold_ms <= 0 or self._task is not None:
+            return
+        self._threshold = threshold_ms / 1000
+        self._interval = self._threshold * HEARTBEAT_FRACTION
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            lag = now - expected
+            if lag > self._threshold:
+                logger.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self._interval
+            if stalled <= self._threshold or self._reported_beat == beat:
+                continue
+            self._reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame)[-STACK_DEPTH:])
+            logger.warning(
+                f"Event loop blocked for over {stalled * 1000:.0f} ms, currently in:\n{stack}"
+            )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,138 @@
+"""In-process pub/sub for image, video and cover art status changes.
+
+ImageService and GalleryService publish here whenever they flip a media
+status; the per-session event stream in the routes subscribes and pushes
+the transitions to the browser as Server-Sent Events, replacing the
+client's JSON polling.
+
+Events only reach subscribers in the same process. The event stream
+re-reads the session periodically so transitions made by another worker
+still arrive, just later.
+
+MediaCompletions is the server-side counterpart: work that depends on a
+generation finishing (a scene's video after its image) awaits a future
+that ImageService resolves when the generation settles, instead of
+re-checking the Image's status on a timer.
+"""
+
+import asyncio
+import logging
+from typing import Callable
+
+from app.models import Image, ImageStatus
+
+logger = logging.getLogger(__name__)
+
+# Picture book extra image kinds, by index
+EXTRA_IMAGE_TYPES = ("close-up", "wide-shot")
+
+
+def image_event(scene_id: str, image: Image) -> dict:
+    """Build the "image" event payload for a scene's main image."""
+    return {
+        "scene_id": scene_id,
+        "status": image.status.value,
+        "url": image.url if image.status == ImageStatus.COMPLETE else None,
+    }
+
+
+def extra_image_event(scene_id: str, index: int, image: Image) -> dict:
+    """Build the "extra_image" event payload for a picture book image."""
+    return {
+        "scene_id": scene_id,
+        "index": index,
+        "status": image.status.value,
+        "url": image.url if image.status == ImageStatus.COMPLETE else None,
+        "type": EXTRA_IMAGE_TYPES[min(index, len(EXTRA_IMAGE_TYPES) - 1)],
+    }
+
+
+def video_event(scene_id: str, image: Image) -> dict:
+    """Build the "video" event payload for a scene's video clip."""
+    return {
+        "scene_id": scene_id,
+        "status": image.video_status,
+        "url": image.video_url if image.video_status == "complete" else None,
+    }
+
+
+class MediaEvents:
+    def __init__(self):
+        # queue -> predicate(event, data) selecting the events it receives
+        self._subscribers: dict[asyncio.Queue, Callable[[str, dict], bool]] = {}
+
+    def subscribe(self, match: Callable[[str, dict], bool]) -> asyncio.Queue:
+        """Return a queue that receives (event, data) for every matching event."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[queue] = match
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.pop(queue, None)
+
+    def publish(self, event: str, data: dict) -> None:
+        for queue, match in list(self._subscribers.items()):
+            try:
+                if match(event, data):
+                    queue.put_nowait((event, data))
+            except Exception as e:
+                logger.warning(f"Media event subscriber failed on {event}: {e}")
+
+    def publish_image(self, scene_id: str, image: Image) -> None:
+        self.publish("image", image_event(scene_id, image))
+
+    def publish_extra_image(self, scene_id: str, index: int, image: Image) -> None:
+        self.publish("extra_image", extra_image_event(scene_id, index, image))
+
+    def publish_video(self, scene_id: str, image: Image) -> None:
+        self.publish("video", video_event(scene_id, image))
+
+    def publish_cover_art(self, story_id: str, status: str, url: str | None = None) -> None:
+        self.publish("cover_art", {"story_id": story_id, "status": status, "url": url})
+
+
+class MediaCompletions:
+    """Futures for in-flight generations, keyed by (kind, key).
+
+    kind is "image", "extra_images" or "video" and key is the scene id.
+    Only waiters create futures, so a generation nobody waits on costs
+    nothing. Callers check the Image's status before waiting; there is no
+    await between that check and wait() registering its future, so a
+    completion cannot slip in between.
+    """
+
+    def __init__(self):
+        # (kind, key) -> (future, number of waiters)
+        self._futures: dict[tuple[str, str], tuple[asyncio.Future, int]] = {}
+
+    async def wait(self, kind: str, key: str, timeout: float | None = None) -> str:
+        """Wait for the generation to settle and return its final status.
+
+        Raises asyncio.TimeoutError if it has not settled within timeout.
+        """
+        entry = self._futures.get((kind, key))
+        if entry is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[(kind, key)] = (future, 1)
+        else:
+            future = entry[0]
+            self._futures[(kind, key)] = (future, entry[1] + 1)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            entry = self._futures.get((kind, key))
+            if entry and entry[0] is future and not future.done():
+                if entry[1] <= 1:
+                    del self._futures[(kind, key)]
+                else:
+                    self._futures[(kind, key)] = (future, entry[1] - 1)
+
+    def resolve(self, kind: str, key: str, status: str) -> None:
+        """Wake everything waiting on this generation with its final status."""
+        entry = self._futures.pop((kind, key), None)
+        if entry and not entry[0].done():
+            entry[0].set_result(status)
+
+
+media_events = MediaEvents()
+media_completions = MediaCompletions()
@@ -1,4 +1,3 @@
-import json
 import logging
 import shutil
 from datetime import datetime
@@ -8,6 +7,8 @@ from pathlib import Path
 from PIL import Image as PILImage
 
 from app.models import Profile, Character
+from app.services import codec
+from app.services.io_pool import AsyncMethods
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +24,16 @@ class ProfileService:
     def __init__(self):
         PROFILES_DIR.mkdir(parents=True, exist_ok=True)
         PHOTOS_DIR.mkdir(parents=True, exist_ok=True)
+        self.aio = AsyncMethods(self)
 
     def _tier_dir(self, tier: str) -> Path:
         d = PROFILES_DIR / tier
         d.mkdir(parents=True, exist_ok=True)
         return d
 
+    def profile_path(self, tier: str, profile_id: str) -> Path:
+        return self._tier_dir(tier) / f"{profile_id}.json"
+
     def _photo_dir(self, tier: str, profile_id: str) -> Path:
         d = PHOTOS_DIR / tier / profile_id
         d.mkdir(parents=True, exist_ok=True)
@@ -58,12 +63,11 @@ class ProfileService:
 
     def get_profile(self, tier: str, profile_id: str) -> Profile | None:
         """Load a single profile by ID."""
-        filepath = self._tier_dir(tier) / f"{profile_id}.json"
+        filepath = self.profile_path(tier, profile_id)
         if not filepath.exists():
             return None
         try:
-            data = json.loads(filepath.read_text(encoding="utf-8"))
-            return Profile.model_validate(data)
+            return codec.read_model(filepath, Profile)
         except Exception as e:
             logger.warning(f"Failed to load profile {profile_id}: {e}")
             return None
@@ -74,8 +78,7 @@ class ProfileService:
         tier_dir = self._tier_dir(tier)
         for filepath in tier_dir.glob("*.json"):
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                profiles.append(Profile.model_validate(data))
+                profiles.append(codec.read_model(filepath, Profile))
             except Exception as e:
                 logger.warning(f"Skipping corrupted profile {filepath}: {e}")
         profiles.sort(key=lambda p: p.name.lower())
@@ -107,7 +110,7 @@ class ProfileService:
 
     def delete_profile(self, tier: str, profile_id: str) -> bool:
         """Delete a profile, its photos, and clean up cross-references."""
-        filepath = self._tier_dir(tier) / f"{profile_id}.json"
+        filepath = self.profile_path(tier, profile_id)
         if not filepath.exists():
             return False
         try:
@@ -404,11 +407,8 @@ class ProfileService:
 
     def _save_profile(self, profile: Profile) -> None:
         """Write a profile to disk."""
-        filepath = self._tier_dir(profile.tier) / f"{profile.profile_id}.json"
+        filepath = self.profile_path(profile.tier, profile.profile_id)
         try:
-            filepath.write_text(
-                profile.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            codec.write_model(filepath, profile)
         except Exception as e:
             logger.error(f"Failed to save profile {profile.profile_id}: {e}")
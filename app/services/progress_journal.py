@@ -0,0 +1,340 @@
+"""Append-only journal for in-progress story saves.
+
+Progress used to be saved by rewriting data/progress/{tier}.json in full
+after every choice, navigation and image update, so the bytes written per
+save grew with the story. Now each save appends one JSON line to
+{tier}.journal holding only what changed since the last save: the story
+header if it changed, changed or removed scenes, path steps added or
+removed, the error message and changed recap entries. After COMPACT_AFTER_ENTRIES appends,
+the session is folded back into a fresh {tier}.json snapshot and the
+journal starts over.
+
+Snapshots are written in the storage codec (see codec.py); journal lines
+are always JSON. Snapshots are written to a temp file and renamed into place, so a crash
+mid-write leaves the previous snapshot intact. The journal's first line
+names the snapshot it applies to (a hash of its bytes). A journal left
+over from an interrupted compaction is therefore ignored rather than
+replayed onto the wrong snapshot. A torn final line from a crash
+mid-append is dropped.
+
+Several worker processes (and session spills) may save the same progress
+file. Each save holds an flock on {tier}.lock and checks that the journal
+on disk is still the one this process last wrote or read, by its header
+and size. If another process has written since, the diff is taken against
+the replayed file instead of this process's own copy, so entries always
+apply to the state they were computed from.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.models import StorySession
+from app.services import codec
+from app.services.codec import atomic_write
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+
+# Fold the journal into a new snapshot after this many appended entries
+COMPACT_AFTER_ENTRIES = 50
+
+
+def journal_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(JOURNAL_SUFFIX)
+
+
+def _snapshot_id(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+@dataclass
+class _Persisted:
+    """What is on disk for one progress file, as of the last save."""
+
+    story_id: str
+    story: str
+    scenes: dict[str, str]
+    path_history: list[str]
+    error_message: str | None
+    recap_cache: dict[str, str]
+    entries: int = field(default=0)
+    # scene_id -> _scene_key() of the scene serialized in scenes
+    scene_keys: dict[str, tuple] = field(default_factory=dict)
+    # Journal header (snapshot id) and size on disk after the last save or load
+    journal_header: str | None = None
+    journal_size: int = 0
+
+
+def _scene_key(scene) -> tuple:
+    """Every field of a scene, nested models included, for cheap change detection."""
+    return (
+        tuple(value for name, value in scene.__dict__.items() if name not in ("image", "extra_images", "choices")),
+        tuple(scene.image.__dict__.values()),
+        tuple(tuple(image.__dict__.values()) for image in scene.extra_images),
+        tuple(tuple(choice.__dict__.values()) for choice in scene.choices),
+    )
+
+
+def _capture(session: StorySession, entries: int = 0, base: _Persisted | None = None) -> _Persisted:
+    """Serialize session for diffing.
+
+    Scenes whose fields are unchanged since base reuse base's JSON, so a
+    save only serializes the scenes that changed.
+    """
+    scenes, scene_keys = {}, {}
+    for sid, scene in session.scenes.items():
+        key = _scene_key(scene)
+        if base is not None and base.scene_keys.get(sid) == key:
+            scenes[sid] = base.scenes[sid]
+        else:
+            scenes[sid] = scene.model_dump_json()
+        scene_keys[sid] = key
+    return _Persisted(
+        story_id=session.story.story_id,
+        story=session.story.model_dump_json(),
+        scenes=scenes,
+        path_history=list(session.path_history),
+        error_message=session.error_message,
+        recap_cache=dict(session.recap_cache),
+        entries=entries,
+        scene_keys=scene_keys,
+    )
+
+
+def _diff(before: _Persisted, after: _Persisted) -> dict:
+    """Return the journal entry turning before into after ({} if unchanged)."""
+    entry: dict = {}
+    if after.story != before.story:
+        entry["story"] = json.loads(after.story)
+    changed = {
+        sid: json.loads(data) for sid, data in after.scenes.items()
+        if before.scenes.get(sid) != data
+    }
+    if changed:
+        entry["scenes"] = changed
+    removed = [sid for sid in before.scenes if sid not in after.scenes]
+    if removed:
+        entry["removed_scenes"] = removed
+    old_path, new_path = before.path_history, after.path_history
+    if new_path != old_path:
+        # Choices and "back" only extend or trim the path; avoid rewriting it
+        if new_path[:len(old_path)] == old_path:
+            entry["path_append"] = new_path[len(old_path):]
+        elif old_path[:len(new_path)] == new_path:
+            entry["path_truncate"] = len(new_path)
+        else:
+            entry["path_history"] = new_path
+    if after.error_message != before.error_message:
+        entry["error_message"] = after.error_message
+    recaps = {
+        key: value for key, value in after.recap_cache.items()
+        if before.recap_cache.get(key) != value
+    }
+    recaps.update({key: None for key in before.recap_cache if key not in after.recap_cache})
+    if recaps:
+        entry["recap_cache"] = recaps
+    return entry
+
+
+def _apply(data: dict, entry: dict) -> None:
+    """Apply one journal entry to a raw StorySession dict."""
+    if "story" in entry:
+        data["story"] = entry["story"]
+    scenes = data.setdefault("scenes", {})
+    scenes.update(entry.get("scenes", {}))
+    for sid in entry.get("removed_scenes", []):
+        scenes.pop(sid, None)
+    if "path_history" in entry:
+        data["path_history"] = entry["path_history"]
+    if "path_append" in entry:
+        data.setdefault("path_history", []).extend(entry["path_append"])
+    if "path_truncate" in entry:
+        del data.setdefault("path_history", [])[entry["path_truncate"]:]
+    if "error_message" in entry:
+        data["error_message"] = entry["error_message"]
+    recap_cache = data.setdefault("recap_cache", {})
+    for key, value in entry.get("recap_cache", {}).items():
+        if value is None:
+            recap_cache.pop(key, None)
+        else:
+            recap_cache[key] = value
+
+
+def _replay(snapshot_path: Path) -> tuple[dict, int | None]:
+    """Read the snapshot and apply its journal.
+
+    Returns (raw session, entries applied), with None for entries when the
+    journal is missing, torn or belongs to another snapshot. Raises if the
+    snapshot itself is missing or unreadable.
+    """
+    raw = snapshot_path.read_bytes()
+    data = codec.loads(raw)
+    journal = journal_path(snapshot_path)
+    if not journal.exists():
+        return data, None
+
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    try:
+        header = json.loads(lines[0]) if lines else {}
+    except ValueError:
+        header = {}
+    if header.get("snapshot") != _snapshot_id(raw):
+        # Left over from a compaction that did not finish; the snapshot has it all
+        return data, None
+
+    applied = 0
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # Torn by a crash mid-append; later appends would land on the
+            # same line, so report no usable journal and compact next save
+            logger.warning(f"Dropping torn entry at the end of {journal.name}")
+            return data, None
+        _apply(data, entry)
+        applied += 1
+    return data, applied
+
+
+def read_progress(snapshot_path: Path) -> StorySession:
+    """Load a progress save with its journal applied, without tracking it for writes."""
+    data, _ = _replay(snapshot_path)
+    return StorySession.model_validate(data)
+
+
+def _journal_state(snapshot_path: Path) -> tuple[str | None, int]:
+    """Return the journal's header snapshot id and size, or (None, 0) if absent."""
+    try:
+        with journal_path(snapshot_path).open("rb") as f:
+            first = f.readline()
+            size = f.seek(0, 2)
+    except FileNotFoundError:
+        return None, 0
+    try:
+        return json.loads(first).get("snapshot"), size
+    except (ValueError, AttributeError):
+        return None, size
+
+
+class _FileLock:
+    """Exclusive flock on a progress file's lock file, across processes."""
+
+    def __init__(self, snapshot_path: Path):
+        self.path = snapshot_path.with_suffix(LOCK_SUFFIX)
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a")
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+
+
+def _write_snapshot(snapshot_path: Path, session: StorySession) -> tuple[str, int, int]:
+    """Write session as a new snapshot with an empty journal.
+
+    Returns the snapshot id, the snapshot's size and the journal's size.
+    """
+    data = codec.dump_model(session)
+    atomic_write(snapshot_path, data)
+    snapshot_id = _snapshot_id(data)
+    header = (json.dumps({"snapshot": snapshot_id}) + "\n").encode("utf-8")
+    atomic_write(journal_path(snapshot_path), header)
+    return snapshot_id, len(data), len(header)
+
+
+def rewrite_progress(snapshot_path: Path, dry_run: bool = False) -> int:
+    """Fold a progress save's journal into a fresh snapshot in the current codec.
+
+    Used by the codec migration while the app is stopped. Returns the size
+    the snapshot and journal take afterwards.
+    """
+    session = read_progress(snapshot_path)
+    if dry_run:
+        return len(codec.dump_model(session))
+    _, snapshot_size, journal_size = _write_snapshot(snapshot_path, session)
+    return snapshot_size + journal_size
+
+
+class ProgressJournal:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # snapshot path -> state last written (or read) by this process
+        self._persisted: dict[Path, _Persisted] = {}
+
+    def save(self, snapshot_path: Path, session: StorySession) -> None:
+        """Append what changed since the last save, compacting when due."""
+        with self._lock, _FileLock(snapshot_path):
+            before = self._persisted.get(snapshot_path)
+            header, size = _journal_state(snapshot_path)
+            if before is not None and (header, size) != (before.journal_header, before.journal_size):
+                # Another process wrote since: diff against what is on disk now
+                before = self._reload(snapshot_path, before)
+            current = _capture(session, base=before)
+            if (
+                before is None
+                or header is None
+                or before.story_id != current.story_id
+                or before.entries >= COMPACT_AFTER_ENTRIES
+                or not snapshot_path.exists()
+            ):
+                self._compact(snapshot_path, session, current)
+                return
+
+            entry = _diff(before, current)
+            if not entry:
+                return
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            with journal_path(snapshot_path).open("ab") as f:
+                f.write(line)
+            current.entries = before.entries + 1
+            current.journal_header, current.journal_size = header, size + len(line)
+            self._persisted[snapshot_path] = current
+
+    def _reload(self, snapshot_path: Path, stale: _Persisted) -> _Persisted | None:
+        """Capture the progress file as it is on disk; None if it can only be compacted."""
+        try:
+            data, applied = _replay(snapshot_path)
+            on_disk = StorySession.model_validate(data)
+        except Exception as e:
+            logger.warning(f"Could not replay {snapshot_path.name} written by another process: {e}")
+            return None
+        if applied is None:
+            return None
+        persisted = _capture(on_disk, entries=applied, base=stale)
+        persisted.journal_header, persisted.journal_size = _journal_state(snapshot_path)
+        return persisted
+
+    def _compact(self, snapshot_path: Path, session: StorySession, current: _Persisted) -> None:
+        current.journal_header, _, current.journal_size = _write_snapshot(snapshot_path, session)
+        current.entries = 0
+        self._persisted[snapshot_path] = current
+
+    def load(self, snapshot_path: Path) -> StorySession:
+        """Load a progress save and remember it as the base for later appends."""
+        with self._lock, _FileLock(snapshot_path):
+            data, applied = _replay(snapshot_path)
+            session = StorySession.model_validate(data)
+            # Without a journal matching the snapshot, the next save compacts
+            persisted = _capture(
+                session, entries=COMPACT_AFTER_ENTRIES if applied is None else applied,
+            )
+            persisted.journal_header, persisted.journal_size = _journal_state(snapshot_path)
+            self._persisted[snapshot_path] = persisted
+        return session
+
+    def delete(self, snapshot_path: Path) -> None:
+        with self._lock, _FileLock(snapshot_path):
+            self._persisted.pop(snapshot_path, None)
+            journal_path(snapshot_path).unlink(missing_ok=True)
+            snapshot_path.unlink(missing_ok=True)
@@ -0,0 +1,113 @@
+"""Compiled prompt context for continuing a story.
+
+Every choice used to rebuild the scene's content guidelines and image
+style from scratch: reload the profile and each roster character from
+disk, re-run the story flavor prompt and concatenate it all again, then
+load the same characters once more for reference photos. None of that
+changes between choices, so it is now compiled once per story and kept
+here until something it was built from changes:
+
+- the story fields it reads (profile, art style, flavor options,
+  characters, bedtime mode), compared on every lookup; or
+- any profile or character file it read, detected by mtime. Profile and
+  roster files are written with an atomic rename, so any edit, from this
+  process or another, gives the file a new mtime.
+
+Lookups stat those files instead of reading and validating them.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.models import Story
+
+# Compiled contexts kept, least recently used dropped first
+MAX_ENTRIES = 512
+
+
+def story_key(story: Story) -> tuple:
+    """The story fields a compiled context depends on."""
+    return (
+        story.profile_id,
+        story.art_style,
+        story.protagonist_gender,
+        story.protagonist_age,
+        story.character_type,
+        story.num_characters,
+        story.writing_style,
+        story.conflict_type,
+        story.character_name,
+        story.character_description,
+        tuple(story.roster_character_ids),
+        story.bedtime_mode,
+    )
+
+
+def file_versions(paths: list[Path]) -> dict[Path, int]:
+    """Return each path's mtime in nanoseconds, or -1 if it does not exist."""
+    versions = {}
+    for path in paths:
+        try:
+            versions[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            versions[path] = -1
+    return versions
+
+
+@dataclass
+class PromptContext:
+    """Story-level generation inputs that stay the same from scene to scene."""
+
+    content_guidelines: str
+    image_style: str
+    # Reference photos of the story's roster characters, absolute paths
+    roster_photo_paths: list[str]
+    key: tuple = ()
+    # Profile and character files read while compiling -> their mtime then
+    sources: dict[Path, int] = field(default_factory=dict)
+
+
+class PromptContextCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # story_id -> compiled context
+        self._entries: OrderedDict[str, PromptContext] = OrderedDict()
+
+    def get(self, story: Story) -> PromptContext | None:
+        """Return story's compiled context if it is still current.
+
+        Stats the context's source files, so call it off the event loop.
+        """
+        with self._lock:
+            context = self._entries.get(story.story_id)
+            if context is None:
+                return None
+            self._entries.move_to_end(story.story_id)
+        if context.key != story_key(story) or file_versions(list(context.sources)) != context.sources:
+            self.invalidate(story.story_id)
+            return None
+        return context
+
+    def put(self, story: Story, context: PromptContext) -> None:
+        """Store a context compiled from story.
+
+        context.sources should hold each file's version from before it was
+        read, so an edit landing mid-compile still invalidates the result.
+        """
+        context.key = story_key(story)
+        with self._lock:
+            self._entries[story.story_id] = context
+            self._entries.move_to_end(story.story_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, story_id: str) -> None:
+        with self._lock:
+            self._entries.pop(story_id, None)
+
+
+prompt_contexts = PromptContextCache()
@@ -0,0 +1,301 @@
+"""Routes text generation between LLM providers based on their recent health.
+
+Each _call_* in StoryService used to retry its own provider three times
+with 1 s / 2 s sleeps, so a degraded provider kept readers waiting up to
+a minute before the error page. Calls now go through provider_router:
+
+- Rolling stats: the last WINDOW calls per provider, with latency
+  percentiles and error rate (shown on the admin page).
+- Circuit breaker: PROVIDER_BREAKER_FAILURES consecutive failures open a
+  provider's breaker. Its calls go straight to a fallback for
+  PROVIDER_BREAKER_COOLDOWN seconds, then a single probe call is let
+  through, which closes the breaker on success or reopens it on failure.
+  The probe is claimed right before the call is sent (claim()), so of the
+  requests planned during the cooldown only one gets to be it, and only
+  that call's outcome or cancellation ends the half-open state.
+- Failover: a failed call moves on to the next configured provider in
+  PROVIDER_FALLBACKS on a different upstream (gpt and gpt5 share one)
+  instead of retrying. With nowhere to fail over to, the provider is
+  retried with backoff as before.
+- Hedging (PROVIDER_HEDGING, off by default): a scene call still running
+  after the provider's p95 latency gets a duplicate sent to the first
+  fallback, and whichever answers first wins. This trades extra spend on
+  the slowest calls for tail latency.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from app.config import settings
+from app.models_registry import get_available_models, get_provider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Calls per provider the rolling stats cover
+WINDOW = 100
+
+# Successful calls needed before a provider's p95 is trusted for hedging
+HEDGE_MIN_SAMPLES = 20
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ProviderHealth:
+    """Rolling call stats and circuit breaker state for one provider."""
+
+    def __init__(self):
+        # (latency seconds, succeeded) for the last WINDOW calls
+        self.samples: deque[tuple[float, bool]] = deque(maxlen=WINDOW)
+        self.consecutive_failures = 0
+        # When the breaker opened; None while closed
+        self.opened_at: float | None = None
+        self.probing = False
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be sent: breaker closed, or cooled down and not already probing."""
+        if self.opened_at is None:
+            return True
+        return not self.probing and time.monotonic() - self.opened_at >= settings.provider_breaker_cooldown
+
+    def begin(self) -> bool:
+        """Mark a call as sent; returns True if it is the probe of an open breaker."""
+        if self.opened_at is None or self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def release(self, probe: bool) -> None:
+        """End a call that was cancelled before it had an outcome."""
+        if probe:
+            self.probing = False
+
+    def record(self, latency: float, ok: bool, probe: bool = False) -> bool:
+        """Record a call; returns True if it opened the breaker.
+
+        Only the probe ends the half-open state: a call sent before the
+        breaker opened may finish while the probe is still in flight.
+        """
+        self.samples.append((latency, ok))
+        self.release(probe)
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return False
+        self.consecutive_failures += 1
+        if self.opened_at is not None or self.consecutive_failures >= settings.provider_breaker_failures:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def latencies(self) -> list[float]:
+        return [latency for latency, ok in self.samples if ok]
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.probing else "open"
+
+
+class ProviderRouter:
+    def __init__(self):
+        self._health: dict[str, ProviderHealth] = {}
+
+    def health(self, provider: str) -> ProviderHealth:
+        if provider not in self._health:
+            self._health[provider] = ProviderHealth()
+        return self._health[provider]
+
+    def record(self, provider: str, latency: float, ok: bool, probe: bool = False) -> None:
+        if self.health(provider).record(latency, ok, probe):
+            logger.warning(
+                f"Circuit breaker open for {provider} after "
+                f"{self.health(provider).consecutive_failures} consecutive failures"
+            )
+
+    def fallbacks(self, model: str) -> list[str]:
+        """Configured providers to fail over to from model, in PROVIDER_FALLBACKS order."""
+        if not settings.provider_failover:
+            return []
+        primary = get_provider(model)
+        upstream = primary.api_key_env if primary else None
+        available = {p.key: p for p in get_available_models()}
+        return [
+            key for key in settings.provider_fallbacks
+            if key in available and key != model and available[key].api_key_env != upstream
+        ]
+
+    def claim(self, provider: str, plan: list[str]) -> bool | None:
+        """Take a call slot on provider right before sending, per plan.
+
+        Re-checks the breaker, since another request may have become the
+        half-open probe after this one was planned. A plan with no other
+        provider always goes through, as in plan(). Returns None if the
+        call may not be sent, else whether it is the probe; pass that on
+        to record() or ProviderHealth.release().
+        """
+        health = self.health(provider)
+        if not health.allow() and any(key != provider for key in plan):
+            return None
+        return health.begin()
+
+    def plan(self, model: str, max_retries: int = 3) -> list[str]:
+        """Providers to try for model, in order.
+
+        The model itself comes first unless its breaker is open, then
+        fallbacks whose breakers allow a call. With no fallback, the model
+        is retried max_retries times even if its breaker is open.
+        """
+        candidates = [model, *self.fallbacks(model)]
+        allowed = [key for key in candidates if self.health(key).allow()]
+        if len(allowed) > 1:
+            return allowed
+        return (allowed or [model]) * max_retries
+
+    def hedge_delay(self, provider: str) -> float | None:
+        """Seconds to wait on provider before hedging, or None if too few samples."""
+        latencies = self.health(provider).latencies()
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.provider_hedge_min_delay, _percentile(latencies, 0.95))
+
+    async def _timed(
+        self, provider: str, invoke: Callable[[str], Awaitable[T]], probe: bool,
+    ) -> T:
+        """Run invoke(provider), already claimed, and record the outcome."""
+        start = time.monotonic()
+        try:
+            result = await invoke(provider)
+        except asyncio.CancelledError:
+            # The losing side of a hedge, or the reader left; not the provider's fault
+            self.health(provider).release(probe)
+            raise
+        except Exception:
+            self.record(provider, time.monotonic() - start, ok=False, probe=probe)
+            raise
+        self.record(provider, time.monotonic() - start, ok=True, probe=probe)
+        return result
+
+    def _spawn(
+        self, provider: str, invoke: Callable[[str], Awaitable[T]], probe: bool,
+    ) -> asyncio.Task:
+        """Run a claimed call as a task.
+
+        A task cancelled before it starts never reaches _timed's handler,
+        so the probe claim is released from a done callback as well.
+        """
+        task = asyncio.create_task(self._timed(provider, invoke, probe))
+
+        def _release(done: asyncio.Task) -> None:
+            if done.cancelled():
+                self.health(provider).release(probe)
+
+        task.add_done_callback(_release)
+        return task
+
+    async def _race(
+        self, first: asyncio.Task, primary: str, secondary: str,
+        invoke: Callable[[str], Awaitable[T]], probe: bool,
+    ) -> T:
+        """Send a hedge to secondary (already claimed) and return whichever of the two succeeds first."""
+        self.health(primary).hedges += 1
+        second = self._spawn(secondary, invoke, probe)
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.health(primary).hedge_wins += 1
+                        return task.result()
+            raise first.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self,
+        model: str,
+        invoke: Callable[[str], Awaitable[T]],
+        hedge: bool = False,
+        max_retries: int = 3,
+    ) -> T:
+        """Call invoke(provider) for model, failing over and hedging as configured."""
+        plan = self.plan(model, max_retries)
+        last_error = None
+        attempt = 0
+        while attempt < len(plan):
+            provider = plan[attempt]
+            attempt += 1
+            next_provider = plan[attempt] if attempt < len(plan) else None
+            delay = self.hedge_delay(provider) if hedge and settings.provider_hedging else None
+            probe = self.claim(provider, plan)
+            if probe is None:
+                last_error = RuntimeError(f"{provider} circuit breaker is open")
+                continue
+            try:
+                if delay is None or next_provider in (None, provider):
+                    return await self._timed(provider, invoke, probe)
+                first = self._spawn(provider, invoke, probe)
+                try:
+                    done, _ = await asyncio.wait({first}, timeout=delay)
+                except asyncio.CancelledError:
+                    first.cancel()
+                    raise
+                if done:
+                    return first.result()
+                hedge_probe = self.claim(next_provider, plan)
+                if hedge_probe is None:
+                    return await first
+                logger.info(f"{provider} slower than {delay:.1f}s, hedging with {next_provider}")
+                attempt += 1
+                return await self._race(first, provider, next_provider, invoke, hedge_probe)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"{provider} call for {model} failed: {e}")
+                if attempt < len(plan) and plan[attempt] == provider:
+                    await asyncio.sleep(2 ** (attempt - 1))
+
+        raise RuntimeError(
+            f"{model} generation failed on {', '.join(dict.fromkeys(plan))}: {last_error}"
+        )
+
+    def get_stats(self) -> dict:
+        """Return per-provider health for the admin page."""
+        providers = {}
+        keys = [p.key for p in get_available_models()]
+        keys += [key for key in self._health if key not in keys]
+        for key in keys:
+            health = self.health(key)
+            latencies = health.latencies()
+            calls = len(health.samples)
+            errors = sum(1 for _, ok in health.samples if not ok)
+            providers[key] = {
+                "state": health.state,
+                "calls": calls,
+                "error_rate": errors / calls if calls else 0.0,
+                "p50": _percentile(latencies, 0.5) if latencies else None,
+                "p95": _percentile(latencies, 0.95) if latencies else None,
+                "consecutive_failures": health.consecutive_failures,
+                "hedges": health.hedges,
+                "hedge_wins": health.hedge_wins,
+            }
+        return {
+            "failover": settings.provider_failover,
+            "hedging": settings.provider_hedging,
+            "providers": providers,
+        }
+
+
+provider_router = ProviderRouter()
@@ -0,0 +1,206 @@
+"""Speculative pre-generation of the next scene for each choice.
+
+While a reader is on a scene, candidate continuations for its unexplored
+choices are generated in the background. Picking a choice whose candidate
+is ready commits it without waiting for the LLM; the candidates for the
+other choices are discarded. Only scene text is speculated — images and
+video are still generated after the choice is committed.
+
+Speculation is bounded by a global and a per-tier concurrency cap and by
+an hourly token budget (estimated from prompt/response size), and keeps
+hit/miss and wasted-token counters for the admin dashboard.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio used for budget accounting
+CHARS_PER_TOKEN = 4
+
+BUDGET_WINDOW_SECONDS = 3600
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the token count of some text without a tokenizer."""
+    return sum(len(t) for t in texts if t) // CHARS_PER_TOKEN
+
+
+def _scene_data_tokens(scene_data: dict) -> int:
+    return estimate_tokens(
+        scene_data.get("content", ""),
+        scene_data.get("image_prompt", ""),
+        *(c.get("text", "") for c in scene_data.get("choices", [])),
+    )
+
+
+@dataclass
+class _Candidate:
+    task: asyncio.Task
+    input_tokens: int
+    output_tokens: int = 0
+
+
+@dataclass
+class _SessionSpeculation:
+    scene_id: str
+    candidates: dict[str, _Candidate] = field(default_factory=dict)
+
+
+class SpeculationService:
+    def __init__(self):
+        # session_id -> speculation for that session's current scene
+        self._sessions: dict[str, _SessionSpeculation] = {}
+        self._global_semaphore: asyncio.Semaphore | None = None
+        self._tier_semaphores: dict[str, asyncio.Semaphore] = {}
+        # (timestamp, tokens) spent inside the rolling budget window
+        self._spent: list[tuple[float, int]] = []
+        self.stats = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "skipped_budget": 0,
+            "failed": 0,
+            "tokens_used": 0,
+            "tokens_wasted": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return settings.speculative_generation
+
+    def _semaphores(self, tier: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(settings.speculation_max_concurrency)
+        if tier not in self._tier_semaphores:
+            self._tier_semaphores[tier] = asyncio.Semaphore(settings.speculation_max_per_tier)
+        return self._global_semaphore, self._tier_semaphores[tier]
+
+    def _budget_remaining(self) -> int:
+        cutoff = time.time() - BUDGET_WINDOW_SECONDS
+        self._spent = [(ts, n) for ts, n in self._spent if ts >= cutoff]
+        return settings.speculation_token_budget - sum(n for _, n in self._spent)
+
+    def speculate(
+        self,
+        session_id: str,
+        tier: str,
+        scene_id: str,
+        choices: dict[str, dict],
+        generate: Callable[..., Awaitable[dict]],
+    ) -> None:
+        """Start generating candidates for scene_id's choices.
+
+        choices maps choice_id -> generate() keyword arguments. Candidates
+        for any other scene of this session are discarded first.
+        """
+        current = self._sessions.get(session_id)
+        if current and current.scene_id == scene_id:
+            return
+        self.discard(session_id)
+        if not choices:
+            return
+
+        speculation = _SessionSpeculation(scene_id=scene_id)
+        self._sessions[session_id] = speculation
+        for choice_id, kwargs in choices.items():
+            input_tokens = estimate_tokens(
+                kwargs.get("content_guidelines", ""),
+                kwargs.get("context_summary", ""),
+                *(s.content for s in kwargs.get("context_scenes", [])[kwargs.get("summarized_scenes", 0):]),
+            )
+            if self._budget_remaining() < input_tokens:
+                self.stats["skipped_budget"] += 1
+                continue
+            # Reserve the input estimate now so parallel candidates share the budget
+            self._spent.append((time.time(), input_tokens))
+            task = asyncio.create_task(self._run(tier, generate, kwargs))
+            speculation.candidates[choice_id] = _Candidate(task=task, input_tokens=input_tokens)
+            self.stats["started"] += 1
+            task.add_done_callback(
+                lambda t, sid=session_id, cid=choice_id: self._on_done(sid, cid, t)
+            )
+
+    async def _run(self, tier: str, generate, kwargs: dict) -> dict:
+        global_sem, tier_sem = self._semaphores(tier)
+        async with global_sem, tier_sem:
+            return await generate(**kwargs)
+
+    def _on_done(self, session_id: str, choice_id: str, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception():
+            self.stats["failed"] += 1
+            logger.warning(f"Speculative generation failed for choice {choice_id}: {task.exception()}")
+            return
+        output_tokens = _scene_data_tokens(task.result())
+        self._spent.append((time.time(), output_tokens))
+        speculation = self._sessions.get(session_id)
+        candidate = speculation.candidates.get(choice_id) if speculation else None
+        if candidate and candidate.task is task:
+            candidate.output_tokens = output_tokens
+
+    async def take(self, session_id: str, scene_id: str, choice_id: str) -> dict | None:
+        """Return the speculated scene data for a choice, or None on a miss.
+
+        Waits for a candidate that is still generating — it started before
+        the click, so it finishes sooner than a fresh request. The other
+        candidates for the scene are discarded either way.
+        """
+        speculation = self._sessions.get(session_id)
+        candidate = None
+        if speculation and speculation.scene_id == scene_id:
+            candidate = speculation.candidates.pop(choice_id, None)
+        self.discard(session_id)
+
+        if candidate is None:
+            if self.enabled:
+                self.stats["misses"] += 1
+            return None
+        try:
+            scene_data = await asyncio.shield(candidate.task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["tokens_used"] += candidate.input_tokens + _scene_data_tokens(scene_data)
+        return scene_data
+
+    def discard(self, session_id: str) -> None:
+        """Cancel or drop every outstanding candidate for a session."""
+        speculation = self._sessions.pop(session_id, None)
+        if not speculation:
+            return
+        for candidate in speculation.candidates.values():
+            if candidate.task.done():
+                if not candidate.task.cancelled() and not candidate.task.exception():
+                    self.stats["tokens_wasted"] += candidate.input_tokens + candidate.output_tokens
+            else:
+                candidate.task.cancel()
+                # The provider may already be billing the prompt
+                self.stats["tokens_wasted"] += candidate.input_tokens
+
+    def get_stats(self) -> dict:
+        """Return counters plus derived hit rate and budget usage."""
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["in_flight"] = sum(
+            1 for s in self._sessions.values()
+            for c in s.candidates.values() if not c.task.done()
+        )
+        stats["budget"] = settings.speculation_token_budget
+        stats["budget_remaining"] = max(0, self._budget_remaining())
+        return stats
+
+
+speculation_service = SpeculationService()
@@ -1,13 +1,18 @@
 import json
 import asyncio
 import logging
+import re
+import time
+from typing import AsyncIterator
 
 from anthropic import AsyncAnthropic
-from openai import AsyncOpenAI
 from google import genai
 
 from app.config import settings
 from app.models import Scene, StoryLength
+from app.services.clients import get_openai_client, get_xai_client
+from app.services.provider_router import provider_router
+from app.services.token_usage import token_usage
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +22,7 @@ You are a master storyteller creating an interactive choose-your-own-adventure s
 RULES:
 1. Generate exactly ONE scene at a time.
 2. Each scene must have vivid, engaging narrative text (2-4 paragraphs).
-3. Non-ending scenes MUST have exactly {choice_count} distinct choices for the reader.
+3. Non-ending scenes MUST have exactly the number of distinct choices given in the STORY PACING instructions.
 4. Each choice should lead to meaningfully different story directions.
 5. Maintain narrative consistency with all prior scenes — characters, locations, and plot threads must remain coherent.
 6. The user's original prompt is your creative north star. Every scene must reflect:
@@ -33,43 +38,144 @@ RULES:
    - Describe the specific environment, weather, and atmosphere.
    - Do NOT include any text, words, letters, or writing in the image description.
 
-STORY PACING:
-- Story length: {story_length} ({target_depth} chapters total)
-- Current chapter: {current_depth} of {target_depth}
-- {pacing_instruction}
-{chapter_instruction}
-
 OUTPUT FORMAT (strict JSON, no markdown):
-{{
+{
   "title": "Scene title (short, evocative)",
   "content": "The narrative text for this scene. Multiple paragraphs separated by newlines.",
   "image_prompt": "Detailed visual description for AI image generation.",
-  "is_ending": false,{chapter_title_field}
+  "is_ending": false,
   "choices": [
-    {{"text": "Choice 1 description"}},
-    {{"text": "Choice 2 description"}},
-    {{"text": "Choice 3 description"}}
+    {"text": "Choice 1 description"},
+    {"text": "Choice 2 description"},
+    {"text": "Choice 3 description"}
   ]
-}}
+}
 
 For ending scenes, set is_ending to true and choices to an empty array [].
 Write a satisfying conclusion that wraps up the story thread.
 """
 
+# Per-scene instructions, sent after the transcript rather than in the
+# system prompt so the system prompt stays identical for a whole story
+# and can be served from the provider's prompt cache
+PACING_PROMPT = """\
+STORY PACING:
+- Story length: {story_length} ({target_depth} chapters total)
+- Current chapter: {current_depth} of {target_depth}
+- Choices for this scene: {choice_count}
+- {pacing_instruction}
+{chapter_instruction}"""
+
+
+# Length cap for the rolling context summary (see fold_summary)
+SUMMARY_MAX_WORDS = 400
+
+# Opening of the "content" string value in the scene JSON
+_CONTENT_START = re.compile(r'"content"\s*:\s*"')
+# A complete "image_prompt" string value
+_IMAGE_PROMPT = re.compile(r'"image_prompt"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def _text_block(text: str, cache: bool = False) -> dict:
+    """A message content block; cache=True makes it a Claude cache breakpoint."""
+    block = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def _content_text(content: str | list[dict]) -> str:
+    """Flatten message content blocks into the single string other providers take."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(block["text"] for block in content)
+
+
+def _plain_messages(messages: list[dict]) -> list[dict]:
+    return [{"role": m["role"], "content": _content_text(m["content"])} for m in messages]
+
+
+class SceneStreamParser:
+    """Incrementally extract fields from a scene's JSON while it streams in.
+
+    feed() returns the newly decoded part of the "content" string, so
+    narrative text can be shown before the JSON is complete. image_prompt
+    becomes available once its closing quote arrives. The accumulated text
+    is still parsed and validated by _parse_response() at the end.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.image_prompt: str | None = None
+        self._content_pos: int | None = None
+        self._content_done = False
+
+    def feed(self, delta: str) -> str:
+        self.text += delta
+        if self.image_prompt is None:
+            match = _IMAGE_PROMPT.search(self.text)
+            if match:
+                self.image_prompt = json.loads(match.group(1))
+        if self._content_done:
+            return ""
+        if self._content_pos is None:
+            match = _CONTENT_START.search(self.text)
+            if not match:
+                return ""
+            self._content_pos = match.end()
+        return self._decode_content()
+
+    def _decode_content(self) -> str:
+        """Decode the content string up to the end of the text received so far.
+
+        An escape sequence split across deltas is left for the next call.
+        """
+        text = self.text
+        pos = self._content_pos
+        out = []
+        while pos < len(text):
+            char = text[pos]
+            if char == '"':
+                self._content_done = True
+                pos += 1
+                break
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            if pos + 1 >= len(text):
+                break
+            length = 6 if text[pos + 1] == "u" else 2
+            # A high surrogate needs its low surrogate to decode
+            if length == 6 and text[pos + 2:pos + 4].lower() in ("d8", "d9", "da", "db"):
+                length = 12
+            if pos + length > len(text):
+                break
+            try:
+                out.append(json.loads(f'"{text[pos:pos + length]}"'))
+            except json.JSONDecodeError:
+                out.append(text[pos + 1:pos + length])
+            pos += length
+        self._content_pos = pos
+        return "".join(out)
+
 
 class StoryService:
     def __init__(self):
         self.claude_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self.grok_client = (
-            AsyncOpenAI(api_key=settings.xai_api_key, base_url="https://api.x.ai/v1")
-            if settings.xai_api_key else None
-        )
         self.gemini_client = (
             genai.Client(api_key=settings.gemini_api_key)
             if settings.gemini_api_key else None
         )
 
+    @property
+    def openai_client(self):
+        return get_openai_client()
+
+    @property
+    def grok_client(self):
+        return get_xai_client()
+
     async def generate_scene(
         self,
         prompt: str,
@@ -84,8 +190,112 @@ class StoryService:
         is_chapter_start: bool = False,
         chapter_number: int | None = None,
         total_chapters: int | None = None,
+        context_summary: str = "",
+        summarized_scenes: int = 0,
+        hedge: bool = False,
     ) -> dict:
-        """Generate a single scene using the specified AI provider."""
+        """Generate a single scene using the specified AI provider.
+
+        context_summary, when given, stands in for the first
+        summarized_scenes of context_scenes (see context_summary.py).
+        hedge lets a slow call be hedged to a fallback provider; only
+        requests a reader is waiting on should set it, not speculation.
+        """
+        system = self._build_system_prompt(content_guidelines)
+        instructions = self._build_pacing_instructions(
+            story_length, current_depth, target_depth,
+            is_chapter_start, chapter_number, total_chapters,
+        )
+
+        # Build conversation messages
+        messages = self._build_messages(
+            prompt, context_scenes, choice_text, instructions,
+            context_summary, summarized_scenes,
+        )
+
+        # Call the selected provider, hedging a slow call if enabled
+        response_text = await self._call_provider(model, system, messages, hedge=hedge)
+
+        # Parse JSON response
+        data = self._parse_response(response_text)
+
+        # Append tier-specific image style to the image prompt
+        if image_style and data.get("image_prompt"):
+            data["image_prompt"] = data["image_prompt"] + ", " + image_style
+
+        return data
+
+    async def stream_scene(
+        self,
+        prompt: str,
+        story_length: StoryLength,
+        context_scenes: list[Scene],
+        current_depth: int,
+        target_depth: int,
+        choice_text: str | None = None,
+        content_guidelines: str = "",
+        image_style: str = "",
+        model: str = "claude",
+        is_chapter_start: bool = False,
+        chapter_number: int | None = None,
+        total_chapters: int | None = None,
+        context_summary: str = "",
+        summarized_scenes: int = 0,
+    ) -> AsyncIterator[tuple[str, object]]:
+        """Generate a scene like generate_scene(), yielding progress as it streams.
+
+        Yields ("content", text) for each new piece of narrative text,
+        ("image_prompt", prompt) as soon as the image prompt is complete
+        (with image_style applied), and finally ("scene", data) with the
+        parsed and validated scene dict.
+        """
+        system = self._build_system_prompt(content_guidelines)
+        instructions = self._build_pacing_instructions(
+            story_length, current_depth, target_depth,
+            is_chapter_start, chapter_number, total_chapters,
+        )
+        messages = self._build_messages(
+            prompt, context_scenes, choice_text, instructions,
+            context_summary, summarized_scenes,
+        )
+
+        parser = SceneStreamParser()
+        image_prompt_sent = False
+        async for delta in self._stream_provider(model, system, messages):
+            content_delta = parser.feed(delta)
+            if content_delta:
+                yield "content", content_delta
+            if not image_prompt_sent and parser.image_prompt is not None:
+                image_prompt_sent = True
+                image_prompt = parser.image_prompt
+                if image_style and image_prompt:
+                    image_prompt = image_prompt + ", " + image_style
+                yield "image_prompt", image_prompt
+
+        data = self._parse_response(parser.text)
+        if image_style and data.get("image_prompt"):
+            data["image_prompt"] = data["image_prompt"] + ", " + image_style
+        yield "scene", data
+
+    def _build_system_prompt(self, content_guidelines: str) -> str:
+        """Build the scene system prompt: tier guidelines plus the storytelling rules.
+
+        Nothing here changes from scene to scene, so providers can cache it.
+        """
+        if content_guidelines:
+            return content_guidelines + "\n\n" + SYSTEM_PROMPT
+        return SYSTEM_PROMPT
+
+    def _build_pacing_instructions(
+        self,
+        story_length: StoryLength,
+        current_depth: int,
+        target_depth: int,
+        is_chapter_start: bool,
+        chapter_number: int | None,
+        total_chapters: int | None,
+    ) -> str:
+        """Build the pacing and chapter instructions for this scene."""
         # Determine pacing
         remaining = target_depth - current_depth
         if remaining <= 1:
@@ -100,7 +310,6 @@ class StoryService:
 
         # Build chapter-specific instructions for epic stories
         chapter_instruction = ""
-        chapter_title_field = ""
         if chapter_number and total_chapters:
             chapter_instruction = (
                 f"\nCHAPTER STRUCTURE:\n"
@@ -116,42 +325,35 @@ class StoryService:
                 chapter_instruction += f"\n- This is a middle chapter. Develop subplots and raise the stakes."
 
             if is_chapter_start:
-                chapter_instruction += "\n- This scene is the FIRST scene of a new chapter. Set a new tone or location shift to mark the chapter transition."
-                chapter_title_field = '\n  "chapter_title": "A short, evocative chapter title (3-6 words)",'
+                chapter_instruction += (
+                    "\n- This scene is the FIRST scene of a new chapter. Set a new tone or location shift to mark the chapter transition."
+                    '\n- Add a "chapter_title" field to the JSON output: a short, evocative chapter title (3-6 words).'
+                )
 
-        system = SYSTEM_PROMPT.format(
+        return PACING_PROMPT.format(
             choice_count=choice_count,
             story_length=story_length.value,
             target_depth=target_depth,
             current_depth=current_depth + 1,
             pacing_instruction=pacing,
             chapter_instruction=chapter_instruction,
-            chapter_title_field=chapter_title_field,
-        )
-
-        # Prepend tier-specific content guidelines
-        if content_guidelines:
-            system = content_guidelines + "\n\n" + system
-
-        # Build conversation messages
-        messages = self._build_messages(prompt, context_scenes, choice_text)
-
-        # Call the selected provider
-        response_text = await self._call_provider(model, system, messages)
-
-        # Parse JSON response
-        data = self._parse_response(response_text)
-
-        # Append tier-specific image style to the image prompt
-        if image_style and data.get("image_prompt"):
-            data["image_prompt"] = data["image_prompt"] + ", " + image_style
-
-        return data
+        ).rstrip()
 
     async def _call_provider(
-        self, model: str, system: str, messages: list[dict]
+        self, model: str, system: str, messages: list[dict], hedge: bool = False
     ) -> str:
-        """Dispatch to the correct provider's generation method."""
+        """Generate with model, failing over and hedging through provider_router."""
+        return await provider_router.call(
+            model,
+            lambda provider: self._call_model(provider, system, messages),
+            hedge=hedge,
+        )
+
+    async def _call_model(self, model: str, system: str, messages: list[dict]) -> str:
+        """Dispatch a single attempt to the correct provider's generation method.
+
+        Retries and failover are left to provider_router.
+        """
         if model == "gpt":
             return await self._call_gpt(system, messages, model_name="gpt-4o")
         elif model == "gpt5":
@@ -163,181 +365,298 @@ class StoryService:
         else:
             return await self._call_claude(system, messages)
 
-    async def _call_claude(
-        self, system: str, messages: list[dict], max_retries: int = 3
-    ) -> str:
-        """Call Claude API with exponential backoff retry."""
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                response = await self.claude_client.messages.create(
-                    model="claude-sonnet-4-5-20250929",
-                    max_tokens=2000,
-                    system=system,
-                    messages=messages,
-                )
-                return response.content[0].text
-            except Exception as e:
-                last_error = e
-                logger.warning(
-                    f"Claude API attempt {attempt + 1}/{max_retries} failed: {e}"
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
+    def _claude_request(self, system: str, messages: list[dict]) -> dict:
+        """Messages API arguments, with the system prompt as a cache breakpoint.
 
-        raise RuntimeError(
-            f"Claude API failed after {max_retries} attempts: {last_error}"
-        )
+        Together with the breakpoint _build_messages() puts on the last
+        transcript scene this uses two of Claude's four breakpoints. The
+        system prompt carries the story's own guideline blocks (profile,
+        characters, bedtime mode) on top of the tier's, so it is reused by
+        every scene of one story, and across stories only when they add
+        nothing to the tier guidelines. The transcript prefix is reused by
+        consecutive scenes of one story.
+        """
+        return {
+            "model": "claude-sonnet-4-5-20250929",
+            "max_tokens": 2000,
+            "system": [_text_block(system, cache=True)],
+            "messages": messages,
+        }
+
+    async def _call_claude(self, system: str, messages: list[dict]) -> str:
+        """Call the Claude API once; retries and failover are left to provider_router."""
+        request = self._claude_request(system, messages)
+        response = await self.claude_client.messages.create(**request)
+        token_usage.record_anthropic(request["model"], response.usage)
+        return response.content[0].text
 
     async def _call_gpt(
-        self, system: str, messages: list[dict], max_retries: int = 3, model_name: str = "gpt-4o"
+        self, system: str, messages: list[dict], model_name: str = "gpt-4o"
     ) -> str:
-        """Call OpenAI GPT API with exponential backoff retry."""
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                oai_messages = [{"role": "system", "content": system}]
-                oai_messages.extend(messages)
-                params = {
-                    "model": model_name,
-                    "messages": oai_messages,
-                }
-                # GPT-5+ uses max_completion_tokens; older models use max_tokens
-                if model_name.startswith("gpt-5"):
-                    params["max_completion_tokens"] = 2000
-                else:
-                    params["max_tokens"] = 2000
-                response = await self.openai_client.chat.completions.create(**params)
-                return response.choices[0].message.content
-            except Exception as e:
-                last_error = e
-                logger.warning(
-                    f"GPT API attempt {attempt + 1}/{max_retries} failed: {e}"
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
-
-        raise RuntimeError(
-            f"GPT API failed after {max_retries} attempts: {last_error}"
-        )
+        """Call the OpenAI GPT API once."""
+        oai_messages = [{"role": "system", "content": system}]
+        oai_messages.extend(_plain_messages(messages))
+        params = {
+            "model": model_name,
+            "messages": oai_messages,
+        }
+        # GPT-5+ uses max_completion_tokens; older models use max_tokens
+        if model_name.startswith("gpt-5"):
+            params["max_completion_tokens"] = 2000
+        else:
+            params["max_tokens"] = 2000
+        response = await self.openai_client.chat.completions.create(**params)
+        token_usage.record_openai(model_name, response.usage)
+        return response.choices[0].message.content
 
-    async def _call_gemini(
-        self, system: str, messages: list[dict], max_retries: int = 3
-    ) -> str:
-        """Call Google Gemini API with exponential backoff retry."""
+    async def _call_gemini(self, system: str, messages: list[dict]) -> str:
+        """Call the Google Gemini API once."""
         if not self.gemini_client:
             raise RuntimeError("Gemini API key not configured")
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                # Combine messages into a single user content string
-                user_content = "\n\n".join(m["content"] for m in messages)
-                response = await self.gemini_client.aio.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=user_content,
-                    config=genai.types.GenerateContentConfig(
-                        system_instruction=system,
-                        max_output_tokens=2000,
-                    ),
-                )
-                return response.text
-            except Exception as e:
-                last_error = e
-                logger.warning(
-                    f"Gemini API attempt {attempt + 1}/{max_retries} failed: {e}"
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
-
-        raise RuntimeError(
-            f"Gemini API failed after {max_retries} attempts: {last_error}"
+        # Combine messages into a single user content string
+        user_content = "\n\n".join(_content_text(m["content"]) for m in messages)
+        response = await self.gemini_client.aio.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=user_content,
+            config=genai.types.GenerateContentConfig(
+                system_instruction=system,
+                max_output_tokens=2000,
+            ),
         )
+        token_usage.record_gemini("gemini-2.5-flash", response.usage_metadata)
+        return response.text
 
-    async def _call_grok(
-        self, system: str, messages: list[dict], max_retries: int = 3
-    ) -> str:
-        """Call xAI Grok API (OpenAI-compatible) with exponential backoff retry."""
+    async def _call_grok(self, system: str, messages: list[dict]) -> str:
+        """Call the xAI Grok API (OpenAI-compatible) once."""
         if not self.grok_client:
             raise RuntimeError("xAI API key not configured")
+        oai_messages = [{"role": "system", "content": system}]
+        oai_messages.extend(_plain_messages(messages))
+        response = await self.grok_client.chat.completions.create(
+            model="grok-3",
+            max_tokens=2000,
+            messages=oai_messages,
+        )
+        token_usage.record_openai("grok-3", response.usage)
+        return response.choices[0].message.content
+
+    async def _stream_provider(
+        self, model: str, system: str, messages: list[dict], max_retries: int = 3
+    ) -> AsyncIterator[str]:
+        """Yield response text deltas from the selected provider.
+
+        Providers are tried in provider_router's order: a failure moves on
+        to a fallback provider (or retries with exponential backoff when
+        there is none), but only until the first text has been yielded — a
+        stream that breaks midway is raised to the caller. Streams are not
+        hedged.
+        """
+        plan = provider_router.plan(model, max_retries)
         last_error = None
-        for attempt in range(max_retries):
+        for attempt, provider in enumerate(plan):
+            started = False
+            probe = provider_router.claim(provider, plan)
+            if probe is None:
+                last_error = RuntimeError(f"{provider} circuit breaker is open")
+                continue
+            start = time.monotonic()
             try:
-                oai_messages = [{"role": "system", "content": system}]
-                oai_messages.extend(messages)
-                response = await self.grok_client.chat.completions.create(
-                    model="grok-3",
-                    max_tokens=2000,
-                    messages=oai_messages,
-                )
-                return response.choices[0].message.content
+                async for delta in self._open_stream(provider, system, messages):
+                    started = True
+                    yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                # Reader went away; says nothing about the provider
+                provider_router.health(provider).release(probe)
+                raise
             except Exception as e:
+                provider_router.record(provider, time.monotonic() - start, ok=False, probe=probe)
+                if started:
+                    raise
                 last_error = e
                 logger.warning(
-                    f"Grok API attempt {attempt + 1}/{max_retries} failed: {e}"
+                    f"{provider} streaming attempt {attempt + 1}/{len(plan)} for {model} failed: {e}"
                 )
-                if attempt < max_retries - 1:
+                if attempt + 1 < len(plan) and plan[attempt + 1] == provider:
                     await asyncio.sleep(2 ** attempt)
+                continue
+            provider_router.record(provider, time.monotonic() - start, ok=True, probe=probe)
+            return
 
         raise RuntimeError(
-            f"Grok API failed after {max_retries} attempts: {last_error}"
+            f"{model} streaming failed on {', '.join(dict.fromkeys(plan))}: {last_error}"
         )
 
+    def _open_stream(self, model: str, system: str, messages: list[dict]) -> AsyncIterator[str]:
+        if model in ("gpt", "gpt5"):
+            model_name = "gpt-5.2" if model == "gpt5" else "gpt-4o"
+            return self._stream_gpt(system, messages, model_name)
+        elif model == "gemini":
+            return self._stream_gemini(system, messages)
+        elif model == "grok":
+            return self._stream_grok(system, messages)
+        else:
+            return self._stream_claude(system, messages)
+
+    async def _stream_claude(self, system: str, messages: list[dict]) -> AsyncIterator[str]:
+        request = self._claude_request(system, messages)
+        async with self.claude_client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                yield text
+            message = await stream.get_final_message()
+        token_usage.record_anthropic(request["model"], message.usage)
+
+    async def _stream_gpt(
+        self, system: str, messages: list[dict], model_name: str = "gpt-4o"
+    ) -> AsyncIterator[str]:
+        oai_messages = [{"role": "system", "content": system}]
+        oai_messages.extend(_plain_messages(messages))
+        params = {
+            "model": model_name,
+            "messages": oai_messages,
+            "stream": True,
+            # Usage, including cached tokens, arrives in a final chunk with no choices
+            "stream_options": {"include_usage": True},
+        }
+        if model_name.startswith("gpt-5"):
+            params["max_completion_tokens"] = 2000
+        else:
+            params["max_tokens"] = 2000
+        stream = await self.openai_client.chat.completions.create(**params)
+        async for chunk in stream:
+            if chunk.usage:
+                token_usage.record_openai(model_name, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_gemini(self, system: str, messages: list[dict]) -> AsyncIterator[str]:
+        if not self.gemini_client:
+            raise RuntimeError("Gemini API key not configured")
+        user_content = "\n\n".join(_content_text(m["content"]) for m in messages)
+        stream = await self.gemini_client.aio.models.generate_content_stream(
+            model="gemini-2.5-flash",
+            contents=user_content,
+            config=genai.types.GenerateContentConfig(
+                system_instruction=system,
+                max_output_tokens=2000,
+            ),
+        )
+        usage = None
+        async for chunk in stream:
+            # Every chunk carries the running usage; the last one is the total
+            usage = chunk.usage_metadata or usage
+            if chunk.text:
+                yield chunk.text
+        token_usage.record_gemini("gemini-2.5-flash", usage)
+
+    async def _stream_grok(self, system: str, messages: list[dict]) -> AsyncIterator[str]:
+        if not self.grok_client:
+            raise RuntimeError("xAI API key not configured")
+        oai_messages = [{"role": "system", "content": system}]
+        oai_messages.extend(_plain_messages(messages))
+        stream = await self.grok_client.chat.completions.create(
+            model="grok-3",
+            max_tokens=2000,
+            messages=oai_messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.usage:
+                token_usage.record_openai("grok-3", chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def _build_messages(
         self,
         prompt: str,
         context_scenes: list[Scene],
         choice_text: str | None,
+        instructions: str = "",
+        context_summary: str = "",
+        summarized_scenes: int = 0,
     ) -> list[dict]:
-        """Build the conversation history for the AI provider."""
-        messages = []
-
+        """Build the conversation history for the AI provider.
+
+        The user message is a list of content blocks ordered from most to
+        least stable: the original prompt, each prior scene, then the
+        reader's choice and this scene's instructions. The next scene's
+        request repeats every block but the last unchanged, so the last
+        scene is marked as a Claude cache breakpoint. Other providers get
+        the blocks joined into one string and cache the same prefix
+        automatically.
+        """
         if not context_scenes:
             # First scene — just the user prompt
-            messages.append({
-                "role": "user",
-                "content": f"Create the opening scene for this adventure: {prompt}",
-            })
+            request = f"Create the opening scene for this adventure: {prompt}"
+            if instructions:
+                request += "\n\n" + instructions
+            return [{"role": "user", "content": [_text_block(request)]}]
+
+        # Build context from prior scenes
+        context, cacheable = self._build_context(
+            prompt, context_scenes, context_summary, summarized_scenes,
+        )
+        blocks = [_text_block(text) for text in context]
+        if cacheable:
+            blocks[-1] = _text_block(context[-1], cache=True)
+
+        request = f"The reader chose: \"{choice_text}\"\n\n" if choice_text else ""
+        if instructions:
+            request += instructions + "\n\n"
+        request += "Generate the next scene."
+        blocks.append(_text_block(request))
+        return [{"role": "user", "content": blocks}]
+
+    def _build_context(
+        self, prompt: str, scenes: list[Scene], summary: str = "", summarized: int = 0,
+    ) -> tuple[list[str], bool]:
+        """Assemble story context from prior scenes, one text per block.
+
+        With a rolling summary of the first summarized scenes, only the
+        scenes after them are included verbatim. Returns the texts and
+        whether they are a stable prefix worth caching (False once the
+        truncating fallback is used).
+        """
+        parts = [f"Original adventure prompt: {prompt}"]
+        if summary:
+            parts.append(f"Summary of chapters 1-{summarized}:\n{summary}\n\nMost recent chapters:")
         else:
-            # Build context from prior scenes
-            context = self._build_context(prompt, context_scenes)
-            user_msg = context
-            if choice_text:
-                user_msg += f"\n\nThe reader chose: \"{choice_text}\"\n\nGenerate the next scene."
-            else:
-                user_msg += "\n\nGenerate the next scene."
-            messages.append({"role": "user", "content": user_msg})
+            summarized = 0
+            parts[0] += "\n\nStory so far:"
+
+        scene_texts = self._scene_texts(scenes, summarized)
+        total_chars = sum(len(text) for text in parts) + sum(len(text) for text in scene_texts)
 
-        return messages
+        # If there is no summary yet and the context is too long, truncate earlier scenes
+        if not summary and total_chars > settings.context_char_threshold and len(scene_texts) > 2:
+            return self._summarize_long_context(prompt, scene_texts), False
 
-    def _build_context(self, prompt: str, scenes: list[Scene]) -> str:
-        """Assemble full story context from prior scenes."""
-        parts = [f"Original adventure prompt: {prompt}\n\nStory so far:\n"]
+        return [*parts, *scene_texts], True
 
-        total_chars = len(parts[0])
-        scene_texts = []
+    def _scene_texts(self, scenes: list[Scene], start: int = 0) -> list[str]:
+        """Label scenes[start:] by chapter, each opening with the choice that led to it.
 
-        for i, scene in enumerate(scenes):
+        A scene's text never changes once it is written, which keeps the
+        transcript a stable prefix for the provider's prompt cache.
+        """
+        texts = []
+        for i in range(start, len(scenes)):
+            scene = scenes[i]
             text = f"--- Chapter {i + 1} ---\n{scene.content}"
-            if scene.choices and i < len(scenes) - 1:
-                # Find which choice was taken (next scene in path)
-                next_scene = scenes[i + 1] if i + 1 < len(scenes) else None
-                if next_scene and next_scene.choice_taken_id:
-                    for c in scene.choices:
-                        if c.choice_id == next_scene.choice_taken_id:
-                            text += f"\n[Reader chose: \"{c.text}\"]"
-                            break
-            scene_texts.append(text)
-            total_chars += len(text)
-
-        # If context is too long, summarize earlier scenes
-        if total_chars > settings.context_char_threshold and len(scene_texts) > 2:
-            return self._summarize_long_context(prompt, scene_texts)
-
-        parts.extend(scene_texts)
-        return "\n\n".join(parts)
-
-    def _summarize_long_context(self, prompt: str, scene_texts: list[str]) -> str:
-        """When context is too long, keep recent scenes verbatim and summarize earlier ones."""
+            if i > 0 and scene.choice_taken_id:
+                # Find which choice in the previous scene led here
+                for c in scenes[i - 1].choices:
+                    if c.choice_id == scene.choice_taken_id:
+                        text = f"[Reader chose: \"{c.text}\"]\n\n" + text
+                        break
+            texts.append(text)
+        return texts
+
+    def _summarize_long_context(self, prompt: str, scene_texts: list[str]) -> list[str]:
+        """When context is too long, keep recent scenes verbatim and truncate earlier ones.
+
+        Only used until a rolling summary of the story is available.
+        """
         # Keep last 2 scenes verbatim, summarize the rest
         keep_count = 2
         to_summarize = scene_texts[:-keep_count]
@@ -349,10 +668,9 @@ class StoryService:
             f"[Summary of earlier chapters: The story has progressed through "
             f"{len(to_summarize)} chapters. Key events: "
             f"{summary_text[:2000]}...]\n\n"
-            f"Recent chapters:\n\n"
+            f"Recent chapters:"
         )
-        summary += "\n\n".join(to_keep)
-        return summary
+        return [summary, *to_keep]
 
     def _parse_response(self, text: str) -> dict:
         """Parse and validate the AI provider's JSON response."""
@@ -397,20 +715,45 @@ class StoryService:
 
         return data
 
+    async def _fold(
+        self, model: str, system: str, previous: str, new_text: str, noun: str,
+    ) -> str:
+        """Ask the story's provider to fold new_text into a previous summary.
+
+        Shared by generate_recap() and fold_summary(), which both extend a
+        summary of a path's earlier scenes instead of resending them.
+        Raises on provider failure.
+        """
+        if previous:
+            content = (
+                f"{noun.capitalize()} so far:\n{previous}\n\n"
+                f"New scenes:\n\n{new_text}\n\nWrite the updated {noun}."
+            )
+        else:
+            content = f"Story so far:\n\n{new_text}\n\nWrite the {noun}."
+        messages = [{"role": "user", "content": content}]
+        return (await self._call_provider(model, system, messages)).strip()
+
     async def generate_recap(
         self,
         scenes: list[Scene],
         model: str = "claude",
         content_guidelines: str = "",
         recap_style: str = "",
+        previous_recap: str = "",
+        start: int = 0,
     ) -> str:
         """Generate a 2-3 sentence recap of the story so far.
 
-        Uses the same AI provider as the story for consistent voice.
-        Returns plain text summary, or empty string on failure.
+        previous_recap, a summary of scenes[:start], is extended with only
+        scenes[start:] rather than re-reading the whole story. Uses the
+        same AI provider as the story for consistent voice. Returns plain
+        text summary, or empty string on failure.
         """
         if not scenes:
             return ""
+        if start >= len(scenes):
+            return previous_recap
 
         scene_count = len(scenes)
         sentence_count = "2-3" if scene_count < 10 else "3-4"
@@ -426,16 +769,50 @@ class StoryService:
         if content_guidelines:
             system = content_guidelines + "\n\n" + system
 
-        # Build a compact summary of each scene
+        # Build a compact summary of each new scene
         story_text = "\n\n".join(
-            f"Scene {i + 1}: {s.content}" for i, s in enumerate(scenes)
+            f"Scene {i + 1}: {scenes[i].content}" for i in range(start, scene_count)
         )
-        messages = [
-            {"role": "user", "content": f"Summarize this story so far:\n\n{story_text}"},
-        ]
 
         try:
-            return await self._call_provider(model, system, messages)
+            return await self._fold(model, system, previous_recap, story_text, "recap")
         except Exception as e:
             logger.warning(f"Recap generation failed: {e}")
             return ""
+
+    async def fold_summary(
+        self,
+        summary: str,
+        scenes: list[Scene],
+        start: int = 0,
+        model: str = "claude",
+        content_guidelines: str = "",
+    ) -> str:
+        """Fold scenes[start:] into summary, a running summary of scenes[:start].
+
+        The result stands in for those scenes in later generation prompts,
+        so it keeps what the storyteller needs rather than reading as a
+        recap. Uses the same provider as the story. Returns the updated
+        summary, or empty string on failure.
+        """
+        if start >= len(scenes):
+            return summary
+
+        system = (
+            f"You keep a running summary of an interactive story so the storyteller "
+            f"can continue it without rereading every scene. Merge the new scenes "
+            f"into the summary so far. Keep every named character with their "
+            f"appearance and relationships, the current location, important "
+            f"objects, the reader's key decisions and any unresolved plot threads. "
+            f"Stay under {SUMMARY_MAX_WORDS} words, dropping minor details as the "
+            f"story grows. Write plain prose with no headings or commentary."
+        )
+        if content_guidelines:
+            system = content_guidelines + "\n\n" + system
+
+        new_scenes = "\n\n".join(self._scene_texts(scenes, start))
+        try:
+            return await self._fold(model, system, summary, new_scenes, "summary")
+        except Exception as e:
+            logger.warning(f"Context summary generation failed: {e}")
+            return ""
@@ -0,0 +1,132 @@
+"""Per-call input token accounting, split by prompt cache hits.
+
+Story prompts are laid out so the part that repeats from call to call
+comes first: the system prompt, then the transcript scene by scene, with
+only the reader's latest choice and the pacing instructions at the end.
+Each provider reuses that prefix in its own way:
+
+- Claude: explicit cache_control breakpoints on the system prompt and on
+  the last transcript scene (see StoryService._claude_request).
+- OpenAI and xAI: automatic prefix caching of prompts over ~1024 tokens.
+- Gemini 2.5: implicit caching of a repeated prefix.
+
+Every text generation call reports its usage here, so the admin page can
+show how much of the input was actually served from cache.
+"""
+
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Most recent calls kept for the admin page
+RECENT_CALLS = 20
+
+
+class TokenUsage:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # model -> running totals
+        self._totals: dict[str, dict] = {}
+        self._recent: deque[dict] = deque(maxlen=RECENT_CALLS)
+
+    def record(
+        self,
+        model: str,
+        input_tokens: int,
+        cached_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """Record one call.
+
+        input_tokens is the whole prompt, cached_tokens the part of it read
+        from cache and cache_write_tokens the part newly written to cache
+        (Claude only).
+        """
+        uncached = max(0, input_tokens - cached_tokens)
+        logger.info(
+            f"{model} usage: {input_tokens} input tokens "
+            f"({cached_tokens} cached, {uncached} uncached, {cache_write_tokens} cache writes), "
+            f"{output_tokens} output"
+        )
+        with self._lock:
+            totals = self._totals.setdefault(model, {
+                "calls": 0,
+                "cache_hits": 0,
+                "input_tokens": 0,
+                "cached_tokens": 0,
+                "cache_write_tokens": 0,
+                "output_tokens": 0,
+            })
+            totals["calls"] += 1
+            totals["cache_hits"] += 1 if cached_tokens else 0
+            totals["input_tokens"] += input_tokens
+            totals["cached_tokens"] += cached_tokens
+            totals["cache_write_tokens"] += cache_write_tokens
+            totals["output_tokens"] += output_tokens
+            self._recent.append({
+                "model": model,
+                "input_tokens": input_tokens,
+                "cached_tokens": cached_tokens,
+                "uncached_tokens": uncached,
+                "cache_write_tokens": cache_write_tokens,
+                "output_tokens": output_tokens,
+            })
+
+    def record_anthropic(self, model: str, usage) -> None:
+        """Record an Anthropic Messages API usage block.
+
+        Anthropic's input_tokens excludes cache reads and writes, so the
+        three are added back together for the prompt total.
+        """
+        if usage is None:
+            return
+        cached = getattr(usage, "cache_read_input_tokens", None) or 0
+        written = getattr(usage, "cache_creation_input_tokens", None) or 0
+        self.record(
+            model,
+            input_tokens=(usage.input_tokens or 0) + cached + written,
+            cached_tokens=cached,
+            cache_write_tokens=written,
+            output_tokens=usage.output_tokens or 0,
+        )
+
+    def record_openai(self, model: str, usage) -> None:
+        """Record an OpenAI-compatible chat completions usage block."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.record(
+            model,
+            input_tokens=usage.prompt_tokens or 0,
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+            output_tokens=usage.completion_tokens or 0,
+        )
+
+    def record_gemini(self, model: str, usage) -> None:
+        """Record a Gemini usage_metadata block."""
+        if usage is None:
+            return
+        self.record(
+            model,
+            input_tokens=usage.prompt_token_count or 0,
+            cached_tokens=usage.cached_content_token_count or 0,
+            output_tokens=usage.candidates_token_count or 0,
+        )
+
+    def get_stats(self) -> dict:
+        """Return per-model totals with cached share, plus the latest calls."""
+        with self._lock:
+            models = {model: dict(totals) for model, totals in self._totals.items()}
+            recent = list(self._recent)
+        for totals in models.values():
+            totals["uncached_tokens"] = totals["input_tokens"] - totals["cached_tokens"]
+            totals["cached_ratio"] = (
+                totals["cached_tokens"] / totals["input_tokens"] if totals["input_tokens"] else 0.0
+            )
+        return {"models": models, "recent": recent[::-1]}
+
+
+token_usage = TokenUsage()
@@ -1,13 +1,38 @@
+import asyncio
+import hashlib
 import logging
+import os
 import re
-
-from openai import AsyncOpenAI
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator
 
 from app.config import settings
+from app.services.clients import get_openai_client
+from app.services.io_pool import run_io
 
 logger = logging.getLogger(__name__)
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+TTS_MODEL = "gpt-4o-mini-tts"
+
+# Content-addressed narration cache: <sha256 of model/voice/instructions/text>.mp3
+TTS_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "tts_cache"
+
+# Seconds between full scans of the cache directory for eviction; in
+# between, the cache's size is tracked from the narrations written here
+EVICT_SCAN_INTERVAL = 300.0
+
+# Eviction frees space down to this fraction of TTS_CACHE_MAX_BYTES, so the
+# next few narrations fit without another scan
+EVICT_LOW_WATER = 0.9
+
+# Cache size as of the last scan plus narrations written since (None
+# until the first scan), guarded by _cache_size_lock
+_cache_bytes: int | None = None
+_last_scan = 0.0
+_cache_size_lock = threading.Lock()
 
 # Max characters per TTS request (gpt-4o-mini-tts has ~2000 token limit)
 MAX_CHARS_PER_CHUNK = 4000
@@ -36,6 +61,163 @@ def _split_text_at_sentences(text: str, max_chars: int = MAX_CHARS_PER_CHUNK) ->
     return chunks
 
 
+async def _synthesize_chunk(chunk: str, voice: str, instructions: str) -> bytes:
+    kwargs = {
+        "model": TTS_MODEL,
+        "voice": voice,
+        "input": chunk,
+        "response_format": "mp3",
+    }
+    if instructions:
+        kwargs["instructions"] = instructions
+
+    response = await get_openai_client().audio.speech.create(**kwargs)
+    return response.content
+
+
+def speech_cache_key(text: str, voice: str, instructions: str = "") -> str:
+    """Return the cache key for a narration: a hash of everything that shapes the audio."""
+    digest = hashlib.sha256()
+    for part in (TTS_MODEL, voice, instructions, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached_speech(text: str, voice: str, instructions: str = "") -> Path | None:
+    """Return the cached MP3 for this narration, or None on a miss.
+
+    A hit refreshes the file's mtime, which is the LRU clock for eviction.
+    """
+    path = TTS_CACHE_DIR / f"{speech_cache_key(text, voice, instructions)}.mp3"
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def _store_cached_speech(key: str, audio: bytes) -> None:
+    """Atomically write a narration to the cache, then enforce the size bound."""
+    TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = TTS_CACHE_DIR / f"{key}.mp3"
+    tmp_path = TTS_CACHE_DIR / f".{key}.{uuid.uuid4().hex}.tmp"
+    tmp_path.write_bytes(audio)
+    os.replace(tmp_path, path)
+    _evict_cached_speech(keep=path, added=len(audio))
+
+
+def _evict_cached_speech(keep: Path, added: int = 0) -> None:
+    """Delete least-recently-used narrations until the cache fits TTS_CACHE_MAX_BYTES.
+
+    The narration that was just written is never evicted. The directory is
+    only scanned when the tracked size goes over the bound, or when
+    EVICT_SCAN_INTERVAL has passed, to catch writes by other workers.
+    """
+    max_bytes = settings.tts_cache_max_bytes
+    if not max_bytes:
+        return
+    with _cache_size_lock:
+        _scan_and_evict(keep, added, max_bytes)
+
+
+def _scan_and_evict(keep: Path, added: int, max_bytes: int) -> None:
+    global _cache_bytes, _last_scan
+    now = time.monotonic()
+    if _cache_bytes is not None:
+        _cache_bytes += added
+        if _cache_bytes <= max_bytes and now - _last_scan < EVICT_SCAN_INTERVAL:
+            return
+    _last_scan = now
+    entries = []
+    total = 0
+    for f in TTS_CACHE_DIR.glob("*.mp3"):
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, f))
+        total += st.st_size
+    _cache_bytes = total
+    if total <= max_bytes:
+        return
+    entries.sort()
+    target = int(max_bytes * EVICT_LOW_WATER)
+    evicted = 0
+    for _, size, f in entries:
+        if total <= target:
+            break
+        if f == keep:
+            continue
+        f.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+    _cache_bytes = total
+    logger.info(f"Evicted {evicted} cached narration(s), cache now {total} bytes")
+
+
+async def stream_speech(
+    text: str, voice: str = "nova", instructions: str = "",
+) -> AsyncIterator[bytes]:
+    """Yield MP3 audio for text chunk by chunk, in order.
+
+    All chunks are synthesized concurrently (at most TTS_MAX_CONCURRENCY at
+    a time), so the first chunk can be sent while later ones are still in
+    flight. Closing the generator early cancels any outstanding requests.
+    A narration that streams to completion is written to the disk cache.
+    """
+    chunks = _split_text_at_sentences(text)
+    semaphore = asyncio.Semaphore(settings.tts_max_concurrency)
+
+    async def synthesize(chunk: str) -> bytes:
+        async with semaphore:
+            return await _synthesize_chunk(chunk, voice, instructions)
+
+    tasks = [asyncio.create_task(synthesize(chunk)) for chunk in chunks]
+    parts = []
+    try:
+        for task in tasks:
+            part = await task
+            parts.append(part)
+            yield part
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    try:
+        await run_io(_store_cached_speech, speech_cache_key(text, voice, instructions), b"".join(parts))
+    except Exception as e:
+        logger.warning(f"Failed to cache narration: {e}")
+
+
+# Shared budget for speculative narration, created on first use
+_prewarm_semaphore: asyncio.Semaphore | None = None
+
+
+async def prewarm_speech(
+    text: str, voice: str = "nova", instructions: str = "",
+    started: asyncio.Event | None = None,
+) -> None:
+    """Synthesize a narration into the disk cache ahead of a Read Aloud press.
+
+    At most TTS_PREWARM_CONCURRENCY pre-warms run at once across all
+    sessions; cancelling the caller's task cancels the in-flight requests.
+    started, if given, is set once this pre-warm gets its turn and begins
+    synthesizing.
+    """
+    global _prewarm_semaphore
+    if _prewarm_semaphore is None:
+        _prewarm_semaphore = asyncio.Semaphore(settings.tts_prewarm_concurrency)
+
+    async with _prewarm_semaphore:
+        if started is not None:
+            started.set()
+        if get_cached_speech(text, voice, instructions):
+            return
+        async for _ in stream_speech(text, voice, instructions):
+            pass
+
+
 async def generate_speech(text: str, voice: str = "nova", instructions: str = "") -> bytes:
     """Generate TTS audio from text using OpenAI gpt-4o-mini-tts.
 
@@ -47,21 +229,8 @@ async def generate_speech(text: str, voice: str = "nova", instructions: str = ""
     Returns:
         MP3 audio bytes.
     """
-    chunks = _split_text_at_sentences(text)
-    audio_parts = []
-
-    for chunk in chunks:
-        kwargs = {
-            "model": "gpt-4o-mini-tts",
-            "voice": voice,
-            "input": chunk,
-            "response_format": "mp3",
-        }
-        if instructions:
-            kwargs["instructions"] = instructions
-
-        response = await client.audio.speech.create(**kwargs)
-        audio_parts.append(response.content)
-
+    cached = get_cached_speech(text, voice, instructions)
+    if cached:
+        return cached.read_bytes()
     # Concatenate MP3 chunks (MP3 is concatenation-safe)
-    return b"".join(audio_parts)
+    return b"".join([part async for part in stream_speech(text, voice, instructions)])
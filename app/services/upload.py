@@ -4,6 +4,8 @@ from pathlib import Path
 
 from fastapi import UploadFile
 
+from app.services.io_pool import AsyncMethods, run_io
+
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -17,6 +19,7 @@ ALLOWED_TYPES = {"image/jpeg", "image/png"}
 class UploadService:
     def __init__(self):
         UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        self.aio = AsyncMethods(self)
 
     async def save_upload_files(
         self, session_id: str, files: list[UploadFile]
@@ -29,7 +32,7 @@ class UploadService:
             raise ValueError(f"Maximum {MAX_FILES} photos allowed")
 
         session_dir = UPLOADS_DIR / session_id
-        session_dir.mkdir(parents=True, exist_ok=True)
+        await run_io(session_dir.mkdir, parents=True, exist_ok=True)
 
         saved_paths: list[str] = []
 
@@ -40,7 +43,7 @@ class UploadService:
             content_type = file.content_type or ""
             if content_type not in ALLOWED_TYPES:
                 # Clean up already saved files
-                shutil.rmtree(session_dir, ignore_errors=True)
+                await run_io(shutil.rmtree, session_dir, ignore_errors=True)
                 raise ValueError(
                     f"Invalid file type: {content_type}. Only JPEG and PNG are allowed."
                 )
@@ -48,7 +51,7 @@ class UploadService:
             data = await file.read()
 
             if len(data) > MAX_FILE_SIZE:
-                shutil.rmtree(session_dir, ignore_errors=True)
+                await run_io(shutil.rmtree, session_dir, ignore_errors=True)
                 raise ValueError(
                     f"File '{file.filename}' is too large ({len(data) / (1024*1024):.1f} MB). "
                     f"Maximum is {MAX_FILE_SIZE / (1024*1024):.0f} MB."
@@ -61,7 +64,7 @@ class UploadService:
             safe_name = f"{i}_{session_id[:8]}{ext}"
             filepath = session_dir / safe_name
 
-            filepath.write_bytes(data)
+            await run_io(filepath.write_bytes, data)
             saved_paths.append(str(filepath.resolve()))
             logger.info(f"Saved upload: {filepath} ({len(data)} bytes)")
 
@@ -0,0 +1,242 @@
+"""Shared poller for outstanding xAI video generations.
+
+A submitted video is only a request_id until xAI finishes rendering it,
+which takes a minute or more. Rather than each video job sleeping and
+polling on its own, every outstanding request_id is registered here and a
+single background loop polls the ones that are due, a batch at a time over
+the pooled xAI client.
+
+Poll intervals back off with the age of the request: a freshly submitted
+video is unlikely to be ready, so it is checked sparingly at first, then
+more often around the typical render time, then less often again for
+stragglers. Finished videos are streamed to disk in chunks and each
+waiting caller's future is resolved with the file path.
+"""
+
+import asyncio
+import logging
+import queue
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import settings
+from app.services.clients import XAI_BASE_URL, get_http_client
+from app.services.io_pool import run_io
+
+logger = logging.getLogger(__name__)
+
+STATIC_VIDEOS_DIR = Path(__file__).resolve().parent.parent.parent / "static" / "videos"
+
+# Requests polled concurrently per loop iteration
+POLL_BATCH_SIZE = 8
+
+# Seconds after submission before the first poll
+FIRST_POLL_DELAY = 15.0
+
+# Poll interval bounds; in between, the interval follows the request's age
+MIN_POLL_INTERVAL = 3.0
+MAX_POLL_INTERVAL = 20.0
+
+# Typical render time; polls are most frequent around this age
+EXPECTED_RENDER_SECONDS = 60.0
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class _PendingVideo:
+    request_id: str
+    scene_id: str
+    submitted_at: float
+    next_poll_at: float
+    future: asyncio.Future
+    polls: int = 0
+
+
+def poll_interval(age: float) -> float:
+    """Return the delay before the next poll of a request this many seconds old."""
+    distance = abs(age - EXPECTED_RENDER_SECONDS) / EXPECTED_RENDER_SECONDS
+    interval = MIN_POLL_INTERVAL + distance * (MAX_POLL_INTERVAL - MIN_POLL_INTERVAL) / 2
+    return min(MAX_POLL_INTERVAL, interval)
+
+
+class VideoPoller:
+    def __init__(self):
+        # request_id -> pending video
+        self._pending: dict[str, _PendingVideo] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def wait(
+        self, request_id: str, scene_id: str, submitted_at: float | None = None,
+    ) -> Path:
+        """Wait for request_id to finish rendering and return the saved MP4.
+
+        submitted_at (epoch seconds) lets a resumed job keep its original
+        age, so backoff and timeout carry on where they left off. Raises
+        on a provider error, an empty download or a timeout.
+        """
+        entry = self._pending.get(request_id)
+        if entry is None:
+            now = time.time()
+            submitted = submitted_at or now
+            entry = _PendingVideo(
+                request_id=request_id,
+                scene_id=scene_id,
+                submitted_at=submitted,
+                next_poll_at=max(now, submitted + FIRST_POLL_DELAY),
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._pending[request_id] = entry
+            self._ensure_running()
+        # shield: one caller cancelling must not fail others waiting on the same id
+        return await asyncio.shield(entry.future)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._pending:
+            now = time.time()
+            due = sorted(
+                (e for e in self._pending.values() if e.next_poll_at <= now),
+                key=lambda e: e.next_poll_at,
+            )[:POLL_BATCH_SIZE]
+            if due:
+                results = await asyncio.gather(
+                    *(self._poll(e) for e in due), return_exceptions=True,
+                )
+                for entry, result in zip(due, results):
+                    if isinstance(result, Exception):
+                        # A bug handling one response must not stop polling the rest
+                        logger.error(f"Video poll of {entry.request_id} raised: {result}")
+                        entry.next_poll_at = time.time() + MAX_POLL_INTERVAL
+                continue
+
+            next_at = min(e.next_poll_at for e in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_at - now))
+            except asyncio.TimeoutError:
+                pass
+
+    def _finish(self, entry: _PendingVideo, result: Path | None = None, error: Exception | None = None) -> None:
+        self._pending.pop(entry.request_id, None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+        else:
+            entry.future.set_result(result)
+
+    async def _poll(self, entry: _PendingVideo) -> None:
+        age = time.time() - entry.submitted_at
+        if age > settings.video_timeout_seconds:
+            self._finish(entry, error=TimeoutError(
+                f"Video generation timed out after {int(age)}s"
+            ))
+            return
+
+        entry.polls += 1
+        try:
+            resp = await get_http_client(XAI_BASE_URL).get(
+                f"{XAI_BASE_URL}/videos/{entry.request_id}",
+                headers={"Authorization": f"Bearer {settings.xai_api_key}"},
+            )
+            poll_data = resp.json()
+            if not isinstance(poll_data, dict):
+                raise ValueError(f"unexpected poll response: {str(poll_data)[:200]}")
+        except Exception as e:
+            # Transient poll failures just push the next poll back
+            logger.warning(f"Video poll failed for {entry.request_id}: {e}")
+            entry.next_poll_at = time.time() + MAX_POLL_INTERVAL
+            return
+
+        # Response format: {"video": {"url": "..."}, "model": "..."}
+        video_obj = poll_data.get("video", {})
+        video_url = video_obj.get("url") if isinstance(video_obj, dict) else poll_data.get("url")
+        if video_url:
+            try:
+                path = await self._download(video_url, entry.scene_id)
+            except Exception as e:
+                self._finish(entry, error=e)
+                return
+            logger.info(
+                f"Video {entry.request_id} ready after {int(age)}s and {entry.polls} poll(s)"
+            )
+            self._finish(entry, result=path)
+            return
+
+        if "error" in poll_data:
+            self._finish(entry, error=ValueError(
+                f"Video generation error: {poll_data['error']}"
+            ))
+            return
+
+        entry.next_poll_at = time.time() + poll_interval(age)
+
+    async def _download(self, video_url: str, scene_id: str) -> Path:
+        """Stream the finished MP4 into static/videos without buffering it in memory.
+
+        Chunks are queued to a writer on the file I/O pool, so the disk
+        writes and the final rename never block the event loop.
+        """
+        video_path = STATIC_VIDEOS_DIR / f"{scene_id}.mp4"
+        partial = video_path.with_suffix(".mp4.part")
+        chunks: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        writer = None
+        try:
+            async with get_http_client(video_url).stream("GET", video_url) as resp:
+                resp.raise_for_status()
+                writer = asyncio.ensure_future(run_io(_write_chunks, partial, chunks))
+                async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if writer.done():
+                        break
+                    chunks.put(chunk)
+            chunks.put(None)
+            size = await writer
+            if size == 0:
+                raise ValueError("Downloaded video file is empty")
+            await run_io(partial.replace, video_path)
+        finally:
+            chunks.put(None)
+            if writer is not None:
+                await asyncio.gather(writer, return_exceptions=True)
+            await run_io(partial.unlink, missing_ok=True)
+        return video_path
+
+    async def stop(self) -> None:
+        """Stop polling. Waiting callers are cancelled; their jobs resume on restart."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        for entry in list(self._pending.values()):
+            entry.future.cancel()
+        self._pending.clear()
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        ages = [now - e.submitted_at for e in self._pending.values()]
+        return {
+            "outstanding": len(ages),
+            "oldest_seconds": int(max(ages)) if ages else 0,
+        }
+
+
+def _write_chunks(partial: Path, chunks: "queue.SimpleQueue[bytes | None]") -> int:
+    """Write queued chunks to partial until a None arrives; return the bytes written."""
+    STATIC_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+    size = 0
+    with partial.open("wb") as f:
+        while (chunk := chunks.get()) is not None:
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+video_poller = VideoPoller()
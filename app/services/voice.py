@@ -1,14 +1,10 @@
 import logging
 from io import BytesIO
 
-from openai import AsyncOpenAI
-
-from app.config import settings
+from app.services.clients import get_openai_client
 
 logger = logging.getLogger(__name__)
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
-
 
 async def transcribe_audio(audio_bytes: bytes, filename: str) -> str:
     """Transcribe audio bytes using OpenAI Whisper API.
@@ -23,7 +19,7 @@ async def transcribe_audio(audio_bytes: bytes, filename: str) -> str:
     audio_file = BytesIO(audio_bytes)
     audio_file.name = filename
 
-    response = await client.audio.transcriptions.create(
+    response = await get_openai_client().audio.transcriptions.create(
         model="whisper-1",
         file=audio_file,
         response_format="text",
@@ -1,29 +1,528 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
 import uuid
-from typing import Optional
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.config import settings
+from app.models import ImageStatus, StoryLength, StorySession
+from app.services.io_pool import run_io, snapshot
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Attempts at writing a session that other workers keep changing underneath us
+MAX_WRITE_ATTEMPTS = 5
+
+
+class SessionConflict(Exception):
+    """The session was written by someone else since this copy of it was read."""
+
+
+class SessionStore(ABC):
+    """Storage backend interface for active story sessions.
+
+    Backends map session_id -> StorySession. The module-level
+    create/get/update/delete functions delegate to the configured store.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[StorySession]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, story_session: StorySession) -> None:
+        """Store story_session; raises SessionConflict if it was read from an older version."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local dict store. Sessions are lost on restart and are not
+    shared between uvicorn workers, so this backend requires --workers 1.
+
+    Bounded by idle TTL, session count and estimated bytes. Eviction is LRU
+    by last access; evicted sessions are handed to on_evict so they can be
+    spilled to disk.
+
+    A session's size is estimated scene by scene: each scene's JSON is
+    measured once, when the session is first stored with it, rather than
+    re-serializing the whole session on every update.
+    """
+
+    def __init__(
+        self,
+        sessions: dict[str, StorySession] | None = None,
+        ttl_seconds: int = 0,
+        max_sessions: int = 0,
+        max_bytes: int = 0,
+        on_evict: Callable[[StorySession], None] | None = None,
+    ):
+        # Insertion order doubles as LRU order: accessed sessions are moved to the end
+        self.sessions = sessions if sessions is not None else {}
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._last_access: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}
+        # session_id -> {scene_id: serialized size} for scenes already measured
+        self._scene_sizes: dict[str, dict[str, int]] = {}
+        self.evictions: dict[str, int] = {"ttl": 0, "count": 0, "bytes": 0}
+
+    def get(self, session_id: str) -> Optional[StorySession]:
+        story_session = self.sessions.get(session_id)
+        if story_session is None:
+            return None
+        now = time.monotonic()
+        last = self._last_access.get(session_id, now)
+        if self.ttl_seconds and now - last > self.ttl_seconds:
+            self._evict(session_id, "ttl")
+            return None
+        self._touch(session_id, now)
+        return story_session
+
+    def put(self, session_id: str, story_session: StorySession) -> None:
+        self.sessions[session_id] = story_session
+        self._sizes[session_id] = self._estimate_size(session_id, story_session)
+        self._touch(session_id, time.monotonic())
+        self._enforce_limits()
+
+    def delete(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+        self._forget(session_id)
+
+    def clear(self) -> None:
+        self.sessions.clear()
+        self._last_access.clear()
+        self._sizes.clear()
+        self._scene_sizes.clear()
+
+    def _forget(self, session_id: str) -> None:
+        self._last_access.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+        self._scene_sizes.pop(session_id, None)
+
+    def _estimate_size(self, session_id: str, story_session: StorySession) -> int:
+        """Approximate serialized size; only scenes not seen before are measured."""
+        known = self._scene_sizes.setdefault(session_id, {})
+        for scene_id in [sid for sid in known if sid not in story_session.scenes]:
+            del known[scene_id]
+        for scene_id, scene in story_session.scenes.items():
+            if scene_id not in known:
+                known[scene_id] = len(scene.model_dump_json())
+        return (
+            sum(known.values())
+            + len(story_session.story.model_dump_json())
+            + sum(len(recap) for recap in story_session.recap_cache.values())
+        )
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._sizes.get(sid, 0) for sid in self.sessions)
+
+    def _touch(self, session_id: str, now: float) -> None:
+        self._last_access[session_id] = now
+        # Move to the most-recently-used end
+        self.sessions[session_id] = self.sessions.pop(session_id)
+
+    def _enforce_limits(self) -> None:
+        # Drop bookkeeping for sessions removed behind our back (e.g. _sessions.clear())
+        for sid in [sid for sid in self._last_access if sid not in self.sessions]:
+            self._forget(sid)
+
+        if self.ttl_seconds:
+            now = time.monotonic()
+            for sid in list(self.sessions):
+                if now - self._last_access.get(sid, now) <= self.ttl_seconds:
+                    break
+                self._evict(sid, "ttl")
+
+        while self.max_sessions and len(self.sessions) > self.max_sessions:
+            self._evict(next(iter(self.sessions)), "count")
+
+        # Never evict the most recently used session to satisfy the byte bound
+        while self.max_bytes and len(self.sessions) > 1 and self.resident_bytes > self.max_bytes:
+            self._evict(next(iter(self.sessions)), "bytes")
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        story_session = self.sessions.pop(session_id, None)
+        self._forget(session_id)
+        if story_session is None:
+            return
+        self.evictions[reason] += 1
+        logger.info(f"Evicted session {session_id} ({reason})")
+        if self.on_evict:
+            try:
+                self.on_evict(story_session)
+            except Exception as e:
+                logger.error(f"Failed to spill evicted session {session_id}: {e}")
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite (WAL mode) store shared by every worker process on the host.
+
+    Each row carries a version counter bumped on every write. Reads go
+    through an in-process cache keyed by session_id: a cached session is
+    returned as-is while its version still matches the row, so the hot
+    view_scene/image_status path only does a single indexed integer lookup
+    instead of re-parsing the session JSON. The cache is LRU-bounded by
+    max_cached; trimming it only drops the parsed copy, so it is counted
+    as cache_trims rather than as an eviction. Reads refresh a row's
+    updated_at (at most every TOUCH_INTERVAL seconds), so rows idle, neither
+    read nor written, for longer than ttl_seconds are purged and handed to
+    on_evict, like sessions evicted from the memory store.
+
+    Writes are conditional on the version the session was read at, so a
+    worker holding a stale copy gets SessionConflict instead of silently
+    overwriting another worker's update.
+    """
+
+    PURGE_INTERVAL = 60  # seconds between TTL purges
+    TOUCH_INTERVAL = 60  # seconds between updated_at refreshes on read
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: int = 0,
+        max_cached: int = 0,
+        on_evict: Callable[[StorySession], None] | None = None,
+    ):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None,
+            timeout=10.0,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, "
+            "version INTEGER NOT NULL, "
+            "data TEXT NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self.ttl_seconds = ttl_seconds
+        self.max_cached = max_cached
+        self.on_evict = on_evict
+        self._last_purge = 0.0
+        # session_id -> (version, StorySession), in LRU order
+        self._cache: dict[str, tuple[int, StorySession]] = {}
+        # session_id -> when this process last refreshed its updated_at
+        self._touched: dict[str, float] = {}
+        self.evictions: dict[str, int] = {"ttl": 0}
+        self.cache_trims = 0
+
+    def get(self, session_id: str) -> Optional[StorySession]:
+        with self._lock:
+            story_session = self._read(session_id)
+            if story_session is not None:
+                self._touch(session_id)
+            expired = self._purge_expired()
+        for sid, data in expired:
+            self._spill(sid, data)
+        return story_session
+
+    def _read(self, session_id: str) -> Optional[StorySession]:
+        """Return the session, from the cache while its version is current. Caller must hold the lock."""
+        row = self._conn.execute(
+            "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            self._drop_cached(session_id)
+            return None
+        cached = self._cache.pop(session_id, None)
+        if cached and cached[0] == row[0]:
+            self._cache[session_id] = cached
+            return cached[1]
+
+        row = self._conn.execute(
+            "SELECT version, data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            story_session = StorySession.model_validate_json(row[1])
+        except Exception as e:
+            logger.warning(f"Corrupted session row {session_id}: {e}")
+            return None
+        self._cache_put(session_id, row[0], story_session)
+        return story_session
+
+    def _touch(self, session_id: str) -> None:
+        """Mark a session as in use without bumping its version. Caller must hold the lock."""
+        now = time.time()
+        if now - self._touched.get(session_id, 0.0) < self.TOUCH_INTERVAL:
+            return
+        self._conn.execute(
+            "UPDATE sessions SET updated_at = ? WHERE session_id = ?", (now, session_id),
+        )
+        self._touched[session_id] = now
+
+    def _drop_cached(self, session_id: str) -> None:
+        self._cache.pop(session_id, None)
+        self._touched.pop(session_id, None)
+
+    def put(self, session_id: str, story_session: StorySession) -> None:
+        data = story_session.model_dump_json()
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached and cached[1] is story_session:
+                row = self._conn.execute(
+                    "UPDATE sessions SET version = version + 1, data = ?, updated_at = ? "
+                    "WHERE session_id = ? AND version = ? RETURNING version",
+                    (data, time.time(), session_id, cached[0]),
+                ).fetchone()
+            else:
+                # Not a copy read from this store: only valid for a new session
+                row = self._conn.execute(
+                    "INSERT INTO sessions (session_id, version, data, updated_at) "
+                    "VALUES (?, 1, ?, ?) ON CONFLICT(session_id) DO NOTHING "
+                    "RETURNING version",
+                    (session_id, data, time.time()),
+                ).fetchone()
+            if row is None:
+                raise SessionConflict(session_id)
+            self._cache.pop(session_id, None)
+            self._cache_put(session_id, row[0], story_session)
+            self._touched[session_id] = time.time()
+            expired = self._purge_expired()
+        for sid, data in expired:
+            self._spill(sid, data)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._drop_cached(session_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions")
+            self._cache.clear()
+            self._touched.clear()
+
+    @property
+    def sessions(self) -> dict[str, StorySession]:
+        return {sid: entry[1] for sid, entry in self._cache.items()}
+
+    def _cache_put(self, session_id: str, version: int, story_session: StorySession) -> None:
+        self._cache[session_id] = (version, story_session)
+        while self.max_cached and len(self._cache) > self.max_cached:
+            self._drop_cached(next(iter(self._cache)))
+            self.cache_trims += 1
+
+    def _purge_expired(self) -> list[tuple[str, str]]:
+        """Delete rows idle past the TTL and return their (session_id, data).
+
+        Caller must hold the lock. DELETE ... RETURNING hands each row to
+        exactly one worker, which spills it.
+        """
+        now = time.time()
+        if not self.ttl_seconds or now - self._last_purge < self.PURGE_INTERVAL:
+            return []
+        self._last_purge = now
+        expired = self._conn.execute(
+            "DELETE FROM sessions WHERE updated_at < ? RETURNING session_id, data",
+            (now - self.ttl_seconds,),
+        ).fetchall()
+        for sid, _ in expired:
+            self._drop_cached(sid)
+        self.evictions["ttl"] += len(expired)
+        return expired
+
+    def _spill(self, session_id: str, data: str) -> None:
+        logger.info(f"Evicted session {session_id} (ttl)")
+        if not self.on_evict:
+            return
+        try:
+            self.on_evict(StorySession.model_validate_json(data))
+        except Exception as e:
+            logger.error(f"Failed to spill evicted session {session_id}: {e}")
 
-from app.models import StorySession
 
 # In-memory session store: session_id -> StorySession
 _sessions: dict[str, StorySession] = {}
 
 
+# Spills running on the file I/O pool, referenced until they finish
+_spill_tasks: set[asyncio.Task] = set()
+
+
+def _spill_to_progress(story_session: StorySession) -> None:
+    """Write an evicted session to its tier's progress file so it can be resumed.
+
+    Eviction happens inside a request, so the write is handed to the file
+    I/O pool rather than blocking the event loop; outside an event loop it
+    runs inline.
+    """
+    current = story_session.current_scene
+    if current is None or current.is_ending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_spill(story_session)
+        return
+    task = loop.create_task(run_io(_write_spill, snapshot(story_session)))
+    _spill_tasks.add(task)
+
+    def _done(_task):
+        _spill_tasks.discard(_task)
+        if not _task.cancelled() and _task.exception():
+            logger.error(f"Failed to spill session for story {story_session.story.story_id}: {_task.exception()}")
+
+    task.add_done_callback(_done)
+
+
+def _write_spill(story_session: StorySession) -> None:
+    """Refresh the progress file with an evicted session. Runs on the I/O pool.
+
+    Only refreshes a progress file that already belongs to the same story:
+    a missing file means the story was finished or abandoned, and a file for
+    another story means the user has since started something newer.
+    """
+    from app.services.gallery import GalleryService
+
+    tier_name = story_session.story.tier
+    suffix = "_chapter" if story_session.story.length == StoryLength.EPIC else ""
+    gallery_service = GalleryService()
+    existing = gallery_service.load_progress(tier_name, suffix=suffix)
+    if existing and existing.story.story_id == story_session.story.story_id:
+        gallery_service.save_progress(tier_name, story_session, suffix=suffix)
+
+
+def _create_store() -> SessionStore:
+    """Build the session store selected by SESSION_BACKEND."""
+    if settings.session_backend == "sqlite":
+        db_path = Path(settings.session_db_path)
+        if not db_path.is_absolute():
+            db_path = BASE_DIR / db_path
+        logger.info(f"Using SQLite session store at {db_path}")
+        return SQLiteSessionStore(
+            db_path,
+            ttl_seconds=settings.session_ttl_seconds,
+            max_cached=settings.session_max_count,
+            on_evict=_spill_to_progress,
+        )
+    return MemorySessionStore(
+        _sessions,
+        ttl_seconds=settings.session_ttl_seconds,
+        max_sessions=settings.session_max_count,
+        max_bytes=settings.session_max_bytes,
+        on_evict=_spill_to_progress,
+    )
+
+
+_store: SessionStore = _create_store()
+
+
 def create_session(story_session: StorySession) -> str:
     """Create a new session and return the session ID."""
     session_id = str(uuid.uuid4())
-    _sessions[session_id] = story_session
+    _store.put(session_id, story_session)
     return session_id
 
 
 def get_session(session_id: str) -> Optional[StorySession]:
     """Retrieve a session by ID, or None if not found."""
-    return _sessions.get(session_id)
+    return _store.get(session_id)
+
+
+def carry_media(dst: StorySession, src: StorySession, scene_ids: list[str] | None = None) -> None:
+    """Copy image and video results that src has and dst is still waiting on.
+
+    A status only moves forward (pending -> generating -> complete/failed),
+    so for each image the copy that got further wins. Limited to scene_ids
+    when given.
+    """
+    image_rank = {ImageStatus.PENDING: 0, ImageStatus.GENERATING: 1}
+    video_rank = {"none": 0, "pending": 1, "generating": 2}
+    for scene_id in scene_ids if scene_ids is not None else list(src.scenes):
+        dst_scene, src_scene = dst.scenes.get(scene_id), src.scenes.get(scene_id)
+        if dst_scene is None or src_scene is None:
+            continue
+        pairs = [(dst_scene.image, src_scene.image)]
+        if len(dst_scene.extra_images) == len(src_scene.extra_images):
+            pairs += list(zip(dst_scene.extra_images, src_scene.extra_images))
+        for dst_image, src_image in pairs:
+            if dst_image.prompt != src_image.prompt:
+                continue
+            if image_rank.get(src_image.status, 2) > image_rank.get(dst_image.status, 2):
+                dst_image.status, dst_image.url, dst_image.error = (
+                    src_image.status, src_image.url, src_image.error,
+                )
+            if video_rank.get(src_image.video_status, 3) > video_rank.get(dst_image.video_status, 3):
+                dst_image.video_status = src_image.video_status
+                dst_image.video_url = src_image.video_url
+                dst_image.video_error = src_image.video_error
+                dst_image.video_request_id = src_image.video_request_id
+                dst_image.video_submitted_at = src_image.video_submitted_at
 
 
 def update_session(session_id: str, story_session: StorySession) -> None:
-    """Update an existing session."""
-    _sessions[session_id] = story_session
+    """Update an existing session.
+
+    Raises SessionConflict if another worker wrote the session since
+    story_session was read. Changes that should be re-applied on top of
+    the latest copy instead go through modify_session().
+    """
+    _store.put(session_id, story_session)
+
+
+def modify_session(
+    session_id: str, apply: Callable[[StorySession], None],
+) -> Optional[StorySession]:
+    """Apply a change to the latest copy of a session and write it back.
+
+    Re-reads and re-applies on conflict, so apply must only depend on the
+    session it is given. Returns the written session, or None if it no
+    longer exists; raises SessionConflict if every attempt conflicted.
+    """
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        story_session = _store.get(session_id)
+        if story_session is None:
+            return None
+        apply(story_session)
+        try:
+            _store.put(session_id, story_session)
+            return story_session
+        except SessionConflict:
+            continue
+    logger.warning(f"Gave up modifying session {session_id} after {MAX_WRITE_ATTEMPTS} conflicts")
+    raise SessionConflict(session_id)
 
 
 def delete_session(session_id: str) -> None:
     """Delete a session."""
-    _sessions.pop(session_id, None)
+    _store.delete(session_id)
+
+
+def get_session_stats() -> dict:
+    """Return resident session counts/bytes and eviction counters."""
+    sessions = _store.sessions
+    if isinstance(_store, MemorySessionStore):
+        resident_bytes = _store.resident_bytes
+    else:
+        resident_bytes = sum(len(s.model_dump_json()) for s in sessions.values())
+    evictions = dict(_store.evictions)
+    return {
+        "backend": settings.session_backend,
+        "resident_sessions": len(sessions),
+        "resident_bytes": resident_bytes,
+        "evictions": evictions,
+        "evictions_total": sum(evictions.values()),
+        "cache_trims": getattr(_store, "cache_trims", None),
+    }
@@ -250,11 +250,78 @@ async function retryImage(sceneId) {
     }
 }
 
+/**
+ * Shared media status stream: one EventSource per page, fanned out to
+ * watchers. Each watcher's onEvent(name, data) returns true once it is
+ * done; if the stream can't be used, pending watchers fall back to polling.
+ */
+const mediaWatchers = [];
+let mediaEventSource = null;
+
+function watchMediaEvents(sceneId, onEvent, fallback) {
+    if (!window.EventSource) {
+        fallback();
+        return;
+    }
+    mediaWatchers.push({ sceneId, onEvent, fallback });
+    if (mediaEventSource) return;
+
+    const urlPrefix = document.body.dataset.urlPrefix || '';
+    const source = new EventSource(
+        `${urlPrefix}/story/events?scene_id=${encodeURIComponent(sceneId)}`
+    );
+    mediaEventSource = source;
+
+    ['image', 'extra_image', 'video', 'cover_art'].forEach((name) => {
+        source.addEventListener(name, (event) => {
+            const data = JSON.parse(event.data);
+            mediaWatchers.slice().forEach((watcher) => {
+                if (watcher.sceneId === data.scene_id && watcher.onEvent(name, data)) {
+                    mediaWatchers.splice(mediaWatchers.indexOf(watcher), 1);
+                }
+            });
+            if (!mediaWatchers.length) {
+                source.close();
+                mediaEventSource = null;
+            }
+        });
+    });
+
+    source.onerror = () => {
+        // CLOSED means the browser won't reconnect on its own
+        if (source.readyState !== EventSource.CLOSED) return;
+        mediaEventSource = null;
+        mediaWatchers.splice(0).forEach((watcher) => watcher.fallback());
+    };
+}
+
+/**
+ * Wait for the scene image and swap the placeholder when it's ready.
+ */
+function pollImageStatus(sceneId) {
+    const container = document.getElementById('scene-image-container');
+    if (!container) return;
+
+    isGenerating = true;
+    watchMediaEvents(sceneId, (name, data) => {
+        if (name !== 'image') return false;
+        if (data.status === 'complete' && data.url) {
+            showImage(container, data.url, sceneId);
+            return true;
+        }
+        if (data.status === 'failed') {
+            showFailedState(container, sceneId);
+            return true;
+        }
+        return false;
+    }, () => pollImageStatusJson(sceneId));
+}
+
 /**
  * Poll for image generation status and swap placeholder when ready.
  * Also updates extra images if present in the response.
  */
-function pollImageStatus(sceneId) {
+function pollImageStatusJson(sceneId) {
     const container = document.getElementById('scene-image-container');
     if (!container) return;
 
@@ -301,11 +368,26 @@ function pollImageStatus(sceneId) {
     }, 2000);
 }
 
+/**
+ * Wait for count extra images to resolve, updating each as it lands.
+ */
+function pollExtraImages(sceneId, count) {
+    const resolved = new Set();
+    watchMediaEvents(sceneId, (name, data) => {
+        if (name !== 'extra_image') return false;
+        updateExtraImages(sceneId, [data]);
+        if (data.status === 'complete' || data.status === 'failed') {
+            resolved.add(data.index);
+        }
+        return resolved.size >= count;
+    }, () => pollExtraImagesJson(sceneId, count));
+}
+
 /**
  * Poll specifically for extra images when main image may already be done
  * but extras are still generating.
  */
-function pollExtraImages(sceneId, count) {
+function pollExtraImagesJson(sceneId, count) {
     const urlPrefix = document.body.dataset.urlPrefix || '';
     const maxAttempts = 30;
     let attempts = 0;
@@ -438,12 +520,33 @@ function showImage(container, url, sceneId) {
 }
 
 /**
- * Poll for video generation status and swap placeholder when ready.
+ * Wait for the scene's video clip and swap the placeholder when ready.
  */
 function pollVideoStatus(sceneId) {
     const container = document.getElementById('scene-video-container');
     if (!container) return;
 
+    watchMediaEvents(sceneId, (name, data) => {
+        if (name !== 'video') return false;
+        if (data.status === 'complete' && data.url) {
+            showVideo(container, data.url);
+            return true;
+        }
+        if (data.status === 'failed') {
+            showVideoFailed(container, sceneId);
+            return true;
+        }
+        return false;
+    }, () => pollVideoStatusJson(sceneId));
+}
+
+/**
+ * Poll for video generation status and swap placeholder when ready.
+ */
+function pollVideoStatusJson(sceneId) {
+    const container = document.getElementById('scene-video-container');
+    if (!container) return;
+
     const urlPrefix = document.body.dataset.urlPrefix || '';
     const maxAttempts = 60; // 5 minutes at 5s interval
     let attempts = 0;
@@ -544,6 +647,102 @@ function showLoading(message) {
     document.body.appendChild(overlay);
 }
 
+/**
+ * Submit a choice and show the next scene's text while it is being written.
+ *
+ * The server answers with Server-Sent Events: "content" (a piece of the
+ * narrative), then "done" (the new scene's URL) or "error". A redirect,
+ * e.g. to an already-explored scene, is followed directly; any other
+ * response falls back to a plain form submit.
+ */
+function streamChoice(form) {
+    const overlay = document.createElement('div');
+    overlay.className = 'loading-overlay streaming-overlay';
+    overlay.innerHTML = `
+        <div class="spinner"></div>
+        <p>Continuing the story...</p>
+        <div class="streaming-scene-text"></div>
+    `;
+    document.body.appendChild(overlay);
+    const textEl = overlay.querySelector('.streaming-scene-text');
+    let finished = false;
+
+    function handleEvent(name, data) {
+        if (name === 'content') {
+            textEl.textContent += data.text;
+            textEl.scrollTop = textEl.scrollHeight;
+        } else if (name === 'done') {
+            finished = true;
+            window.location.href = data.url;
+        } else if (name === 'error') {
+            finished = true;
+            overlay.innerHTML = `
+                <p class="streaming-error"></p>
+                <a class="btn btn-secondary" href="${data.retry_url}">Try Again</a>
+            `;
+            overlay.querySelector('.streaming-error').textContent = data.message;
+        }
+    }
+
+    fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: { 'Accept': 'text/event-stream' },
+        credentials: 'same-origin',
+    }).then((resp) => {
+        const type = resp.headers.get('Content-Type') || '';
+        if (resp.ok && type.indexOf('text/event-stream') === 0) {
+            return readEventStream(resp, handleEvent);
+        }
+        finished = true;
+        if (resp.redirected) {
+            window.location.href = resp.url;
+        } else {
+            form.submit();
+        }
+    }).then(() => {
+        // Stream ended without a result — the scene may still have been saved
+        if (!finished) window.location.reload();
+    }).catch(() => {
+        if (!finished) form.submit();
+    });
+}
+
+/**
+ * Read a text/event-stream response body, calling onEvent(name, data)
+ * for each event with its JSON-decoded data.
+ */
+function readEventStream(resp, onEvent) {
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    function dispatch(block) {
+        let name = 'message';
+        const data = [];
+        block.split('\n').forEach((line) => {
+            if (line.indexOf('event:') === 0) name = line.slice(6).trim();
+            else if (line.indexOf('data:') === 0) data.push(line.slice(5).trim());
+        });
+        if (data.length) onEvent(name, JSON.parse(data.join('\n')));
+    }
+
+    function pump() {
+        return reader.read().then(({ done, value }) => {
+            if (done) return;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                dispatch(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+            return pump();
+        });
+    }
+
+    return pump();
+}
+
 // Attach loading overlay to story forms
 document.addEventListener('DOMContentLoaded', () => {
     // Start story form
@@ -554,9 +753,14 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    // Choice buttons (forms)
+    // Choice buttons (forms) — stream the next scene where the browser can
     document.querySelectorAll('.choice-form').forEach(form => {
-        form.addEventListener('submit', () => {
+        form.addEventListener('submit', (event) => {
+            if (window.fetch && window.ReadableStream && window.TextDecoder) {
+                event.preventDefault();
+                streamChoice(form);
+                return;
+            }
             showLoading('Continuing the story...');
         });
     });
@@ -606,3 +810,25 @@ function initRecap() {
         });
     }
 }
+
+/**
+ * Start building an export as soon as the pointer (or focus) reaches its
+ * link, so the download itself is served from the export cache.
+ */
+(function() {
+    var prepared = {};
+
+    function prepareExport(e) {
+        var link = e.target.closest && e.target.closest('[data-prepare-url]');
+        if (!link) return;
+        var url = link.dataset.prepareUrl;
+        if (prepared[url]) return;
+        prepared[url] = true;
+        fetch(url, { method: 'POST' }).catch(function() {
+            prepared[url] = false;
+        });
+    }
+
+    document.addEventListener('pointerover', prepareExport);
+    document.addEventListener('focusin', prepareExport);
+})();
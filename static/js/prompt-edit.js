@@ -93,6 +93,10 @@ function initPromptEdit(config) {
                 // Gallery reader: synchronous, image_url returned
                 var img = container.querySelector('img');
                 if (img) {
+                    // Drop the old image's resized variants so the new src shows
+                    container.querySelectorAll('picture source').forEach(function(source) {
+                        source.remove();
+                    });
                     img.src = data.image_url;
                 }
                 originalPrompt = newPrompt;
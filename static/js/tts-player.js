@@ -103,53 +103,43 @@
 
         setState(btn, 'loading');
 
-        fetch(url)
-            .then(function(response) {
-                if (!response.ok) {
-                    throw new Error('TTS request failed: ' + response.status);
-                }
-                return response.blob();
-            })
-            .then(function(blob) {
-                if (state !== 'loading') return; // user cancelled during load
-
-                var objectUrl = URL.createObjectURL(blob);
-                audio = new Audio(objectUrl);
+        // Play straight from the URL so narration starts as soon as the
+        // first streamed chunk arrives instead of after the whole file
+        var current = new Audio(url);
+        audio = current;
 
-                audio.addEventListener('ended', function() {
-                    URL.revokeObjectURL(objectUrl);
-                    audio = null;
-                    setState(btn, 'idle');
-                    clearHighlight();
-                });
+        current.addEventListener('ended', function() {
+            if (audio !== current) return;
+            audio = null;
+            setState(btn, 'idle');
+            clearHighlight();
+        });
 
-                audio.addEventListener('error', function() {
-                    URL.revokeObjectURL(objectUrl);
-                    audio = null;
-                    setState(btn, 'idle');
-                    showError(btn);
-                    clearHighlight();
-                });
+        current.addEventListener('error', function() {
+            if (audio !== current) return;
+            audio = null;
+            setState(btn, 'idle');
+            showError(btn);
+            clearHighlight();
+        });
 
-                audio.play().then(function() {
-                    setState(btn, 'playing');
-                    startHighlight(audio);
-                }).catch(function() {
-                    URL.revokeObjectURL(objectUrl);
-                    audio = null;
-                    setState(btn, 'idle');
-                });
-            })
-            .catch(function(err) {
-                setState(btn, 'idle');
-                showError(btn);
-            });
+        current.play().then(function() {
+            if (audio !== current || state !== 'loading') return; // user cancelled during load
+            setState(btn, 'playing');
+            startHighlight(current);
+        }).catch(function() {
+            if (audio !== current) return;
+            audio = null;
+            setState(btn, 'idle');
+        });
     }
 
     function stopAudio(btn) {
         if (audio) {
             audio.pause();
-            audio.currentTime = 0;
+            // Drop the source so a still-streaming response is aborted
+            audio.removeAttribute('src');
+            audio.load();
             audio = null;
         }
         setState(btn, 'idle');
@@ -224,7 +214,8 @@
 
     function scheduleHighlights(audioElement, durations, totalWords) {
         var audioDuration = audioElement.duration;
-        if (!audioDuration || isNaN(audioDuration)) {
+        // Streamed audio reports an Infinity duration until fully loaded
+        if (!audioDuration || !isFinite(audioDuration)) {
             audioDuration = totalWords / 2.5; // fallback: 150 WPM = 2.5 WPS
         }
 
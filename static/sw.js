@@ -1,8 +1,8 @@
 // Service Worker — Choose Your Own Adventure PWA
 // Cache version constants — increment on deploy to force refresh
-const STATIC_CACHE = 'static-v1';
+const STATIC_CACHE = 'static-v6';
 const PAGES_CACHE = 'pages-v1';
-const MEDIA_CACHE = 'media-v1';
+const MEDIA_CACHE = 'media-v2';
 const CACHE_WHITELIST = [STATIC_CACHE, PAGES_CACHE, MEDIA_CACHE];
 
 // Assets to pre-cache on install
@@ -55,6 +55,16 @@ self.addEventListener('fetch', (event) => {
         return;
     }
 
+    // Narration audio is streamed to an <audio> element; let it bypass the cache
+    if (url.pathname.includes('/tts/')) {
+        return;
+    }
+
+    // Media status events are a long-lived stream; let them bypass the cache
+    if (url.pathname.endsWith('/story/events')) {
+        return;
+    }
+
     // 1. Cache-first for static CSS, JS, icons
     if (url.pathname.startsWith('/static/css/') ||
         url.pathname.startsWith('/static/js/') ||
@@ -63,6 +73,13 @@ self.addEventListener('fetch', (event) => {
         return;
     }
 
+    // Full-size generated PNGs are only the fallback behind the resized
+    // derivatives in /static/images/derived/; keep them out of the media cache
+    if (url.pathname.startsWith('/static/images/') && url.pathname.endsWith('.png')) {
+        event.respondWith(networkOnly(event.request));
+        return;
+    }
+
     // 2. Stale-while-revalidate for images and videos
     if (url.pathname.startsWith('/static/images/') ||
         url.pathname.startsWith('/static/videos/')) {
@@ -103,6 +120,17 @@ async function cacheFirst(request, cacheName) {
     }
 }
 
+// Network only, with the offline placeholder for images
+async function networkOnly(request) {
+    try {
+        return await fetch(request);
+    } catch (err) {
+        return new Response(OFFLINE_IMAGE_SVG, {
+            headers: { 'Content-Type': 'image/svg+xml' },
+        });
+    }
+}
+
 // Network-first with cache fallback
 async function networkFirst(request, cacheName) {
     try {
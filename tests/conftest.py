@@ -10,7 +10,7 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from PIL import Image as PILImage
@@ -78,14 +78,26 @@ def mock_services(scene_generator):
     mock_video = AsyncMock()
     mock_extra_images = AsyncMock()
 
-    mock_tts = AsyncMock(return_value=b"fake-mp3-audio-data")
+    async def fake_speech_stream(*args, **kwargs):
+        yield b"fake-mp3-audio-data"
+
+    mock_tts = MagicMock(side_effect=fake_speech_stream)
+
+    async def fake_scene_stream(**kwargs):
+        data = scene_generator(**kwargs)
+        yield "content", data["content"]
+        yield "image_prompt", data["image_prompt"]
+        yield "scene", data
+
+    mock_stream_scene = MagicMock(side_effect=fake_scene_stream)
 
     with (
         patch("app.routes.story_service.generate_scene", mock_generate),
+        patch("app.routes.story_service.stream_scene", mock_stream_scene),
         patch("app.routes.image_service.generate_image", mock_image),
         patch("app.routes.image_service.generate_video", mock_video),
         patch("app.routes.image_service.generate_extra_images", mock_extra_images),
-        patch("app.routes.generate_speech", mock_tts),
+        patch("app.routes.stream_speech", mock_tts),
     ):
         yield scene_generator
 
@@ -0,0 +1,95 @@
+"""Unit tests for the story catalog's header reader (app/services/catalog.py).
+
+Run with:  venv/bin/python -m pytest tests/test_catalog.py -v
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from app.models import SavedScene, SavedStory
+from app.services import catalog, codec
+from app.services.catalog import _read_header, load_story_summary, summarize
+
+
+def _story(scenes=3):
+    scene_map = {}
+    for i in range(scenes):
+        scene_id = f"scene-{i}"
+        scene_map[scene_id] = SavedScene(
+            scene_id=scene_id,
+            parent_scene_id=f"scene-{i - 1}" if i else None,
+            content=f"Scene {i} " * 50,
+            image_url=f"/static/images/{scene_id}.png",
+            depth=i,
+        )
+    saved = SavedStory(
+        story_id="s1", title="Test é \"quoted\"", prompt="A test", tier="kids",
+        length="short", target_depth=3, created_at=datetime(2025, 1, 1),
+        scenes=scene_map, path_history=list(scene_map),
+    )
+    saved.refresh_summary()
+    return saved
+
+
+class TestReadHeader:
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_header_fields_match_summary(self, tmp_path, indent):
+        """Compact and pretty files give the same summary as parsing the whole story."""
+        saved = _story()
+        path = tmp_path / "s1.json"
+        path.write_text(saved.model_dump_json(indent=indent), encoding="utf-8")
+        assert load_story_summary(path) == summarize(saved)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_values_split_across_chunks(self, tmp_path, monkeypatch, chunk_size):
+        """Keys, strings and numbers cut at any chunk boundary are reassembled."""
+        monkeypatch.setattr(catalog, "READ_CHUNK_SIZE", chunk_size)
+        saved = _story()
+        path = tmp_path / "s1.json"
+        path.write_text(saved.model_dump_json(indent=2), encoding="utf-8")
+        assert load_story_summary(path) == summarize(saved)
+
+    def test_stops_at_first_body_key(self, tmp_path):
+        """Nothing after the scenes key is parsed, so its contents may be anything."""
+        path = tmp_path / "s1.json"
+        path.write_text('{"story_id": "s1", "scene_count": 4, "scenes": {not json', encoding="utf-8")
+        assert _read_header(path) == {"story_id": "s1", "scene_count": 4}
+
+    def test_header_only_file(self, tmp_path):
+        """A file without body keys is read to its closing brace."""
+        path = tmp_path / "s1.json"
+        path.write_text(json.dumps({"story_id": "s1", "scene_count": 0}), encoding="utf-8")
+        assert _read_header(path) == {"story_id": "s1", "scene_count": 0}
+
+    def test_not_an_object(self, tmp_path):
+        """A file that is not a JSON object is rejected."""
+        path = tmp_path / "s1.json"
+        path.write_text("[1, 2, 3]", encoding="utf-8")
+        with pytest.raises(ValueError):
+            _read_header(path)
+
+    def test_truncated_header_raises(self, tmp_path):
+        """A file cut off inside the header raises rather than returning partial fields."""
+        path = tmp_path / "s1.json"
+        path.write_text('{"story_id": "s1", "title": "Unfini', encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            _read_header(path)
+
+    def test_legacy_file_without_summary_fields(self, tmp_path):
+        """Files saved before scene_count existed are fully parsed instead."""
+        saved = _story()
+        data = saved.model_dump(mode="json")
+        for key in ("scene_count", "chapter_count", "first_image_url"):
+            del data[key]
+        path = tmp_path / "s1.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        assert load_story_summary(path) == summarize(saved)
+
+    @pytest.mark.skipif(codec.MSGPACK is None, reason="msgpack is not installed")
+    def test_msgpack_header(self, tmp_path):
+        """MessagePack story files are read up to their first body key too."""
+        saved = _story()
+        path = tmp_path / "s1.json"
+        path.write_bytes(codec.MSGPACK.dump_model(saved))
+        assert load_story_summary(path) == summarize(saved)
@@ -0,0 +1,87 @@
+"""Unit tests for storage codec detection (app/services/codec.py).
+
+Run with:  venv/bin/python -m pytest tests/test_codec.py -v
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models import SavedStory
+from app.services import codec
+
+# {"a": 1} as MessagePack: a one-entry fixmap
+MSGPACK_MAP = b"\x81\xa1a\x01"
+
+needs_msgpack = pytest.mark.skipif(codec.MSGPACK is None, reason="msgpack is not installed")
+
+
+def _story():
+    return SavedStory(
+        story_id="s1", title="Test", prompt="A test", tier="kids",
+        length="short", target_depth=3, created_at=datetime(2025, 1, 1),
+    )
+
+
+class TestFormatDetection:
+    @pytest.mark.parametrize("prefix", [
+        b'{"a": 1}',
+        b'{\n  "a": 1\n}',
+        b'  \r\n\t{"a": 1}',
+        b"[1, 2]",
+    ])
+    def test_json_prefixes(self, prefix):
+        """Compact, pretty and whitespace-led JSON are all recognised."""
+        assert codec.is_json(prefix)
+        assert codec.codec_for(prefix) is codec.JSON
+
+    @pytest.mark.parametrize("prefix", [MSGPACK_MAP, b"\xde\x00\x10", b"", b"   "])
+    def test_non_json_prefixes(self, prefix):
+        """MessagePack maps, empty and blank prefixes are not JSON."""
+        assert not codec.is_json(prefix)
+
+    def test_only_the_leading_bytes_are_sniffed(self):
+        """A JSON file is detected from its first bytes even with a huge body."""
+        data = b" " * 32 + b'{"a": "' + b"x" * 100_000 + b'"}'
+        assert codec.codec_for(data) is codec.JSON
+        assert codec.loads(data) == {"a": "x" * 100_000}
+
+    @pytest.mark.skipif(codec.MSGPACK is not None, reason="msgpack is installed")
+    def test_msgpack_without_package_raises(self):
+        """Reading a MessagePack file without msgpack fails loudly instead of misparsing."""
+        with pytest.raises(ValueError, match="msgpack is not installed"):
+            codec.codec_for(MSGPACK_MAP)
+
+    @needs_msgpack
+    def test_msgpack_detected(self):
+        """MessagePack data is routed to the msgpack codec."""
+        assert codec.codec_for(MSGPACK_MAP) is codec.MSGPACK
+        assert codec.loads(MSGPACK_MAP) == {"a": 1}
+
+
+class TestRoundTrip:
+    def test_legacy_pretty_json_reads(self, tmp_path):
+        """Files written as indent=2 JSON before the codec existed still load."""
+        saved = _story()
+        path = tmp_path / "s1.json"
+        path.write_text(saved.model_dump_json(indent=2), encoding="utf-8")
+        assert codec.read_model(path, SavedStory) == saved
+
+    def test_json_codec_round_trip(self, tmp_path, monkeypatch):
+        """The default codec writes compact JSON that reads back as the same model."""
+        monkeypatch.setattr(codec.settings, "storage_codec", "json")
+        saved = _story()
+        path = tmp_path / "s1.json"
+        codec.write_model(path, saved)
+        assert path.read_bytes().startswith(b'{"')
+        assert codec.read_model(path, SavedStory) == saved
+
+    @needs_msgpack
+    def test_msgpack_codec_round_trip(self, tmp_path, monkeypatch):
+        """A MessagePack file reads back as the same model under either setting."""
+        monkeypatch.setattr(codec.settings, "storage_codec", "msgpack")
+        saved = _story()
+        path = tmp_path / "s1.json"
+        codec.write_model(path, saved)
+        assert not codec.is_json(path.read_bytes()[:64])
+        monkeypatch.setattr(codec.settings, "storage_codec", "json")
+        assert codec.read_model(path, SavedStory) == saved
@@ -0,0 +1,191 @@
+"""Unit tests for the in-progress save journal (app/services/progress_journal.py).
+
+Run with:  venv/bin/python -m pytest tests/test_progress_journal.py -v
+"""
+import json
+
+from app.models import Image, ImageStatus, Scene, Story, StoryLength, StorySession
+from app.services import progress_journal
+from app.services.progress_journal import (
+    ProgressJournal,
+    _apply,
+    _capture,
+    _diff,
+    _replay,
+    journal_path,
+    read_progress,
+)
+
+
+def _session(depth=3):
+    session = StorySession(story=Story(
+        title="Test", prompt="A test adventure", length=StoryLength.SHORT, target_depth=5,
+    ))
+    parent = None
+    for i in range(depth):
+        scene = Scene(content=f"Scene {i}", image=Image(prompt=f"Image {i}"), parent_scene_id=parent, depth=i)
+        session.add_scene(scene)
+        session.path_history.append(scene.scene_id)
+        parent = scene.scene_id
+    return session
+
+
+def _add_scene(session):
+    parent = session.path_history[-1]
+    scene = Scene(content="Next", image=Image(prompt="Next"), parent_scene_id=parent, depth=len(session.path_history))
+    session.add_scene(scene)
+    session.path_history.append(scene.scene_id)
+    return scene
+
+
+def _roundtrip(before, after):
+    """Apply the diff of before -> after to before's raw dict and return the result."""
+    entry = json.loads(json.dumps(_diff(_capture(before), _capture(after))))
+    data = before.model_dump(mode="json")
+    _apply(data, entry)
+    return StorySession.model_validate(data), entry
+
+
+class TestDiffApply:
+    def test_unchanged_session_gives_empty_entry(self):
+        """Diffing a session against itself records nothing."""
+        session = _session()
+        assert _diff(_capture(session), _capture(session)) == {}
+
+    def test_new_scene_appends_to_path(self):
+        """A choice is recorded as the new scene plus a path_append."""
+        before = _session()
+        after = before.model_copy(deep=True)
+        scene = _add_scene(after)
+        result, entry = _roundtrip(before, after)
+        assert entry["path_append"] == [scene.scene_id]
+        assert list(entry["scenes"]) == [scene.scene_id]
+        assert result == after
+
+    def test_going_back_truncates_path(self):
+        """Going back is recorded as a path_truncate, not a rewritten path."""
+        before = _session()
+        after = before.model_copy(deep=True)
+        after.path_history.pop()
+        result, entry = _roundtrip(before, after)
+        assert entry == {"path_truncate": 2}
+        assert result == after
+
+    def test_branch_rewrites_path_and_removes_scenes(self):
+        """A path that diverges is written whole; dropped scenes are listed."""
+        before = _session()
+        after = before.model_copy(deep=True)
+        dropped = after.path_history.pop()
+        del after.scenes[dropped]
+        after.path_history[-1:] = []
+        _add_scene(after)
+        result, entry = _roundtrip(before, after)
+        assert "path_history" in entry
+        assert entry["removed_scenes"] == [dropped]
+        assert result == after
+
+    def test_image_update_and_recaps(self):
+        """Changed scenes, error message and recap entries (added and removed) round-trip."""
+        before = _session()
+        before.recap_cache = {"old": "Old recap"}
+        after = before.model_copy(deep=True)
+        scene = after.scenes[after.path_history[0]]
+        scene.image.status = ImageStatus.COMPLETE
+        scene.image.url = "/static/images/test.png"
+        after.error_message = "Something went wrong"
+        after.recap_cache = {"new": "New recap"}
+        result, entry = _roundtrip(before, after)
+        assert list(entry["scenes"]) == [scene.scene_id]
+        assert entry["recap_cache"] == {"new": "New recap", "old": None}
+        assert result == after
+
+    def test_capture_reuses_unchanged_scene_json(self):
+        """Scenes unchanged since the base are not serialized again."""
+        session = _session()
+        base = _capture(session)
+        scene = session.scenes[session.path_history[-1]]
+        scene.image.status = ImageStatus.COMPLETE
+        current = _capture(session, base=base)
+        first = session.path_history[0]
+        assert current.scenes[first] is base.scenes[first]
+        assert current.scenes[scene.scene_id] != base.scenes[scene.scene_id]
+
+
+class TestReplay:
+    def test_journal_replays_onto_snapshot(self, tmp_path):
+        """Saves after the first are appended and replayed on load."""
+        path = tmp_path / "kids.json"
+        journal = ProgressJournal()
+        session = _session()
+        journal.save(path, session)
+        _add_scene(session)
+        journal.save(path, session)
+        data, applied = _replay(path)
+        assert applied == 1
+        assert StorySession.model_validate(data) == session
+
+    def test_torn_final_line_is_dropped(self, tmp_path):
+        """A crash mid-append loses only the torn entry, and the next save compacts."""
+        path = tmp_path / "kids.json"
+        journal = ProgressJournal()
+        session = _session()
+        journal.save(path, session)
+        _add_scene(session)
+        journal.save(path, session)
+        with journal_path(path).open("a", encoding="utf-8") as f:
+            f.write('{"path_append": ["tor')
+
+        data, applied = _replay(path)
+        assert applied is None
+        assert StorySession.model_validate(data) == session
+
+        reloaded = ProgressJournal()
+        recovered = reloaded.load(path)
+        _add_scene(recovered)
+        reloaded.save(path, recovered)
+        assert read_progress(path) == recovered
+        assert len(journal_path(path).read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_journal_for_another_snapshot_is_ignored(self, tmp_path):
+        """A journal left over from an interrupted compaction is not replayed."""
+        path = tmp_path / "kids.json"
+        session = _session()
+        ProgressJournal().save(path, session)
+        journal_path(path).write_text(
+            json.dumps({"snapshot": "not-this-one"}) + "\n" + json.dumps({"path_truncate": 0}) + "\n",
+            encoding="utf-8",
+        )
+        data, applied = _replay(path)
+        assert applied is None
+        assert StorySession.model_validate(data) == session
+
+    def test_saves_from_two_processes_stay_consistent(self, tmp_path):
+        """A save diffs against the file on disk when another process wrote since."""
+        path = tmp_path / "kids.json"
+        first, second = ProgressJournal(), ProgressJournal()
+        session = _session()
+        first.save(path, session)
+        stale = second.load(path)
+
+        _add_scene(session)
+        first.save(path, session)
+        stale.path_history.pop()
+        second.save(path, stale)
+        assert read_progress(path) == stale
+
+        _add_scene(session)
+        first.save(path, session)
+        assert read_progress(path) == session
+
+    def test_compacts_after_limit(self, tmp_path, monkeypatch):
+        """The journal is folded into a new snapshot after COMPACT_AFTER_ENTRIES appends."""
+        monkeypatch.setattr(progress_journal, "COMPACT_AFTER_ENTRIES", 2)
+        path = tmp_path / "kids.json"
+        journal = ProgressJournal()
+        session = _session()
+        journal.save(path, session)
+        for _ in range(3):
+            _add_scene(session)
+            journal.save(path, session)
+        assert len(journal_path(path).read_text(encoding="utf-8").splitlines()) == 1
+        assert read_progress(path) == session
@@ -0,0 +1,81 @@
+"""Unit tests for SceneStreamParser (app/services/story.py).
+
+Run with:  venv/bin/python -m pytest tests/test_scene_stream_parser.py -v
+"""
+import json
+
+import pytest
+
+from app.services.story import SceneStreamParser
+
+
+def _feed_all(parser, deltas):
+    """Feed deltas in order and return the concatenated content output."""
+    return "".join(parser.feed(delta) for delta in deltas)
+
+
+def _splits(text):
+    """Every way of cutting text into two deltas."""
+    return [(text[:i], text[i:]) for i in range(1, len(text))]
+
+
+class TestContent:
+    def test_content_streams_before_json_is_complete(self):
+        """Narrative text is returned as it arrives, before the closing brace."""
+        parser = SceneStreamParser()
+        assert parser.feed('{"content": "Once upon') == "Once upon"
+        assert parser.feed(" a time") == " a time"
+        assert parser.feed('", "choices": []}') == ""
+        assert parser.text == '{"content": "Once upon a time", "choices": []}'
+
+    @pytest.mark.parametrize("content", [
+        'She said "hi"',
+        "Line one\nLine two\tindented",
+        "Back\\slash",
+        "Café",
+        "Rocket \U0001F680 launch",
+    ])
+    def test_escape_split_across_deltas(self, content):
+        """An escape sequence cut anywhere across two deltas decodes once, intact."""
+        raw = json.dumps({"content": content}, ensure_ascii=True)
+        for first, second in _splits(raw):
+            assert _feed_all(SceneStreamParser(), [first, second]) == content
+
+    def test_one_character_at_a_time(self):
+        """Feeding a character at a time yields the same text as one delta."""
+        content = 'A "quoted" é\U0001F600 line\nnext'
+        raw = json.dumps({"content": content, "image_prompt": "x"}, ensure_ascii=True)
+        assert _feed_all(SceneStreamParser(), list(raw)) == content
+
+    def test_text_after_content_is_not_returned(self):
+        """Later string fields are never mistaken for narrative text."""
+        parser = SceneStreamParser()
+        raw = json.dumps({"content": "Short", "choices": [{"text": "Go left"}]})
+        assert _feed_all(parser, [raw]) == "Short"
+        assert parser.feed(" ") == ""
+
+
+class TestImagePrompt:
+    def test_image_prompt_after_content(self):
+        """image_prompt is set once its closing quote arrives after the content."""
+        parser = SceneStreamParser()
+        parser.feed('{"content": "A forest", "image_prompt": "tall pin')
+        assert parser.image_prompt is None
+        parser.feed('es at dusk", "choices": []}')
+        assert parser.image_prompt == "tall pines at dusk"
+
+    def test_image_prompt_before_content(self):
+        """An image_prompt ahead of the content is found without disturbing the content."""
+        parser = SceneStreamParser()
+        out = parser.feed('{"image_prompt": "a red \\"kite\\"", ')
+        assert out == ""
+        assert parser.image_prompt == 'a red "kite"'
+        assert _feed_all(parser, ['"content": "The kite ', 'rose."}']) == "The kite rose."
+
+    def test_image_prompt_split_escape(self):
+        """An escape split across deltas inside image_prompt waits for the rest."""
+        parser = SceneStreamParser()
+        parser.feed('{"content": "x", "image_prompt": "caf\\u00')
+        assert parser.image_prompt is None
+        parser.feed('e9"}')
+        assert parser.image_prompt == "café"